@@ -0,0 +1,265 @@
+# AI/EngineProcess.py
+# Game side of the engine protocol (see AI/EngineProtocol.py): starts an engine as a
+# separate process and asks it for moves, so searches never block the UI and run on
+# their own core. Engines are configured by name in engines.json:
+#
+#   {"default": "Alpha-beta 1s",
+#    "engines": {"Alpha-beta 1s": {"spec": "alphabeta:time=1"},
+#                "My engine": {"command": ["./my_engine"], "time": 2.0}}}
+#
+# "spec" runs one of the built-in engines, "command" any program speaking the protocol.
+# "time" is the thinking time per move in seconds (1 by default). "ponder": true lets
+# the engine think on the opponent's time too (built-in engines support it).
+import json
+import os
+import queue
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from AI.EngineProtocol import format_position, parse_move
+from Rules.GameRules import get_rules
+
+ENGINES_FILE = "engines.json"
+DEFAULT_TIME = 1.0
+START_TIMEOUT = 10.0
+
+# Used when engines.json is missing
+DEFAULT_ENGINES = {
+    "default": "Alpha-beta 1s",
+    "engines": {
+        "Random": {"spec": "random"},
+        "Greedy": {"spec": "greedy"},
+        "Alpha-beta 1s": {"spec": "alphabeta:time=1"},
+    },
+}
+
+
+class EngineError(Exception):
+    pass
+
+
+def builtin_command(spec):
+    # Command running a built-in engine; a frozen build runs itself (see main.py)
+    if getattr(sys, "frozen", False):
+        return [sys.executable, "--engine", spec]
+    return [sys.executable, "-m", "AI.EngineProtocol", "--engine", spec]
+
+
+def load_engine_configs(filename=ENGINES_FILE):
+    # Returns (default engine name, {name: config})
+    data = DEFAULT_ENGINES
+    if os.path.exists(filename):
+        try:
+            with open(filename) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {filename}: {e}")
+    engines = data.get("engines", {})
+    default = data.get("default")
+    if default not in engines:
+        default = next(iter(engines), None)
+    return default, engines
+
+
+def engine_names(filename=ENGINES_FILE):
+    return list(load_engine_configs(filename)[1])
+
+
+class EngineProcess:
+    def __init__(self, command, name=None, move_time=DEFAULT_TIME, ponder=False):
+        self.command = command
+        self.name = name or " ".join(command)
+        self.move_time = move_time
+        self.ponder_enabled = ponder
+        self.process = None
+        self.lines = queue.Queue()
+        self.searching = False
+        self.best_move = None
+        self.info = {}
+
+    def start(self):
+        try:
+            self.process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                            text=True, bufsize=1)
+        except OSError as e:
+            raise EngineError(f"Cannot start engine {self.name}: {e}")
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+        self.send("engine")
+        for line in self._wait_for("engineok", START_TIMEOUT):
+            if line.startswith("id name "):
+                print(f"Engine started: {line[8:]}")
+        return self
+
+    def _read_output(self):
+        for line in self.process.stdout:
+            self.lines.put(line.strip())
+        self.lines.put(None)  # The engine exited
+
+    def send(self, line):
+        try:
+            self.process.stdin.write(line + "\n")
+            self.process.stdin.flush()
+        except (OSError, ValueError) as e:
+            raise EngineError(f"Engine {self.name} is not running: {e}")
+
+    def _next_line(self, timeout):
+        try:
+            line = self.lines.get(timeout=timeout)
+        except queue.Empty:
+            return ""
+        if line is None:
+            self.lines.put(None)
+            raise EngineError(f"Engine {self.name} exited")
+        return line
+
+    def _wait_for(self, answer, timeout):
+        # Lines read until the answer, which must come within timeout seconds
+        deadline = time.monotonic() + timeout
+        lines = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise EngineError(f"Engine {self.name} did not answer {answer}")
+            line = self._next_line(remaining)
+            if line.split(" ", 1)[0] == answer:
+                return lines
+            if line:
+                lines.append(line)
+
+    def _handle_line(self, line):
+        words = line.split()
+        if not words:
+            return
+        if words[0] == "info" and len(words) > 1 and words[1] == "string":
+            print(f"Engine {self.name}: {line[12:]}")
+        elif words[0] == "info":
+            self.info = {key: int(value) for key, value in zip(words[1::2], words[2::2]) if value.lstrip("-").isdigit()}
+        elif words[0] == "bestmove":
+            self.searching = False
+            self.best_move = None if words[1] == "none" else parse_move(words[1])
+
+    def new_game(self):
+        self.send("newgame")
+
+    def request_move(self, board, game_type, player, time_limit=None):
+        # Starts a search on the position; the answer is collected with poll()
+        time_limit = time_limit if time_limit is not None else self.move_time
+        self.best_move = None
+        self.searching = True
+        self.send(format_position(game_type, player, board))
+        self.send(f"go movetime {int(time_limit * 1000)}")
+
+    def ponder(self, board, game_type, player):
+        # Lets the engine think while the opponent (player) is to move; the next
+        # request_move finds the search done if it guessed the opponent's move
+        if self.ponder_enabled:
+            self.send(format_position(game_type, player, board))
+            self.send("go ponder")
+
+    def poll(self):
+        # True once the move asked for is in best_move (None if the engine had no move)
+        while self.searching:
+            line = self._next_line(0)
+            if not line:
+                break
+            self._handle_line(line)
+        return not self.searching
+
+    def search(self, board, game_type, player, time_limit=None):
+        # Blocking request: returns the engine's move
+        time_limit = time_limit if time_limit is not None else self.move_time
+        self.request_move(board, game_type, player, time_limit)
+        deadline = time.monotonic() + time_limit + START_TIMEOUT
+        while self.searching:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise EngineError(f"Engine {self.name} did not answer in time")
+            line = self._next_line(remaining)
+            if line:
+                self._handle_line(line)
+        return self.best_move
+
+    def stop(self):
+        if self.searching:
+            self.send("stop")
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.send("quit")
+            self.process.wait(timeout=2)
+        except (EngineError, subprocess.TimeoutExpired):
+            self.process.kill()
+        self.process = None
+
+
+def create_engine_process(name=None, filename=ENGINES_FILE):
+    # Engine process of a configured engine (the default one if name is None)
+    default, engines = load_engine_configs(filename)
+    name = name or default
+    if name not in engines:
+        raise EngineError(f"Unknown engine: {name}")
+    config = engines[name]
+    command = config.get("command") or builtin_command(config.get("spec", "ab-t1"))
+    return EngineProcess(command, name, config.get("time", DEFAULT_TIME), config.get("ponder", False))
+
+
+def open_engine(name=None):
+    # Started engine process, or None (with a message) if it cannot run
+    engine = None
+    try:
+        engine = create_engine_process(name)
+        return engine.start()
+    except EngineError as e:
+        print(f"Error starting engine: {e}")
+        if engine is not None:
+            engine.close()
+        return None
+
+
+class EnginePlayer:
+    # Move source for a screen's AI player, asked once per frame: the engine process
+    # thinks while the screen keeps drawing. Plays random legal moves if no engine runs.
+    def __init__(self, name=None):
+        self.engine = open_engine(name)
+        if self.engine:
+            self.engine.new_game()
+        self.thinking = False
+
+    def get_move(self, board, game_type, player):
+        # The chosen move, or None while the engine is still thinking
+        if self.engine is not None:
+            try:
+                if not self.thinking:
+                    self.engine.request_move(board, game_type, player)
+                    self.thinking = True
+                if not self.engine.poll():
+                    return None
+                self.thinking = False
+                if self.engine.best_move is not None:
+                    return self.engine.best_move
+            except EngineError as e:
+                print(f"Engine error, playing random moves: {e}")
+                self.close()
+        moves = get_rules(game_type).legal_moves(board, player)
+        return random.choice(moves) if moves else None
+
+    def ponder(self, board, game_type, player):
+        # Called once the engine's move is played, player being the opponent to move
+        if self.engine is not None and not self.thinking:
+            try:
+                self.engine.ponder(board, game_type, player)
+            except EngineError as e:
+                print(f"Engine error, playing random moves: {e}")
+                self.close()
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+        self.thinking = False
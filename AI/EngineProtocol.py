@@ -0,0 +1,269 @@
+# AI/EngineProtocol.py
+# Line-based text protocol between a game and an engine process, in the spirit of UCI.
+# The game writes commands on the engine's stdin and reads its answers on stdout,
+# one per line. Any program speaking it can be used as an engine (see engines.json).
+#
+#   engine                          -> "id name <name>" then "engineok"
+#   isready                         -> "readyok" once previous commands are done
+#   setoption name <n> value <v>    options: Engine (engine spec, see AI/Engines.py), MoveTime (ms)
+#   newgame                         a new game starts: clear what was learned
+#   position game <type> turn <player> board <board> [moves <move> ...]
+#   go [movetime <ms>] [depth <n>] [infinite]
+#                                   -> "info depth <d> score <s> nodes <n> time <ms>"
+#                                      then "bestmove <move>" ("bestmove none" without legal move)
+#   go ponder                       think on the opponent's time (see below), answers nothing
+#   stop                            ends the search now, bestmove is sent at once
+#   quit
+#
+# Pondering: after playing its move, the engine is given the position with the opponent
+# to move and "go ponder". It guesses the opponent's reply and searches the position
+# after it with no time limit. When the real position comes with the next "go", a
+# correct guess lets that search go on, its time counted from when pondering began, so
+# the answer often comes at once; otherwise it is stopped and the new search starts
+# with a transposition table already filled with close positions.
+#
+# Boards are rows separated by "/" of cell values separated by ",", in the usual
+# encoding (tile color * 10 + player). A square is written as its row and column digits
+# and a move as two squares ("8315" moves (8,3) to (1,5)), an Isolation placement as
+# "@" and a square ("@15").
+#
+# Usage: python -m AI.EngineProtocol [--engine ab-t1]
+import argparse
+import sys
+import threading
+import time
+
+from AI.Engines import create_engine, parse_engine_spec
+from Rules.GameState import GameState
+
+DEFAULT_ENGINE = "ab-t1"
+DEFAULT_MOVE_TIME = 1000  # ms, when go has no movetime
+
+
+def format_square(square):
+    return f"{square[0]}{square[1]}"
+
+
+def parse_square(text):
+    if len(text) != 2 or not text.isdigit():
+        raise ValueError(f"Bad square: {text}")
+    return int(text[0]), int(text[1])
+
+
+def format_move(move):
+    from_pos, to_pos = move
+    if from_pos is None:
+        return "@" + format_square(to_pos)
+    return format_square(from_pos) + format_square(to_pos)
+
+
+def parse_move(text):
+    if text.startswith("@"):
+        return None, parse_square(text[1:])
+    if len(text) != 4:
+        raise ValueError(f"Bad move: {text}")
+    return parse_square(text[:2]), parse_square(text[2:])
+
+
+def format_board(board):
+    return "/".join(",".join(str(value) for value in row) for row in board)
+
+
+def parse_board(text):
+    board = [[int(value) for value in row.split(",")] for row in text.split("/")]
+    if len(board) not in (8, 10) or any(len(row) != len(board) for row in board):
+        raise ValueError("Board must be 8x8 or 10x10")
+    return board
+
+
+def format_position(game_type, player, board, moves=()):
+    line = f"position game {game_type} turn {player} board {format_board(board)}"
+    if moves:
+        line += " moves " + " ".join(format_move(move) for move in moves)
+    return line
+
+
+def parse_position(words):
+    # words: the command's arguments -> GameState
+    if len(words) < 6 or words[0] != "game" or words[2] != "turn" or words[4] != "board":
+        raise ValueError("Expected: position game <type> turn <player> board <board> [moves ...]")
+    state = GameState(int(words[1]), parse_board(words[5]), int(words[3]))
+    if len(words) > 6:
+        if words[6] != "moves":
+            raise ValueError(f"Unexpected: {words[6]}")
+        for text in words[7:]:
+            move = parse_move(text)
+            if not state.is_legal(*move):
+                raise ValueError(f"Illegal move: {text}")
+            state.apply(*move)
+    return state
+
+
+class EngineServer:
+    # Engine side of the protocol: reads commands, searches in a background thread
+    def __init__(self, spec=DEFAULT_ENGINE, output=sys.stdout):
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.spec = spec
+        self.engine = create_engine(spec)
+        self.move_time = DEFAULT_MOVE_TIME
+        self.state = None
+        self.search_thread = None
+        self.stop_event = threading.Event()
+        self.ponder = None  # Pondered position while pondering: {"hash", "start", "hit"}
+
+    def send(self, line):
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def run(self, lines):
+        for line in lines:
+            words = line.split()
+            if not words:
+                continue
+            try:
+                if not self.handle(words[0], words[1:]):
+                    break
+            except ValueError as e:
+                # Bad commands are reported and skipped, like unknown ones
+                self.send(f"info string error {e}")
+        self.stop_search()
+        self.engine.close()
+
+    def handle(self, command, args):
+        # Returns False on quit
+        if command == "engine":
+            self.send(f"id name {self.engine.name}")
+            self.send("engineok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "setoption":
+            self.set_option(args)
+        elif command == "newgame":
+            self.stop_search()
+            self.engine.new_game()
+        elif command == "position":
+            if self.ponder is None:
+                self.stop_search()
+            self.state = parse_position(args)  # While pondering, go decides what to keep
+        elif command == "go":
+            self.go(args)
+        elif command == "stop":
+            self.stop_search()
+        elif command == "quit":
+            return False
+        else:
+            self.send(f"info string unknown command {command}")
+        return True
+
+    def set_option(self, args):
+        if len(args) < 4 or args[0] != "name" or "value" not in args:
+            raise ValueError("Expected: setoption name <name> value <value>")
+        split = args.index("value")
+        name, value = " ".join(args[1:split]), " ".join(args[split + 1:])
+        if name == "Engine":
+            parse_engine_spec(value)  # Raises ValueError if unknown
+            self.stop_search()
+            self.engine.close()
+            self.spec = value
+            self.engine = create_engine(value)
+        elif name == "MoveTime":
+            self.move_time = int(value)
+        else:
+            raise ValueError(f"Unknown option: {name}")
+
+    def go(self, args):
+        if self.state is None:
+            raise ValueError("No position")
+
+        move_time, depth, infinite, ponder = self.move_time, None, False, False
+        i = 0
+        while i < len(args):
+            if args[i] == "movetime":
+                move_time = int(args[i + 1])
+                i += 1
+            elif args[i] == "depth":
+                depth = int(args[i + 1])
+                i += 1
+            elif args[i] == "infinite":
+                infinite = True
+            elif args[i] == "ponder":
+                ponder = True
+            i += 1
+
+        if self.ponder is not None and not ponder and not infinite and depth is None:
+            if self.state.hash == self.ponder["hash"] and \
+                    self.engine.set_deadline(self.ponder["start"] + move_time / 1000):
+                # Ponder hit: the running search is the one asked for
+                self.ponder["hit"] = True
+                self.ponder = None
+                self.stop_event.set()
+                return
+        self.stop_search()
+
+        state = self.state.copy()
+        if ponder:
+            reply = self.engine.expected_reply(state) if state.legal_moves() else None
+            if reply is None or state.apply(*reply):
+                return  # Nothing to think about: the game ends before the engine's turn
+            self.ponder = {"hash": state.hash, "start": time.perf_counter(), "hit": False}
+
+        self.stop_event.clear()
+        self.engine.stop_requested = False
+        time_limit = 0 if infinite or ponder else move_time / 1000
+        self.search_thread = threading.Thread(target=self.search, args=(state, time_limit, depth, infinite, self.ponder),
+                                              daemon=True)
+        self.search_thread.start()
+
+    def search(self, state, time_limit, depth, infinite, ponder=None):
+        start = ponder["start"] if ponder else time.perf_counter()
+        saved_depth = getattr(self.engine, "max_depth", None)
+        if depth is not None and saved_depth is not None:
+            self.engine.max_depth = depth
+        try:
+            move = self.engine.choose_move(state, time_limit)
+        finally:
+            if saved_depth is not None:
+                self.engine.max_depth = saved_depth
+
+        if infinite or ponder:
+            # The answer of an infinite search waits for stop, the one of pondering for a hit
+            self.stop_event.wait()
+            if ponder and not ponder["hit"]:
+                return  # Wrong guess or stopped: only the transposition table is kept
+
+        info = self.engine.info
+        elapsed = int((time.perf_counter() - start) * 1000)
+        self.send(f"info depth {info.get('depth', 0)} score {int(info.get('score') or 0)} "
+                  f"nodes {info.get('nodes', 0)} time {elapsed}")
+        if info.get("book"):
+            self.send("info string book move")
+        for index, worker in enumerate(info.get("workers", ())):
+            # Parallel search: the share of each worker process
+            self.send(f"info string worker {index} depth {worker['depth']} nodes {worker['nodes']} nps {worker['nps']}")
+        self.send(f"bestmove {format_move(move) if move else 'none'}")
+
+    def stop_search(self):
+        if self.search_thread is not None:
+            self.engine.stop()
+            self.stop_event.set()
+            self.search_thread.join()
+            self.search_thread = None
+        self.ponder = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run an engine over the text protocol on stdin/stdout")
+    parser.add_argument("--engine", default=DEFAULT_ENGINE, help="engine preset or spec (see AI/Engines.py)")
+    args = parser.parse_args()
+
+    try:
+        server = EngineServer(args.engine)
+    except ValueError as e:
+        parser.error(str(e))
+    server.run(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+# AI/Engines.py
+# Game-playing engines working on a Rules.GameState, for every game type.
+#  - random: uniform random legal move
+#  - greedy: wins at once if it can, otherwise the best move by static evaluation
+#  - alphabeta: negamax alpha-beta with iterative deepening and a transposition table
+#    keyed by the position's Zobrist hash, limited by depth and/or time per move
+#
+# The search engines play the moves of the opening book (opening_book.bin, see
+# AI/OpeningBook.py) when it has the position, unless created with book=0, and
+# evaluate with the tuned weights of eval_weights.json when it exists.
+#
+# Engines are built from a spec: a preset name ("ab-d2"), a dict of settings
+# ({"type": "alphabeta", "time": 0.5}) or an inline string ("alphabeta:depth=3,time=1").
+import random
+import time
+
+from AI.Evaluation import WIN_SCORE, evaluate, likely_moves, load_weights
+from AI.OpeningBook import get_opening_book
+from AI.TranspositionTable import DictTable
+
+ENGINE_PRESETS = {
+    "random": {"type": "random"},
+    "greedy": {"type": "greedy"},
+    "ab-d1": {"type": "alphabeta", "depth": 1},
+    "ab-d2": {"type": "alphabeta", "depth": 2},
+    "ab-d3": {"type": "alphabeta", "depth": 3},
+    "ab-t0.1": {"type": "alphabeta", "time": 0.1},
+    "ab-t0.5": {"type": "alphabeta", "time": 0.5},
+    "ab-t1": {"type": "alphabeta", "time": 1.0},
+    "ab-t2": {"type": "alphabeta", "time": 2.0},
+    "smp-t1": {"type": "smp", "time": 1.0},
+    "smp-t3": {"type": "smp", "time": 3.0},
+}
+
+EXACT, LOWER, UPPER = 0, 1, 2  # Kind of score stored in the transposition table
+MAX_DEPTH = 64
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class Engine:
+    def __init__(self, name, seed=None):
+        self.name = name
+        self.rng = random.Random(seed)
+        self.info = {}  # Statistics of the last search (nodes, depth, score)
+        self.book = None  # Opening book, for the engines using one
+        self.stop_requested = False  # Set from another thread to end a search early
+
+    def stop(self):
+        self.stop_requested = True
+
+    def close(self):
+        # Releases what the engine holds beyond its own process (worker processes)
+        pass
+
+    def set_deadline(self, deadline):
+        # Moves the end of the running search (perf_counter time); False if not supported
+        return False
+
+    def expected_reply(self, state):
+        # Most likely move of the player to move, for pondering
+        moves = likely_moves(state, 1)
+        return moves[0] if moves else None
+
+    def book_move(self, state):
+        # Move of the opening book for the position, if the engine uses one
+        move = self.book.get_move(state) if self.book else None
+        if move is not None:
+            self.info = {"nodes": 0, "depth": 0, "score": None, "book": True}
+        return move
+
+    def new_game(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+
+    def choose_move(self, state, time_limit=None):
+        raise NotImplementedError
+
+
+class RandomEngine(Engine):
+    def choose_move(self, state, time_limit=None):
+        self.info = {"nodes": 0, "depth": 0}
+        moves = state.legal_moves()
+        return self.rng.choice(moves) if moves else None
+
+
+class GreedyEngine(Engine):
+    def __init__(self, name, seed=None, weights=None):
+        super().__init__(name, seed)
+        self.weights = weights
+
+    def choose_move(self, state, time_limit=None):
+        state = state.copy()
+        player = state.current_player
+        best_score = None
+        best_moves = []
+        nodes = 0
+        for move in state.legal_moves():
+            nodes += 1
+            if state.apply(*move) == player:
+                score = WIN_SCORE
+            else:
+                # Evaluation is for the opponent, now to move
+                score = -evaluate(state, self.weights)
+            state.undo()
+            if best_score is None or score > best_score:
+                best_score, best_moves = score, [move]
+            elif score == best_score:
+                best_moves.append(move)
+        self.info = {"nodes": nodes, "depth": 1, "score": best_score}
+        return self.rng.choice(best_moves) if best_moves else None
+
+
+class AlphaBetaEngine(Engine):
+    def __init__(self, name, seed=None, depth=None, time=None, weights=None, tt_size=1_000_000, table=None,
+                 book=True):
+        super().__init__(name, seed)
+        self.book = get_opening_book() if book else None
+        self.max_depth = depth or MAX_DEPTH
+        self.time_limit = time
+        if depth is None and time is None:
+            self.max_depth = 3
+        self.weights = weights
+        self.tt = table if table is not None else DictTable(tt_size)  # hash -> (depth, score, kind, best move)
+        self.shuffle_quiet = False  # Random order of the quiet moves, to vary parallel helpers
+        self.nodes = 0
+        self.deadline = None
+
+    def new_game(self, seed=None):
+        super().new_game(seed)
+        self.tt.clear()
+
+    def set_deadline(self, deadline):
+        self.deadline = deadline
+        return True
+
+    def expected_reply(self, state):
+        # The best move found for the position by the last search, if any
+        entry = self.tt.get(state.hash)
+        if entry is not None and entry[3] is not None and state.is_legal(*entry[3]):
+            return entry[3]
+        return super().expected_reply(state)
+
+    def choose_move(self, state, time_limit=None):
+        move = self.book_move(state)
+        if move is not None:
+            return move
+
+        time_limit = time_limit if time_limit is not None else self.time_limit
+        start = time.perf_counter()
+        self.deadline = start + time_limit if time_limit else None
+        self.nodes = 0
+
+        # Searched on a copy: a timeout may leave moves applied
+        root = state.copy()
+        moves = list(root.legal_moves())
+        if not moves:
+            return None
+        self.rng.shuffle(moves)  # Variety between equal moves
+
+        best_move, best_score, depth_done = moves[0], None, 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                score, move = self._search_root(root, moves, depth)
+            except SearchTimeout:
+                break
+            best_move, best_score, depth_done = move, score, depth
+            if self.stop_requested:
+                break
+            # Next iteration starts with the best move
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) >= WIN_SCORE - MAX_DEPTH:
+                break  # Forced result found
+            if self.deadline and time.perf_counter() > start + (self.deadline - start) / 2:
+                break  # The next depth would not finish in time
+
+        self.info = {"nodes": self.nodes, "depth": depth_done, "score": best_score}
+        return best_move
+
+    def _search_root(self, state, moves, depth):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        player = state.current_player
+        best_move, best_score = None, None
+        for move in moves:
+            self.nodes += 1
+            if state.apply(*move) == player:
+                score = WIN_SCORE - 1
+            else:
+                score = -self._search(state, depth - 1, -beta, -alpha, 1)
+            state.undo()
+            if best_score is None or score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+        self._store(state.hash, depth, best_score, EXACT, best_move, 0)
+        return best_score, best_move
+
+    def _order(self, state, moves, tt_move):
+        # Transposition table move first, then captures
+        board = state.board
+        opponent = 3 - state.current_player
+        captures, quiet = [], []
+        for move in moves:
+            if move == tt_move:
+                continue
+            r, c = move[1]
+            (captures if board[r][c] % 10 == opponent else quiet).append(move)
+        if self.shuffle_quiet:
+            self.rng.shuffle(quiet)
+        ordered = [tt_move] if tt_move in moves else []
+        return ordered + captures + quiet
+
+    def _store(self, key, depth, score, kind, move, ply):
+        # Win scores are stored relative to this node, not to the root
+        if score >= WIN_SCORE - MAX_DEPTH:
+            score += ply
+        elif score <= -WIN_SCORE + MAX_DEPTH:
+            score -= ply
+        self.tt.store(key, depth, score, kind, move)
+
+    def _search(self, state, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes & 255 == 0 and (self.stop_requested or
+                                      (self.deadline and time.perf_counter() > self.deadline)):
+            raise SearchTimeout()
+
+        tt_move = None
+        entry = self.tt.get(state.hash)
+        if entry is not None:
+            entry_depth, score, kind, tt_move = entry
+            if score >= WIN_SCORE - MAX_DEPTH:
+                score -= ply
+            elif score <= -WIN_SCORE + MAX_DEPTH:
+                score += ply
+            if entry_depth >= depth:
+                if kind == EXACT:
+                    return score
+                if kind == LOWER and score >= beta:
+                    return score
+                if kind == UPPER and score <= alpha:
+                    return score
+
+        if depth <= 0:
+            return evaluate(state, self.weights)
+
+        moves = state.legal_moves()
+        if not moves:
+            return -WIN_SCORE + ply
+
+        alpha_start = alpha
+        player = state.current_player
+        best_score, best_move = None, None
+        for move in self._order(state, moves, tt_move):
+            if state.apply(*move) == player:
+                score = WIN_SCORE - ply - 1
+            else:
+                score = -self._search(state, depth - 1, -beta, -alpha, ply + 1)
+            state.undo()
+            if best_score is None or score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= alpha_start:
+            kind = UPPER
+        elif best_score >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self._store(state.hash, depth, best_score, kind, best_move, ply)
+        return best_score
+
+
+ENGINE_TYPES = {
+    "random": RandomEngine,
+    "greedy": GreedyEngine,
+    "alphabeta": AlphaBetaEngine,
+    "smp": None,  # AI.ParallelSearch.ParallelEngine, imported when used
+}
+
+
+def engine_class(engine_type):
+    if engine_type == "smp":
+        from AI.ParallelSearch import ParallelEngine
+        return ParallelEngine
+    return ENGINE_TYPES[engine_type]
+
+
+def parse_engine_spec(spec):
+    # Preset name, settings dict or "type:key=value,..." string -> settings dict
+    if isinstance(spec, dict):
+        return dict(spec)
+    if spec in ENGINE_PRESETS:
+        return dict(ENGINE_PRESETS[spec])
+
+    engine_type, _, options = spec.partition(":")
+    if engine_type not in ENGINE_TYPES:
+        raise ValueError(f"Unknown engine: {spec}")
+    settings = {"type": engine_type}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        settings[key] = int(value) if value.isdigit() else float(value)
+    return settings
+
+
+def create_engine(spec, name=None, seed=None):
+    load_weights()  # Tuned evaluation weights, if there are any
+    settings = parse_engine_spec(spec)
+    cls = engine_class(settings.pop("type"))
+    if name is None:
+        name = spec if isinstance(spec, str) else cls.__name__
+    return cls(name, seed=seed, **settings)
@@ -0,0 +1,170 @@
+# AI/Evaluation.py
+# Static evaluation of positions for the search engines.
+# A position is scored as a weighted sum of features, each computed from the point of
+# view of one player (positive is good for that player). Weights are per game type;
+# features with a zero weight are not computed. The engines use the tuned weights of
+# eval_weights.json (see AI/WeightTuning.py) for the games it has, the defaults below
+# for the others.
+import json
+
+from Rules.GameRules import pawn_positions
+
+WIN_SCORE = 100000  # Beyond any evaluation; a win in n plies scores WIN_SCORE - n
+WEIGHTS_FILE = "eval_weights.json"
+
+
+def _katarenga_material(state, player):
+    counts = state.tracker.pawns
+    return counts[player] - counts[3 - player]
+
+
+def _progress(player, row):
+    # Rows left to cross: player 1 moves up from row 8, player 2 down from row 1
+    return 8 - row if player == 1 else row - 1
+
+
+def _katarenga_advancement(state, player):
+    score = 0
+    for r, row in enumerate(state.board):
+        for value in row:
+            owner = value % 10
+            if owner == player:
+                score += _progress(player, r)
+            elif owner:
+                score -= _progress(owner, r)
+    return score
+
+
+def _katarenga_corners(state, player):
+    corners = state.tracker.corners
+    return corners[player] - corners[3 - player]
+
+
+def _katarenga_corner_distance(state, player):
+    # Fewer moves than the opponent before two pawns reach the corners is good
+    tracker = state.tracker
+    return tracker.corner_race(3 - player) - tracker.corner_race(player)
+
+
+def _mobility(state, player):
+    rules = state.rules
+    return len(rules.legal_moves(state.board, player)) - len(rules.legal_moves(state.board, 3 - player))
+
+
+def _congress_groups(state, player):
+    tracker = state.tracker
+    return tracker.components(player) - tracker.components(3 - player)
+
+
+def _spread(board, player):
+    # Total Manhattan distance of the pawns to their center
+    pawns = pawn_positions(board, player)
+    if not pawns:
+        return 0.0
+    mean_r = sum(r for r, _ in pawns) / len(pawns)
+    mean_c = sum(c for _, c in pawns) / len(pawns)
+    return sum(abs(r - mean_r) + abs(c - mean_c) for r, c in pawns)
+
+
+def _congress_spread(state, player):
+    return _spread(state.board, player) - _spread(state.board, 3 - player)
+
+
+def _isolation_parity(state, player):
+    # If placements never removed other squares, the player to move on an odd count
+    # of safe squares would make the last placement
+    safe = len(state.rules.safe_squares(state.board))
+    odd = safe % 2 == 1
+    to_move = state.current_player == player
+    return 1 if odd == to_move else -1
+
+
+def _isolation_safe_squares(state, player):
+    return len(state.rules.safe_squares(state.board))
+
+
+FEATURES = {
+    1: {
+        "material": _katarenga_material,
+        "advancement": _katarenga_advancement,
+        "corners": _katarenga_corners,
+        "corner_distance": _katarenga_corner_distance,
+        "mobility": _mobility,
+    },
+    2: {
+        "groups": _congress_groups,
+        "spread": _congress_spread,
+        "mobility": _mobility,
+    },
+    3: {
+        "parity": _isolation_parity,
+        "safe_squares": _isolation_safe_squares,
+    },
+}
+
+DEFAULT_WEIGHTS = {
+    1: {"material": 100.0, "advancement": 4.0, "corners": 150.0, "corner_distance": 6.0,
+        "mobility": 2.0},
+    2: {"groups": -40.0, "spread": -3.0, "mobility": 1.0},
+    3: {"parity": 20.0, "safe_squares": 0.0},
+}
+
+WEIGHTS = {game_type: dict(weights) for game_type, weights in DEFAULT_WEIGHTS.items()}  # Weights in use
+_loaded_files = set()
+
+
+def load_weights(filename=WEIGHTS_FILE):
+    # Use the tuned weights of the file for the games it has (read once per process).
+    # Returns the game types loaded
+    if filename in _loaded_files:
+        return []
+    _loaded_files.add(filename)
+    try:
+        with open(filename, "r") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Ignoring weights file '{filename}': {e}")
+        return []
+
+    loaded = []
+    for key, weights in data.get("weights", {}).items():
+        game_type = int(key)
+        if game_type in FEATURES and set(weights) <= set(FEATURES[game_type]):
+            WEIGHTS[game_type] = {name: float(weight) for name, weight in weights.items()}
+            loaded.append(game_type)
+    return loaded
+
+
+def feature_vector(state, player=None):
+    # All features of the game type, in FEATURES order
+    player = player or state.current_player
+    return [feature(state, player) for feature in FEATURES[state.game_type].values()]
+
+
+def evaluate(state, weights=None):
+    # Score for the player to move
+    weights = weights or WEIGHTS[state.game_type]
+    features = FEATURES[state.game_type]
+    player = state.current_player
+    score = 0.0
+    for name, weight in weights.items():
+        if weight:
+            score += weight * features[name](state, player)
+    return score
+
+
+def likely_moves(state, count):
+    # The count best moves of the player to move by a 1-ply evaluation
+    player = state.current_player
+    scored = []
+    for move in state.legal_moves():
+        if state.apply(*move) == player:
+            score = WIN_SCORE
+        else:
+            score = -evaluate(state)
+        state.undo()
+        scored.append((score, move))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [move for _, move in scored[:count]]
@@ -0,0 +1,219 @@
+# AI/OpeningBook.py
+# Opening book: best moves of early positions, found offline by deep searches, so the
+# engines answer the first moves of a game at once.
+#
+# The book is a binary file of fixed-size records sorted by the position's Zobrist
+# hash (see Rules/Zobrist.py): a 16-byte header (magic, record count), then per position
+# the hash (uint64), the move (uint16, see AI/TranspositionTable.encode_move) and the
+# search score (int16). Lookups map the file with mmap and binary search it, so the
+# book is never loaded in memory and opens instantly whatever its size.
+#
+# The builder starts from the boards games are played on: the default board and the
+# boards most played in the recorded games (see Rules/GameRecord.py). It searches a
+# position, then follows the book move and the likeliest other moves (best by a shallow
+# search), --width in all, and searches again, down to --plies plies, so the positions
+# of both players get entries. Existing entries of the output file are kept, so a book
+# can be grown over several runs.
+#
+# Usage: python -m AI.OpeningBook --game 1 2 --boards 10 --plies 4 --time 5
+#        python -m AI.OpeningBook --stats
+import argparse
+import mmap
+import os
+import struct
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from AI.Evaluation import likely_moves
+from AI.TranspositionTable import decode_move, encode_move
+from Rules.GameRecord import RECORDS_DIR, GameRecord, list_records
+from Rules.GameRules import GAME_NAMES, get_rules
+from Rules.GameState import GameState
+
+BOOK_FILE = "opening_book.bin"
+MAGIC = b"KTBOOK01"
+HEADER = struct.Struct("<8sQ")
+RECORD = struct.Struct("<QHh")
+
+
+class OpeningBook:
+    def __init__(self, filename=BOOK_FILE):
+        self.filename = filename
+        self.file = open(filename, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"Empty opening book: {filename}")
+        magic, self.count = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or HEADER.size + self.count * RECORD.size > len(self.map):
+            self.close()
+            raise ValueError(f"Not an opening book: {filename}")
+
+    def _record(self, index):
+        return RECORD.unpack_from(self.map, HEADER.size + index * RECORD.size)
+
+    def lookup(self, key):
+        # (move, score) of the position, or None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, move, score = self._record(middle)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return decode_move(move), score
+        return None
+
+    def get_move(self, state):
+        # Book move of the position if it is legal there (hash collisions are not trusted)
+        entry = self.lookup(state.hash)
+        if entry is not None and state.is_legal(*entry[0]):
+            return entry[0]
+        return None
+
+    def entries(self):
+        for index in range(self.count):
+            key, move, score = self._record(index)
+            yield key, (decode_move(move), score)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+def write_book(filename, entries):
+    # entries: {hash: (move, score)}; written sorted, replacing the file at once
+    temp = filename + ".tmp"
+    with open(temp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(entries)))
+        for key in sorted(entries):
+            move, score = entries[key]
+            f.write(RECORD.pack(key, encode_move(move), max(-32768, min(32767, int(score)))))
+    os.replace(temp, filename)
+
+
+_books = {}
+
+
+def get_opening_book(filename=BOOK_FILE):
+    # Shared book of the file, or None if there is no usable book
+    if filename not in _books:
+        book = None
+        if os.path.exists(filename):
+            try:
+                book = OpeningBook(filename)
+            except (OSError, ValueError) as e:
+                print(f"Opening book not loaded: {e}")
+        _books[filename] = book
+    return _books[filename]
+
+
+def build_board(board, game_type, plies, width, time_limit, seed):
+    # Worker entry point: book entries {hash: (move, score)} of one starting board
+    from AI.Engines import AlphaBetaEngine  # Not at the top: the engines import the book
+    engine = AlphaBetaEngine("book", seed=seed, time=time_limit, book=False)
+    state = GameState(game_type, get_rules(game_type).setup_board(board))
+    entries = {}
+
+    def visit(ply):
+        if ply >= plies or state.winner or not state.legal_moves() or state.hash in entries:
+            return
+        move = engine.choose_move(state)
+        entries[state.hash] = (move, engine.info.get("score") or 0)
+        if ply + 1 >= plies:
+            return
+        # The book move and the likeliest others: the AI may play either side
+        followed = [move] + [other for other in likely_moves(state, width) if other != move][:width - 1]
+        for next_move in followed:
+            if not state.apply(*next_move):
+                visit(ply + 1)
+            state.undo()
+
+    visit(0)
+    return entries
+
+
+def played_boards(game_type, count, directory=RECORDS_DIR):
+    # The default board, then up to count boards most played in the recorded games of
+    # the game, as 8x8 tile boards
+    from Board.Board import Board
+    played = Counter()
+    for filename in list_records(directory):
+        try:
+            record = GameRecord(filename)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        if record.game_type == game_type:
+            board = record.board(0)
+            if len(board) == 10:
+                board = [row[1:9] for row in board[1:9]]  # Katarenga: no border and corners
+            played[tuple(tuple(value // 10 * 10 for value in row) for row in board)] += 1
+        record.close()
+
+    boards = [Board().get_default_tiles()]
+    for tiles, _ in played.most_common():
+        board = [list(row) for row in tiles]
+        if len(boards) > count:
+            break
+        if board not in boards:
+            boards.append(board)
+    return boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the opening book by deep searches of early positions")
+    parser.add_argument("--game", type=int, nargs="+", choices=[1, 2, 3], default=[1, 2],
+                        help="1=Katarenga, 2=Congress, 3=Isolation")
+    parser.add_argument("--boards", type=int, default=10,
+                        help="most played boards of the records used besides the default board")
+    parser.add_argument("--records", default=RECORDS_DIR, help="directory of the game records")
+    parser.add_argument("--board-file", help="JSON file with boards to use instead of the played boards")
+    parser.add_argument("--plies", type=int, default=4, help="depth of the book in plies")
+    parser.add_argument("--width", type=int, default=2, help="moves followed per position, the book move included")
+    parser.add_argument("--time", type=float, default=5.0, help="search time per book position, in seconds")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the searches")
+    parser.add_argument("--output", default=BOOK_FILE, help="book file, extended if it exists")
+    parser.add_argument("--stats", action="store_true", help="only print the number of positions of the book")
+    args = parser.parse_args()
+
+    entries = {}
+    if os.path.exists(args.output):
+        book = OpeningBook(args.output)
+        entries = dict(book.entries())
+        book.close()
+    if args.stats:
+        print(f"{args.output}: {len(entries)} positions")
+        return
+
+    if args.board_file:
+        from Board.FairnessAnalyzer import read_boards
+        file_boards = list(read_boards(args.board_file))
+
+    start = time.perf_counter()
+    before = len(entries)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {}
+        for game_type in args.game:
+            boards = file_boards if args.board_file else played_boards(game_type, args.boards, args.records)
+            print(f"{GAME_NAMES[game_type]}: {len(boards)} boards")
+            for index, board in enumerate(boards):
+                future = pool.submit(build_board, board, game_type, args.plies, args.width, args.time,
+                                     f"{args.seed}:{game_type}:{index}")
+                futures[future] = game_type
+        for done, future in enumerate(as_completed(futures), 1):
+            entries.update(future.result())
+            print(f"  {done}/{len(futures)} boards ({GAME_NAMES[futures[future]]}), {len(entries)} positions")
+
+    write_book(args.output, entries)
+    print(f"{args.output}: {len(entries) - before} new positions, {len(entries)} in total "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# AI/ParallelSearch.py
+# Lazy SMP: several worker processes search the same root position at once and share
+# what they learn through one transposition table in shared memory (see
+# AI/TranspositionTable.py). Worker 0 searches like the plain alpha-beta engine; the
+# helpers order their moves differently, so they fill the table with other parts of
+# the tree, which worker 0 then finds already searched. The move played is the one of
+# the worker that completed the deepest iteration.
+#
+# Processes are used instead of threads because of the GIL. They are started on the
+# first search and kept until close(). They are always spawned, never forked: a fork
+# from the engine's search thread could copy locks held by the thread reading stdin.
+#
+# Usage: python -m AI.ParallelSearch --game 1 --time 2 --workers 1 2 4
+#        (benchmark: nodes per second of each worker and in total)
+import argparse
+import ctypes
+import multiprocessing
+import os
+import random
+import time
+
+from AI.Engines import AlphaBetaEngine, Engine
+from AI.Evaluation import load_weights
+from AI.OpeningBook import get_opening_book
+from AI.TranspositionTable import SharedTable
+from Rules.GameState import GameState
+
+
+class _WorkerEngine(AlphaBetaEngine):
+    # Alpha-beta engine whose stop flag and deadline are shared with the main process.
+    # Only the main process clears the flag, before each search: a worker still starting
+    # (Engine.__init__ sets stop_requested to False) must not undo a stop already asked.
+    # A deadline set by the main process (a ponder hit) is in time.time(), perf_counter
+    # times being per process; 0 leaves the search's own deadline.
+    def __init__(self, name, stop_flag, shared_deadline, **settings):
+        self.stop_flag = stop_flag
+        self.shared_deadline = shared_deadline
+        self.own_deadline = None
+        super().__init__(name, **settings)
+
+    @property
+    def stop_requested(self):
+        return self.stop_flag.value != 0
+
+    @stop_requested.setter
+    def stop_requested(self, value):
+        if value:
+            self.stop_flag.value = 1
+
+    @property
+    def deadline(self):
+        moved = self.shared_deadline.value
+        if moved:
+            return time.perf_counter() + moved - time.time()
+        return self.own_deadline
+
+    @deadline.setter
+    def deadline(self, value):
+        self.own_deadline = value
+
+
+def _worker_main(index, conn, buffer, stop_flag, shared_deadline, settings, seed):
+    load_weights()  # Spawned process: same evaluation weights as the main engine
+    table = SharedTable(buffer=buffer)
+    engine = _WorkerEngine(f"worker {index}", stop_flag, shared_deadline, seed=seed, table=table, **settings)
+    engine.shuffle_quiet = index > 0
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break  # The main process is gone
+        if message[0] == "quit":
+            break
+        _, game_type, board, player, time_limit = message
+        state = GameState(game_type, board, player)
+        start = time.perf_counter()
+        move = engine.choose_move(state, time_limit)
+        conn.send((move, engine.info, time.perf_counter() - start))
+    conn.close()
+
+
+class ParallelEngine(Engine):
+    def __init__(self, name, seed=None, workers=None, depth=None, time=None, weights=None, tt_mb=64, book=True):
+        super().__init__(name, seed)
+        self.book = get_opening_book() if book else None
+        self.worker_count = int(workers or os.cpu_count() or 1)
+        self.settings = {"depth": depth, "time": time, "weights": weights, "book": False}
+        self.time_limit = time
+        self.context = multiprocessing.get_context("spawn")
+        self.table = SharedTable(tt_mb, context=self.context)
+        self.stop_flag = self.context.Value(ctypes.c_byte, 0, lock=False)
+        self.shared_deadline = self.context.Value(ctypes.c_double, 0.0, lock=False)  # See _WorkerEngine
+        self.workers = []  # (process, connection)
+        self.seed = seed
+
+    def _start_workers(self):
+        base = self.rng.getrandbits(32)
+        for index in range(self.worker_count):
+            parent_conn, child_conn = self.context.Pipe()
+            process = self.context.Process(target=_worker_main,
+                                              args=(index, child_conn, self.table.buffer, self.stop_flag,
+                                                    self.shared_deadline, self.settings, base + index),
+                                              daemon=True)
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+
+    def new_game(self, seed=None):
+        super().new_game(seed)
+        self.table.clear()
+
+    def stop(self):
+        self.stop_requested = True
+        self.stop_flag.value = 1
+
+    def set_deadline(self, deadline):
+        # Moves the end of the running search of every worker (ponder hit)
+        self.shared_deadline.value = time.time() + deadline - time.perf_counter()
+        return True
+
+    def choose_move(self, state, time_limit=None):
+        move = self.book_move(state)
+        if move is not None:
+            return move
+        if not state.legal_moves():
+            self.info = {"nodes": 0, "depth": 0}
+            return None
+        if not self.workers:
+            self._start_workers()
+
+        time_limit = time_limit if time_limit is not None else self.time_limit
+        self.shared_deadline.value = 0.0  # From a ponder hit that came after the last search
+        self.stop_flag.value = 0
+        if self.stop_requested:  # stop() came before the search, or while clearing the flag
+            self.stop_flag.value = 1
+        board = [row[:] for row in state.board]
+        for _, conn in self.workers:
+            conn.send(("search", state.game_type, board, state.current_player, time_limit))
+
+        # Worker 0 decides when the search ends; the helpers are stopped then
+        results = [self.workers[0][1].recv()]
+        self.stop_flag.value = 1
+        results += [conn.recv() for _, conn in self.workers[1:]]
+        self.shared_deadline.value = 0.0  # Back to the time limit of each search
+
+        best_move, best_info = None, None
+        workers = []
+        for move, info, elapsed in results:
+            workers.append({"depth": info.get("depth", 0), "nodes": info["nodes"],
+                            "nps": int(info["nodes"] / elapsed) if elapsed > 0 else 0})
+            # Deepest completed iteration wins, worker 0 on ties
+            if move is not None and (best_info is None or info.get("depth", 0) > best_info.get("depth", 0)):
+                best_move, best_info = move, info
+
+        elapsed = max(elapsed for _, _, elapsed in results)
+        nodes = sum(worker["nodes"] for worker in workers)
+        self.info = {"nodes": nodes, "depth": best_info.get("depth", 0), "score": best_info.get("score"),
+                     "nps": int(nodes / elapsed) if elapsed > 0 else 0, "workers": workers}
+        return best_move
+
+    def close(self):
+        for process, conn in self.workers:
+            try:
+                conn.send(("quit",))
+            except OSError:
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+            conn.close()
+        self.workers = []
+
+    def __del__(self):
+        if self.workers:
+            self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the speed of the parallel search")
+    parser.add_argument("--game", type=int, choices=[1, 2, 3], default=1, help="1=Katarenga, 2=Congress, 3=Isolation")
+    parser.add_argument("--time", type=float, default=2.0, help="seconds per search")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="worker counts to compare")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the board")
+    args = parser.parse_args()
+
+    from AI.Tournament import sample_boards
+    from Rules.GameRules import GAME_NAMES, get_rules
+    board = get_rules(args.game).setup_board(sample_boards(1, random.Random(args.seed))[0])
+    state = GameState(args.game, board)
+
+    print(f"{GAME_NAMES[args.game]}, {args.time}s per search")
+    for count in args.workers:
+        engine = ParallelEngine(f"smp x{count}", seed=args.seed, workers=count, time=args.time)
+        engine.choose_move(state)  # Starts the workers, not measured
+        engine.new_game()
+        engine.choose_move(state)
+        info = engine.info
+        print(f"{count} workers: depth {info['depth']}, {info['nodes']} nodes, {info['nps']} nodes/s")
+        for index, worker in enumerate(info["workers"]):
+            print(f"  worker {index}: depth {worker['depth']}, {worker['nodes']} nodes, {worker['nps']} nodes/s")
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
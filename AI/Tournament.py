@@ -0,0 +1,248 @@
+# AI/Tournament.py
+# Headless round-robin tournament between engine configurations (see AI/Engines.py).
+# Every pair of engines plays on boards sampled from the square library (or read from
+# a file), once with each color, for every selected game. Games run across a process
+# pool. The report gives, per game, Elo ratings with a 95% interval, the score and the
+# average time (wall clock) and nodes per move of each engine, and is also written as CSV.
+#
+# Usage: python -m AI.Tournament --engines random greedy ab-d1 ab-d2 --boards 20
+#        python -m AI.Tournament --engines ab-t0.1 "alphabeta:time=0.1,depth=2" --game 1 --rounds 2
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from AI.Engines import create_engine, parse_engine_spec
+from Rules.GameRules import GAME_NAMES, get_rules
+from Rules.GameState import GameState
+
+BASE_ELO = 1500
+ELO_SCALE = 400 / math.log(10)  # Elo points per unit of the natural logistic scale
+Z_95 = 1.959963984540054
+
+
+def play_match(specs, board, game_type, seed, max_plies):
+    # Worker entry point: specs[0] plays as player 1, specs[1] as player 2.
+    # Returns the winner (1, 2 or 0 for a game stopped at max_plies), the length and
+    # for each side the number of moves, seconds spent choosing them and nodes searched.
+    # Wall time: the smp engines search in worker processes, whose CPU time the
+    # process_time of this process would leave out
+    engines = [create_engine(spec, seed=f"{seed}:{i}") for i, spec in enumerate(specs)]
+    for engine in engines:
+        engine.new_game()
+    state = GameState(game_type, get_rules(game_type).setup_board(board))
+    moves, seconds, nodes = [0, 0], [0.0, 0.0], [0, 0]
+
+    winner = 0
+    for _ in range(max_plies):
+        if not state.legal_moves():
+            # Only possible at the start, later a stuck player has already lost
+            winner = 3 - state.current_player
+            break
+        side = state.current_player - 1
+        start = time.perf_counter()
+        move = engines[side].choose_move(state)
+        seconds[side] += time.perf_counter() - start
+        moves[side] += 1
+        nodes[side] += engines[side].info.get("nodes", 0)
+        if state.apply(*move):
+            winner = state.winner
+            break
+
+    for engine in engines:
+        engine.close()
+    return {"winner": winner, "plies": state.ply, "moves": moves, "seconds": seconds, "nodes": nodes}
+
+
+def sample_boards(count, rng):
+    # Random boards of the square library, as 8x8 tile boards
+    from Board.BoardEnumerator import BoardEnumerator
+    from Board.SquareLibrary import get_square_library
+    enumerator = BoardEnumerator(get_square_library().get_squares().values())
+    return [enumerator.random_board(rng) for _ in range(count)]
+
+
+def elo_ratings(names, results, prior_draws=1.0):
+    # Maximum likelihood Bradley-Terry ratings from results[(a, b)] = [a wins, draws, b wins].
+    # Draws count as half a win for each side; one virtual draw between every pair
+    # keeps the ratings finite when an engine won or lost all its games.
+    # Returns {name: (elo, 95% half-width)}, anchored on an average of BASE_ELO
+    n = len(names)
+    index = {name: i for i, name in enumerate(names)}
+    games = [[0.0] * n for _ in range(n)]
+    score = [0.0] * n
+    for i, j in itertools.combinations(range(n), 2):
+        games[i][j] = games[j][i] = prior_draws
+        score[i] += prior_draws / 2
+        score[j] += prior_draws / 2
+    for (a, b), (wins, draws, losses) in results.items():
+        i, j = index[a], index[b]
+        total = wins + draws + losses
+        games[i][j] += total
+        games[j][i] += total
+        score[i] += wins + draws / 2
+        score[j] += losses + draws / 2
+
+    # Minorization-maximization iterations (Hunter, 2004)
+    strength = [1.0] * n
+    for _ in range(10000):
+        new = []
+        for i in range(n):
+            denominator = sum(games[i][j] / (strength[i] + strength[j]) for j in range(n) if j != i)
+            new.append(score[i] / denominator if denominator else strength[i])
+        mean_log = sum(math.log(s) for s in new) / n
+        new = [s / math.exp(mean_log) for s in new]
+        done = max(abs(math.log(a / b)) for a, b in zip(new, strength)) < 1e-9
+        strength = new
+        if done:
+            break
+
+    ratings = {}
+    for name, i in index.items():
+        # Fisher information of the player's own rating, others held fixed
+        information = 0.0
+        for j in range(n):
+            if j != i:
+                p = strength[i] / (strength[i] + strength[j])
+                information += games[i][j] * p * (1 - p)
+        error = Z_95 * ELO_SCALE / math.sqrt(information) if information else float("inf")
+        ratings[name] = (BASE_ELO + ELO_SCALE * math.log(strength[i]), error)
+    return ratings
+
+
+def run_tournament(names, specs, boards, args):
+    # Returns {game_type: [(engine a, engine b, result dict), ...]}
+    jobs = []
+    for game_type in args.game:
+        for b, board in enumerate(boards):
+            for (a, spec_a), (c, spec_c) in itertools.combinations(list(zip(names, specs)), 2):
+                for round_index in range(args.rounds):
+                    # Colors swapped on the same board, so neither engine gets the better side
+                    for first, second in (((a, spec_a), (c, spec_c)), ((c, spec_c), (a, spec_a))):
+                        seed = f"{args.seed}:{game_type}:{b}:{round_index}:{first[0]}:{second[0]}"
+                        jobs.append((game_type, first[0], second[0],
+                                     ((first[1], second[1]), board, game_type, seed, args.max_plies)))
+
+    print(f"{len(jobs)} games on {len(boards)} boards, {args.workers} workers")
+    games = {game_type: [] for game_type in args.game}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(play_match, *job[3]): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            game_type, first, second, _ = futures[future]
+            games[game_type].append((first, second, future.result()))
+            if done % 50 == 0 or done == len(jobs):
+                print(f"  {done}/{len(jobs)} games played")
+    return games
+
+
+def summarize(names, played):
+    # Per engine statistics and ratings of one game's results
+    stats = {name: {"games": 0, "wins": 0, "draws": 0, "losses": 0, "moves": 0, "seconds": 0.0, "nodes": 0}
+             for name in names}
+    pairs = {}
+    for first, second, result in played:
+        pair = pairs.setdefault((first, second), [0, 0, 0])
+        winner = result["winner"]
+        pair[0 if winner == 1 else 2 if winner == 2 else 1] += 1
+        for side, name in enumerate((first, second)):
+            entry = stats[name]
+            entry["games"] += 1
+            if winner == 0:
+                entry["draws"] += 1
+            elif winner == side + 1:
+                entry["wins"] += 1
+            else:
+                entry["losses"] += 1
+            entry["moves"] += result["moves"][side]
+            entry["seconds"] += result["seconds"][side]
+            entry["nodes"] += result["nodes"][side]
+
+    ratings = elo_ratings(names, pairs)
+    rows = []
+    for name in names:
+        entry = stats[name]
+        elo, error = ratings[name]
+        moves = entry["moves"] or 1
+        rows.append({
+            "engine": name,
+            "elo": round(elo, 1),
+            "elo_95": round(error, 1),
+            "games": entry["games"],
+            "wins": entry["wins"],
+            "draws": entry["draws"],
+            "losses": entry["losses"],
+            "score": round((entry["wins"] + entry["draws"] / 2) / (entry["games"] or 1), 4),
+            "ms_per_move": round(entry["seconds"] / moves * 1000, 3),
+            "nodes_per_move": round(entry["nodes"] / moves, 1),
+        })
+    rows.sort(key=lambda row: row["elo"], reverse=True)
+    return rows
+
+
+def print_table(game_type, rows):
+    print()
+    print(f"{GAME_NAMES[game_type]}")
+    print(f"{'engine':<24} {'elo':>7} {'+/-':>6} {'games':>6} {'W-D-L':>13} {'score':>6} "
+          f"{'ms/move':>9} {'nodes/move':>11}")
+    for row in rows:
+        wdl = f"{row['wins']}-{row['draws']}-{row['losses']}"
+        print(f"{row['engine']:<24} {row['elo']:7.0f} {row['elo_95']:6.0f} {row['games']:6d} {wdl:>13} "
+              f"{row['score'] * 100:5.1f}% {row['ms_per_move']:9.2f} {row['nodes_per_move']:11.0f}")
+
+
+def write_csv(filename, tables):
+    fields = ["game", "engine", "elo", "elo_95", "games", "wins", "draws", "losses",
+              "score", "ms_per_move", "nodes_per_move"]
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for game_type, rows in tables.items():
+            for row in rows:
+                writer.writerow({"game": GAME_NAMES[game_type], **row})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between AI engines")
+    parser.add_argument("--engines", nargs="+", default=["random", "greedy", "ab-d1", "ab-d2"],
+                        help="engine presets or specs like 'alphabeta:depth=3,time=0.5'")
+    parser.add_argument("--game", type=int, nargs="+", choices=[1, 2, 3], default=[1, 2, 3],
+                        help="1=Katarenga, 2=Congress, 3=Isolation")
+    parser.add_argument("--boards", type=int, default=10, help="boards sampled from the square library")
+    parser.add_argument("--board-file", help="JSON file with boards to use instead of sampling the library")
+    parser.add_argument("--rounds", type=int, default=1, help="games per pair, board and color")
+    parser.add_argument("--max-plies", type=int, default=200, help="plies before a game counts as a draw")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", default="tournament_results.csv", help="CSV results file")
+    args = parser.parse_args()
+
+    if len(set(args.engines)) != len(args.engines) or len(args.engines) < 2:
+        parser.error("at least two different engines are needed")
+    try:
+        specs = [parse_engine_spec(spec) for spec in args.engines]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.board_file:
+        from Board.FairnessAnalyzer import read_boards
+        boards = list(read_boards(args.board_file))
+    else:
+        boards = sample_boards(args.boards, random.Random(args.seed))
+
+    start = time.perf_counter()
+    games = run_tournament(args.engines, specs, boards, args)
+    tables = {game_type: summarize(args.engines, games[game_type]) for game_type in args.game}
+    for game_type, rows in tables.items():
+        print_table(game_type, rows)
+
+    write_csv(args.output, tables)
+    print()
+    print(f"Results written to {args.output} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# AI/TranspositionTable.py
+# Transposition tables of the alpha-beta search, keyed by the position's Zobrist hash.
+#  - DictTable: a plain dict, private to one search
+#  - SharedTable: fixed-size table in shared memory, read and written by several
+#    processes at once without locks (see AI/ParallelSearch.py)
+#
+# A shared entry is two 64-bit words: key ^ data and data. A reader only accepts an
+# entry whose two words agree with its key, so an entry torn by two writers at once
+# is ignored rather than misread. data packs the best move (16 bits), the depth
+# (8 bits), the kind of score (2 bits) and the score in 1/16 units (38 bits).
+import ctypes
+import multiprocessing
+
+from Rules.GameRules import code_to_move, move_to_code
+
+NO_MOVE = 0xFFFF
+SCORE_SCALE = 16
+SCORE_OFFSET = 1 << 37
+
+
+def encode_move(move):
+    # 16-bit code of a move (see GameRules.move_to_code), NO_MOVE for None
+    return NO_MOVE if move is None else move_to_code(move)
+
+
+def decode_move(code):
+    return None if code == NO_MOVE else code_to_move(code)
+
+
+class DictTable:
+    def __init__(self, max_entries=1_000_000):
+        self.max_entries = max_entries
+        self.entries = {}
+
+    def get(self, key):
+        # (depth, score, kind, move) or None
+        return self.entries.get(key)
+
+    def store(self, key, depth, score, kind, move):
+        if len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        self.entries[key] = (depth, score, kind, move)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class SharedTable:
+    def __init__(self, size_mb=64, buffer=None, context=multiprocessing):
+        # size rounded down to a power of two of entries; buffer is the shared array of
+        # another SharedTable, to attach to it (e.g. in a worker process)
+        if buffer is None:
+            slots = 1
+            while slots * 2 * 16 <= size_mb * 1024 * 1024:
+                slots *= 2
+            buffer = context.RawArray(ctypes.c_uint64, slots * 2)
+        self.buffer = buffer
+        self.words = memoryview(buffer).cast("B").cast("Q")
+        self.mask = len(self.words) // 2 - 1
+
+    def get(self, key):
+        index = (key & self.mask) * 2
+        words = self.words
+        data = words[index + 1]
+        if words[index] ^ data != key or data == 0:
+            return None
+        move = data & 0xFFFF
+        depth = (data >> 16) & 0xFF
+        kind = (data >> 24) & 0x3
+        score = ((data >> 26) - SCORE_OFFSET) / SCORE_SCALE
+        return depth, score, kind, decode_move(move)
+
+    def store(self, key, depth, score, kind, move):
+        score = round(score * SCORE_SCALE) + SCORE_OFFSET
+        data = (score << 26) | (kind << 24) | (min(depth, 255) << 16) | encode_move(move)
+        index = (key & self.mask) * 2
+        self.words[index] = key ^ data
+        self.words[index + 1] = data
+
+    def clear(self):
+        ctypes.memset(self.buffer, 0, ctypes.sizeof(self.buffer))
+
+    def __len__(self):
+        return self.mask + 1
@@ -0,0 +1,245 @@
+# AI/WeightTuning.py
+# Fits the evaluation weights (AI/Evaluation.py) to game results.
+#
+# Positions come from game records (see Rules/GameRecord.py): the games played in the
+# app and self-play games, which --self-play adds to records/selfplay. Every position
+# from --skip plies on, one in --every (odd, so both players are to move in some),
+# becomes the feature vector of the player to move, labelled 1 if that player went on
+# to win (games without a winner are left out). Records are read in batches across a
+# process pool. The positions of the last records are held out to test the fit.
+#
+# A logistic regression of the result on the features, fitted by Newton's method with
+# NumPy, gives one weight per feature. Weights are exported in evaluation points,
+# SCORE_SCALE points being one unit of log-odds, to eval_weights.json, which the
+# engines load when they start (entries of other games are kept).
+#
+# Usage: python -m AI.WeightTuning --game 1 2 --self-play 400
+#        python -m AI.WeightTuning --game 1 --records records --every 1 --skip 0
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from AI.Engines import create_engine
+from AI.Evaluation import DEFAULT_WEIGHTS, FEATURES, WEIGHTS_FILE, feature_vector
+from Rules.GameRecord import EXTENSION, RECORDS_DIR, GameRecord, GameRecorder, list_records
+from Rules.GameRules import GAME_NAMES, get_rules
+from Rules.GameState import GameState
+
+SELF_PLAY_DIR = os.path.join(RECORDS_DIR, "selfplay")
+SCORE_SCALE = 100.0  # Evaluation points per unit of log-odds of winning
+FILE_VERSION = 1
+
+
+def play_self_play(spec, board, game_type, seed, max_plies, random_plies, directory):
+    # Worker entry point: one engine against itself, after a few random moves so the
+    # games differ, recorded in directory. Returns the winner (0: stopped at max_plies)
+    rng = random.Random(seed)
+    engine = create_engine(spec, seed=seed)
+    engine.new_game()
+    state = GameState(game_type, get_rules(game_type).setup_board(board))
+    # Named after the seed: workers never pick the same file
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    filename = os.path.join(directory, f"{GAME_NAMES[game_type]}_{stamp}_{seed.replace(':', '-')}{EXTENSION}")
+    recorder = GameRecorder(filename, game_type, state.board)
+    try:
+        for ply in range(max_plies):
+            moves = state.legal_moves()
+            if not moves:
+                return 3 - state.current_player
+            move = rng.choice(moves) if ply < random_plies else engine.choose_move(state)
+            winner = state.apply(*move)
+            recorder.add_move(move[0], move[1], state.board)
+            if winner:
+                return winner
+        return 0
+    finally:
+        recorder.close()
+        engine.close()
+
+
+def extract_batch(filenames, game_type, skip, every):
+    # Worker entry point: feature vectors and labels of the positions of a batch of
+    # records, and the number of positions of each game used
+    rows, labels, sizes = [], [], []
+    for filename in filenames:
+        try:
+            record = GameRecord(filename)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {filename}: {e}")
+            continue
+        if record.game_type != game_type:
+            record.close()
+            continue
+        state = record.state(0)
+        positions = []
+        for ply, move in enumerate(record.moves()):
+            if ply >= skip and (ply - skip) % every == 0:
+                positions.append((feature_vector(state), state.current_player))
+            state.apply(*move)
+        record.close()
+        if not state.winner or not positions:
+            continue
+        sizes.append(len(positions))
+        for features, player in positions:
+            rows.append(features)
+            labels.append(1.0 if player == state.winner else 0.0)
+    return rows, labels, sizes
+
+
+def extract_features(filenames, game_type, skip, every, workers, batch_size=50):
+    # (positions, features) matrix, labels and positions of each game used, in record order
+    batches = [filenames[i:i + batch_size] for i in range(0, len(filenames), batch_size)]
+    rows, labels, sizes = [], [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_rows, batch_labels, batch_sizes in pool.map(extract_batch, batches, [game_type] * len(batches),
+                                                              [skip] * len(batches), [every] * len(batches)):
+            rows.extend(batch_rows)
+            labels.extend(batch_labels)
+            sizes.extend(batch_sizes)
+    width = len(FEATURES[game_type])
+    return np.array(rows, dtype=np.float64).reshape(-1, width), np.array(labels), sizes
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -500, 500)))
+
+
+def fit_logistic(features, labels, l2=1e-3, iterations=100):
+    # Weights and intercept maximising the mean log-likelihood (minus an L2 penalty on
+    # the weights), by Newton's method on standardized features
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+    x = np.hstack([features / scale, np.ones((len(features), 1))])
+    penalty = np.full(x.shape[1], l2)
+    penalty[-1] = 0.0
+    w = np.zeros(x.shape[1])
+    for _ in range(iterations):
+        p = sigmoid(x @ w)
+        gradient = x.T @ (p - labels) / len(x) + penalty * w
+        hessian = (x * (p * (1 - p))[:, None]).T @ x / len(x) + np.diag(penalty)
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < 1e-9:
+            break
+    return w[:-1] / scale, w[-1]
+
+
+def prediction_quality(features, labels, weights):
+    # Log loss and accuracy of sigmoid(evaluation / SCORE_SCALE) as a win probability
+    p = np.clip(sigmoid(features @ weights / SCORE_SCALE), 1e-12, 1 - 1e-12)
+    loss = -np.mean(labels * np.log(p) + (1 - labels) * np.log(1 - p))
+    accuracy = np.mean((p > 0.5) == (labels > 0.5))
+    return loss, accuracy
+
+
+def tune(game_type, filenames, args):
+    # Fits the weights of one game; returns (weights, report) or None without data
+    features, labels, sizes = extract_features(filenames, game_type, args.skip, args.every, args.workers)
+    games = len(sizes)
+    if games < 2 or len(set(labels)) < 2:
+        print(f"{GAME_NAMES[game_type]}: not enough finished games ({games}) in the records")
+        return None
+
+    # Held out positions: those of the last records, so the test games are unseen. The
+    # split falls between two games, the first one reaching the training share
+    ends = np.cumsum(sizes)
+    split = int(ends[min(np.searchsorted(ends, len(features) * (1 - args.holdout)), games - 1)])
+    logit, intercept = fit_logistic(features[:split], labels[:split], args.l2)
+    names = list(FEATURES[game_type])
+    weights = {name: round(float(weight * SCORE_SCALE), 3) for name, weight in zip(names, logit)}
+
+    tuned_vector = np.array([weights[name] for name in names])
+    default_vector = np.array([DEFAULT_WEIGHTS[game_type].get(name, 0.0) for name in names])
+    test_x, test_y = (features[split:], labels[split:]) if split < len(features) else (features, labels)
+    tuned_loss, tuned_accuracy = prediction_quality(test_x, test_y, tuned_vector)
+    default_loss, default_accuracy = prediction_quality(test_x, test_y, default_vector)
+    report = {
+        "games": games,
+        "positions": int(len(features)),
+        "side_to_move": round(float(intercept), 4),
+        "log_loss": round(float(tuned_loss), 4),
+        "accuracy": round(float(tuned_accuracy), 4),
+        "default_log_loss": round(float(default_loss), 4),
+        "default_accuracy": round(float(default_accuracy), 4),
+    }
+
+    print(f"{GAME_NAMES[game_type]}: {games} games, {len(features)} positions")
+    for name in names:
+        print(f"  {name:<14} {DEFAULT_WEIGHTS[game_type].get(name, 0.0):9.2f} -> {weights[name]:9.2f}")
+    print(f"  held out log loss {default_loss:.4f} -> {tuned_loss:.4f}, "
+          f"accuracy {default_accuracy * 100:.1f}% -> {tuned_accuracy * 100:.1f}%")
+    return weights, report
+
+
+def write_weights(filename, tuned):
+    # Adds the tuned games to the weights file (write then rename)
+    data = {"version": FILE_VERSION, "score_scale": SCORE_SCALE, "weights": {}, "tuning": {}}
+    if os.path.exists(filename):
+        try:
+            with open(filename, "r") as f:
+                old = json.load(f)
+            if old.get("version") == FILE_VERSION:
+                data = old
+        except (OSError, json.JSONDecodeError):
+            print(f"Replacing invalid weights file '{filename}'.")
+    for game_type, (weights, report) in tuned.items():
+        data["weights"][str(game_type)] = weights
+        data["tuning"][str(game_type)] = {**report, "date": time.strftime("%Y-%m-%d %H:%M")}
+    tmp = filename + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the evaluation weights to the results of recorded games")
+    parser.add_argument("--game", type=int, nargs="+", choices=[1, 2, 3], default=[1, 2],
+                        help="1=Katarenga, 2=Congress, 3=Isolation")
+    parser.add_argument("--records", nargs="+", default=[RECORDS_DIR, SELF_PLAY_DIR],
+                        help="directories of game records")
+    parser.add_argument("--self-play", type=int, default=0, help="self-play games to record first, per game")
+    parser.add_argument("--engine", default="ab-d1", help="engine of the self-play games")
+    parser.add_argument("--random-plies", type=int, default=4, help="random moves opening each self-play game")
+    parser.add_argument("--max-plies", type=int, default=200, help="plies before a self-play game is stopped")
+    parser.add_argument("--skip", type=int, default=4, help="opening plies left out of the positions")
+    parser.add_argument("--every", type=int, default=3,
+                        help="one position in this many plies (odd: positions of both players)")
+    parser.add_argument("--holdout", type=float, default=0.1, help="share of positions kept to test the fit")
+    parser.add_argument("--l2", type=float, default=1e-3, help="L2 penalty on the standardized weights")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--output", default=WEIGHTS_FILE, help="weights file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.self_play:
+        from AI.Tournament import sample_boards
+        os.makedirs(SELF_PLAY_DIR, exist_ok=True)
+        boards = sample_boards(args.self_play, random.Random(args.seed))
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for game_type in args.game:
+                jobs = [(args.engine, board, game_type, f"{args.seed}:{game_type}:{i}", args.max_plies,
+                         args.random_plies, SELF_PLAY_DIR) for i, board in enumerate(boards)]
+                winners = list(pool.map(play_self_play, *zip(*jobs)))
+                print(f"{GAME_NAMES[game_type]}: {len(winners)} self-play games recorded "
+                      f"({winners.count(0)} stopped at {args.max_plies} plies)")
+
+    filenames = sorted({name for directory in args.records for name in list_records(directory)})
+    tuned = {}
+    for game_type in args.game:
+        result = tune(game_type, filenames, args)
+        if result:
+            tuned[game_type] = result
+
+    if tuned:
+        write_weights(args.output, tuned)
+        print(f"Weights written to {args.output} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
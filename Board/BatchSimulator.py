@@ -0,0 +1,577 @@
+# Board/BatchSimulator.py
+# Thousands of Katarenga or Isolation games played side by side on NumPy arrays, for
+# self-play data and fairness studies (random moves, or moves picked by a policy that
+# sees the legal moves of the whole batch at once).
+#
+# Each position is a few 64-bit masks of the 8x8 playing area (the pawns of each
+# player, the squares of each tile color), so the targets of every pawn of every game
+# are found with table lookups and bit operations on whole arrays: a line stops at the
+# first pawn or tile of the piece's own color (lowest set bit for the directions along
+# which square indexes grow, highest set bit for the others). Katarenga's four corners
+# are four extra target bits per pawn.
+#
+# Isolation needs no search at all: a new pawn can only stand on a square no line
+# reaches, so it never shortens a line already on the board, and the attacked squares
+# of a position are those of the position before plus the new pawn's targets.
+#
+# Slots whose game is over wait for the others; play() starts the next game in them.
+# Needs NumPy 2 (np.bitwise_count).
+#
+# Usage: python -m Board.BatchSimulator --game 1 --games 20000 --compare 200
+#        python -m Board.BatchSimulator --game 3 --board board.json --batch 8192
+import argparse
+import random
+import time
+
+import numpy as np
+
+from Rules.GameRules import BLUE, DIAGONALS, GAME_NAMES, GREEN, KING_STEPS, KNIGHT_STEPS, LINES, RED, YELLOW, get_rules
+from Rules.GameState import GameState
+from Rules.KatarengaRules import CORNER_ROWS, CORNERS
+
+ONE = np.uint64(1)
+SQUARE_BITS = ONE << np.arange(64, dtype=np.uint64)
+SLIDERS = ((YELLOW, DIAGONALS), (RED, LINES))  # Color of the line pieces, which also stops them
+KATARENGA_CORNERS = ((0, 0), (0, 9), (9, 0), (9, 9))  # Corner k is target 64 + k
+GONE = 255  # Square of a taken pawn
+
+
+def _on_board(r, c):
+    return 0 <= r < 8 and 0 <= c < 8
+
+
+def _step_table(steps):
+    table = []
+    for square in range(64):
+        r, c = divmod(square, 8)
+        table.append(sum(1 << (r + dr) * 8 + c + dc for dr, dc in steps if _on_board(r + dr, c + dc)))
+    return np.array(table, dtype=np.uint64)
+
+
+def _ray_table(dr, dc):
+    table = []
+    for square in range(64):
+        r, c = divmod(square, 8)
+        mask = 0
+        r, c = r + dr, c + dc
+        while _on_board(r, c):
+            mask |= 1 << r * 8 + c
+            r, c = r + dr, c + dc
+        table.append(mask)
+    return np.array(table, dtype=np.uint64)
+
+
+KING = _step_table(KING_STEPS)
+KNIGHT = _step_table(KNIGHT_STEPS)
+# Squares along each line direction, and whether their indexes grow along it
+RAYS = {direction: (_ray_table(*direction), direction[0] * 8 + direction[1] > 0)
+        for direction in DIAGONALS + LINES}
+
+
+def _corner_step_table(steps):
+    # Katarenga corners one step away from each square (bit k for corner k)
+    table = []
+    for square in range(64):
+        r, c = divmod(square, 8)
+        table.append(sum(1 << k for k, (cr, cc) in enumerate(KATARENGA_CORNERS)
+                         for dr, dc in steps if (r + 1 + dr, c + 1 + dc) == (cr, cc)))
+    return np.array(table, dtype=np.uint8)
+
+
+def _corner_diagonals():
+    # The (at most two) corners a diagonal of each square leads to (bit k for corner k),
+    # and the squares in between
+    corners = np.zeros((2, 64), dtype=np.uint8)
+    paths = np.zeros((2, 64), dtype=np.uint64)
+    for square in range(64):
+        found = 0
+        for dr, dc in DIAGONALS:
+            r, c = divmod(square, 8)
+            path = 0
+            r, c = r + dr, c + dc
+            while _on_board(r, c):
+                path |= 1 << r * 8 + c
+                r, c = r + dr, c + dc
+            if (r + 1, c + 1) in KATARENGA_CORNERS:
+                corners[found, square] = 1 << KATARENGA_CORNERS.index((r + 1, c + 1))
+                paths[found, square] = path
+                found += 1
+    return corners, paths
+
+
+def _by_color(tables, dtype):
+    # (color, square) lookup of the one-step pieces; squares 64 and up (a Katarenga
+    # corner, a taken pawn) and the other colors have no targets
+    table = np.zeros((7, 256), dtype=dtype)
+    for color, squares in tables.items():
+        table[color, :64] = squares
+    return table
+
+
+STEP_TARGETS = _by_color({BLUE: KING, GREEN: KNIGHT}, np.uint64)
+DIAGONAL_CORNERS, DIAGONAL_PATHS = _corner_diagonals()
+# Corners each player must hold (bit k for corner k), and may jump into from its corner row
+GOAL_CORNERS = np.array([sum(1 << KATARENGA_CORNERS.index(corner) for corner in CORNERS[player])
+                         for player in (1, 2)], dtype=np.uint8)
+# (player, color, square) lookup of the corners reached in one step or by the jump
+CORNER_MOVES = np.stack([_by_color({BLUE: _corner_step_table(KING_STEPS), GREEN: _corner_step_table(KNIGHT_STEPS)}, np.uint8)
+                         for _ in (1, 2)])
+for _player in (1, 2):
+    _row = (CORNER_ROWS[_player] - 1) * 8
+    CORNER_MOVES[_player - 1, 1:5, _row:_row + 8] |= GOAL_CORNERS[_player - 1]
+
+
+def slide(squares, blockers, directions):
+    # Targets of line pieces on squares (empty or not), each line ending on its first blocker
+    targets = np.zeros(len(squares), dtype=np.uint64)
+    for direction in directions:
+        table, growing = RAYS[direction]
+        ray = table[squares]
+        hit = ray & blockers
+        if growing:
+            targets |= ray & (hit ^ (hit - ONE))  # Up to the lowest blocker (all of it if none)
+        else:
+            for shift in (1, 2, 4, 8, 16, 32):
+                hit |= hit >> np.uint64(shift)  # Every bit up to the highest blocker
+            targets |= ray & ~(hit >> ONE)
+    return targets
+
+
+def piece_attacks(squares, colors, blockers, tiles):
+    # Targets of pawns on squares with their tile colors; blockers: every pawn of their
+    # games, tiles: the (5, n) tile color masks of their games
+    targets = STEP_TARGETS[colors, squares]
+    for color, directions in SLIDERS:
+        hit = np.flatnonzero(colors == color)
+        targets[hit] = slide(squares[hit], blockers[hit] | tiles[color, hit], directions)
+    return targets
+
+
+def bits_of(masks, width=64):
+    # (n, width) booleans of the low bits of uint64 masks
+    return np.unpackbits(masks.astype("<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")[:, :width]
+
+
+def nth_bit(masks, n):
+    # Index of the n-th (from 0) set bit of each mask, by halving the masks
+    index = np.zeros(len(masks), dtype=np.int64)
+    for width in (32, 16, 8, 4, 2, 1):
+        low = masks & np.uint64((1 << width) - 1)
+        count = np.bitwise_count(low).astype(np.int64)
+        upper = n >= count
+        n = np.where(upper, n - count, n)
+        masks = np.where(upper, masks >> np.uint64(width), low)
+        index += upper * width
+    return index
+
+
+def tile_masks(colors):
+    # (5, games) masks of the squares of each tile color, from (games, 64) colors
+    return np.stack([np.bitwise_or.reduce(np.where(colors == color, SQUARE_BITS, np.uint64(0)), axis=1)
+                     for color in range(5)])
+
+
+class BatchSimulator:
+    # Shared bookkeeping: player to move, winner and plies of every slot, random source,
+    # restart of finished slots. Subclasses hold the positions.
+    game_type = None
+
+    def __init__(self, games, current_player=1, seed=None):
+        self.rng = np.random.default_rng(seed)
+        self.start_player = np.full(games, current_player, dtype=np.int8)
+        self.current_player = self.start_player.copy()
+        self.winner = np.zeros(games, dtype=np.int8)
+        self.plies = np.zeros(games, dtype=np.int32)
+        self.done = np.zeros(games, dtype=bool)
+
+    def __len__(self):
+        return len(self.winner)
+
+    def running(self):
+        return np.flatnonzero(~self.done)
+
+    def reset(self, slots=None):
+        # Back to the starting position (every slot by default)
+        slots = np.arange(len(self)) if slots is None else slots
+        self.current_player[slots] = self.start_player[slots]
+        self.winner[slots] = 0
+        self.plies[slots] = 0
+        self.done[slots] = False
+        self._reset(slots)
+
+    def _reset(self, slots):
+        raise NotImplementedError
+
+    def _end(self, games, winners):
+        self.winner[games] = winners
+        self.current_player[games] = winners  # Like GameState: the winner stays to move
+        self.done[games] = True
+
+    def step(self, policy=None):
+        # Every running game plays one move: a random legal one, or the one policy picks.
+        # policy(simulator, games, mask) gets the running slots and legal_mask(games) and
+        # returns one index of the flattened mask per game. Returns the games still running.
+        games = self.running()
+        if len(games):
+            self._step(games, policy)
+        return int(np.count_nonzero(~self.done))
+
+    def play(self, games, max_plies=300, policy=None):
+        # Plays that many games through the slots, each from its slot's starting position.
+        # Returns (winners, plies) arrays, winner 0 for a game stopped at max_plies.
+        self.reset()
+        started = min(games, len(self))
+        self.done[started:] = True
+        winners, lengths = [np.zeros(0, dtype=np.int8)], [np.zeros(0, dtype=np.int32)]
+        while True:
+            running = self.running()
+            if not len(running):
+                break
+            self._step(running, policy)
+            self.done[running[self.plies[running] >= max_plies]] = True
+            ended = running[self.done[running]]
+            winners.append(self.winner[ended])
+            lengths.append(self.plies[ended])
+            restart = ended[:games - started]
+            if len(restart):
+                self.reset(restart)
+                started += len(restart)
+        return np.concatenate(winners), np.concatenate(lengths)
+
+    def _choose(self, games, policy, counts):
+        # Random move index (among counts[i] legal moves) or the policy's flat mask index
+        if policy is not None:
+            return np.asarray(policy(self, games, self.legal_mask(games)))
+        return (self.rng.random(len(games)) * counts).astype(np.int64)
+
+
+class KatarengaBatch(BatchSimulator):
+    game_type = 1
+
+    def __init__(self, boards, current_player=1, seed=None):
+        boards = np.asarray(boards, dtype=np.int16)
+        if boards.ndim == 2:
+            boards = boards[None]
+        if boards.shape[1:] != (10, 10):
+            raise ValueError("Katarenga boards must be 10x10")
+        games = len(boards)
+        super().__init__(games, current_player, seed)
+        inner = boards[:, 1:9, 1:9].reshape(games, 64)
+        owners = inner % 10
+        corners = np.stack([boards[:, r, c] % 10 for r, c in KATARENGA_CORNERS], axis=1)
+        # Tile color of each square, 0 past the 8x8 area so corner and taken pawns have none
+        self.colors = np.zeros((games, 256), dtype=np.int8)
+        self.colors[:, :64] = inner // 10
+        self.tiles = tile_masks(self.colors[:, :64])
+
+        width = max(1, max(int(((owners == p).sum(1) + (corners == p).sum(1)).max()) for p in (1, 2)))
+        self.start_pawns = np.full((games, 2, width), GONE, dtype=np.uint8)
+        for g in range(games):
+            for p in (1, 2):
+                squares = list(np.flatnonzero(owners[g] == p)) + [64 + k for k in np.flatnonzero(corners[g] == p)]
+                self.start_pawns[g, p - 1, :len(squares)] = squares
+        self.start_occupied = np.stack([np.bitwise_or.reduce(np.where(owners == p, SQUARE_BITS, np.uint64(0)), axis=1)
+                                        for p in (1, 2)], axis=1)
+        self.start_corners = np.stack([((corners == p) << np.arange(4)).sum(1) for p in (1, 2)], axis=1).astype(np.uint8)
+
+        self.start_pawn_colors = np.take_along_axis(self.colors[:, None, :], self.start_pawns.astype(np.intp), axis=2)
+
+        self.pawns = self.start_pawns.copy()  # Square of each pawn (64 + k in corner k)
+        self.pawn_colors = self.start_pawn_colors.copy()  # Tile color under each pawn
+        self.occupied = self.start_occupied.copy()  # Pawns of each player in the 8x8 area
+        self.corners = self.start_corners.copy()  # Corners held by each player (bit k for corner k)
+        self.counts = (self.pawns != GONE).sum(2).astype(np.int16)
+        # targets() of the position, found by _apply to see if the next player is stuck
+        # (those of the starting positions once and for all)
+        self.start_targets, self.start_corner = self.targets(np.arange(games))
+        self.next_targets = self.start_targets.copy()
+        self.next_corner = self.start_corner.copy()
+        self.fresh = np.ones(games, dtype=bool)
+
+    def _reset(self, slots):
+        self.next_targets[slots] = self.start_targets[slots]
+        self.next_corner[slots] = self.start_corner[slots]
+        self.fresh[slots] = True
+        self.pawns[slots] = self.start_pawns[slots]
+        self.pawn_colors[slots] = self.start_pawn_colors[slots]
+        self.occupied[slots] = self.start_occupied[slots]
+        self.corners[slots] = self.start_corners[slots]
+        self.counts[slots] = (self.pawns[slots] != GONE).sum(2)
+
+    def targets(self, games):
+        # Targets of each pawn of the player to move: (n, pawns) masks of the 8x8 area
+        # and (n, pawns) bits of the four corners. Worked out on the flattened pawns.
+        p = (self.current_player[games] - 1).astype(np.intp)
+        own = self.occupied[games, p]
+        occupied = own | self.occupied[games, 1 - p]
+        n, width = len(games), self.pawns.shape[2]
+        squares = self.pawns[games, p].astype(np.intp)
+        lookup = self.pawn_colors[games, p].astype(np.intp) * 256 + squares
+        corner = np.take(CORNER_MOVES, (p[:, None] * (7 * 256) + lookup).ravel())
+        squares, lookup = squares.ravel(), lookup.ravel()
+        targets = np.take(STEP_TARGETS, lookup)
+        colors = lookup >> 8
+
+        for color, directions in SLIDERS:
+            hit = np.flatnonzero(colors == color)
+            on = squares[hit]
+            blockers = (occupied | self.tiles[color, games])[hit // width]
+            targets[hit] = slide(on, blockers, directions)
+            if color == YELLOW:
+                # A diagonal running out of the 8x8 area at a corner goes on into it
+                for k in (0, 1):
+                    corner[hit] |= DIAGONAL_CORNERS[k, on] * ((DIAGONAL_PATHS[k, on] & blockers) == 0)
+        targets = targets.reshape(n, width) & ~own[:, None]
+        corner = corner.reshape(n, width) & ~self.corners[games, p][:, None]
+        return targets, corner
+
+    def _targets(self, games):
+        # targets() of the games, those found after the last move reused
+        stale = games[~self.fresh[games]]
+        if len(stale):
+            self.next_targets[stale], self.next_corner[stale] = self.targets(stale)
+            self.fresh[stale] = True
+        return self.next_targets[games], self.next_corner[games]
+
+    def legal_mask(self, games=None):
+        # (n, pawns, 68) booleans: pawn slot (see self.pawns) and target (square of the
+        # 8x8 area, then the four corners)
+        games = self.running() if games is None else games
+        targets, corner = self._targets(games)
+        n, width = targets.shape
+        inner = bits_of(targets.reshape(-1)).reshape(n, width, 64)
+        corners = np.unpackbits(corner[..., None], axis=2, bitorder="little")[..., :4]
+        return np.concatenate([inner, corners], axis=2).astype(bool)
+
+    def moves(self, game):
+        # Legal moves of one game, as (from_pos, to_pos) on the 10x10 board
+        p = self.current_player[game] - 1
+        mask = self.legal_mask(np.array([game]))[0]
+        moves = []
+        for pawn, target in zip(*np.nonzero(mask)):
+            square = int(self.pawns[game, p, pawn])
+            to_pos = KATARENGA_CORNERS[target - 64] if target >= 64 else (target // 8 + 1, target % 8 + 1)
+            moves.append(((square // 8 + 1, square % 8 + 1), to_pos))
+        return moves
+
+    def _step(self, games, policy):
+        targets, corner = self._targets(games)
+        inner = np.bitwise_count(targets).astype(np.int64)
+        counts = inner + np.bitwise_count(corner)
+        total = counts.sum(1)
+        stuck = total == 0
+        if stuck.any():
+            # Only possible at the start, later _apply has already ended the game
+            self._end(games[stuck], 3 - self.current_player[games[stuck]])
+            keep = ~stuck
+            games, targets, corner, inner, counts, total = \
+                games[keep], targets[keep], corner[keep], inner[keep], counts[keep], total[keep]
+            if not len(games):
+                return
+
+        choice = self._choose(games, policy, total)
+        if policy is not None:
+            pawn, target = np.divmod(choice, 68)
+        else:
+            rows = np.arange(len(games))
+            cumulative = np.cumsum(counts, axis=1)
+            pawn = np.argmax(cumulative > choice[:, None], axis=1)
+            choice -= cumulative[rows, pawn] - counts[rows, pawn]
+            inner = inner[rows, pawn]
+            target = nth_bit(targets[rows, pawn], choice)
+            to_corner = np.flatnonzero(choice >= inner)  # Past the pawn's squares: a corner
+            if len(to_corner):
+                bits = corner[to_corner, pawn[to_corner]].astype(np.uint64)
+                target[to_corner] = 64 + nth_bit(bits, choice[to_corner] - inner[to_corner])
+        self._apply(games, pawn, target)
+
+    def _apply(self, games, pawn, target):
+        p = (self.current_player[games] - 1).astype(np.intp)
+        q = 1 - p
+        enemy = self.occupied[games, q]
+        source = self.pawns[games, p, pawn].astype(np.intp)
+        bit = np.where(target < 64, SQUARE_BITS[target & 63], np.uint64(0))
+        taken = (enemy & bit) != 0
+        self.occupied[games, p] = self.occupied[games, p] & ~SQUARE_BITS[source] | bit
+        self.occupied[games, q] = enemy & ~bit
+        self.pawns[games, p, pawn] = target
+        self.pawn_colors[games, p, pawn] = np.take(self.colors, games * 256 + target)
+        mover = p + 1
+        won = np.zeros(len(games), dtype=bool)
+
+        into = np.flatnonzero(target >= 64)  # Moves into a corner
+        if len(into):
+            g, corner_bit = games[into], (1 << (target[into] & 3)).astype(np.uint8)
+            taken[into] = (self.corners[g, q[into]] & corner_bit) != 0
+            self.corners[g, q[into]] &= ~corner_bit
+            self.corners[g, p[into]] |= corner_bit
+            goal = GOAL_CORNERS[p[into]]
+            won[into] = self.corners[g, p[into]] & goal == goal
+
+        taken = np.flatnonzero(taken)
+        if len(taken):
+            g, lost = games[taken], q[taken]
+            self.counts[g, lost] -= 1
+            hit = self.pawns[g, lost] == target[taken][:, None]
+            self.pawns[g, lost] = np.where(hit, GONE, self.pawns[g, lost])
+            self.pawn_colors[g, lost] = np.where(hit, 0, self.pawn_colors[g, lost])
+            won[taken] |= self.counts[g, lost] == 0
+        self.plies[games] += 1
+        self.current_player[games] = 3 - mover
+        self.fresh[games] = False
+        self._end(games[won], mover[won])
+
+        # Like GameState.apply, the mover also wins if the opponent has no move left.
+        # The targets found are those of the next step.
+        live = np.flatnonzero(~won)
+        if len(live):
+            g = games[live]
+            targets, corner = self.targets(g)
+            self.next_targets[g], self.next_corner[g] = targets, corner
+            self.fresh[g] = True
+            stuck = ~((targets != 0) | (corner != 0)).any(1)
+            self._end(g[stuck], mover[live][stuck])
+
+    def boards(self):
+        # (games, 10, 10) boards in the usual encoding
+        boards = np.zeros((len(self), 10, 10), dtype=np.int16)
+        owners = bits_of(self.occupied[:, 0]).astype(np.int16) + 2 * bits_of(self.occupied[:, 1])
+        boards[:, 1:9, 1:9] = (self.colors[:, :64].astype(np.int16) * 10 + owners).reshape(-1, 8, 8)
+        for k, (r, c) in enumerate(KATARENGA_CORNERS):
+            held = ((self.corners[:, 0] >> k) & 1) + 2 * ((self.corners[:, 1] >> k) & 1)
+            boards[:, r, c] = (50 if r == 0 else 60) + held
+        return boards
+
+
+class IsolationBatch(BatchSimulator):
+    game_type = 3
+
+    def __init__(self, boards, current_player=1, seed=None):
+        boards = np.asarray(boards, dtype=np.int16)
+        if boards.ndim == 2:
+            boards = boards[None]
+        if boards.shape[1:] != (8, 8):
+            raise ValueError("Isolation boards must be 8x8")
+        super().__init__(len(boards), current_player, seed)
+        flat = boards.reshape(len(boards), 64)
+        owners = flat % 10
+        self.colors = (flat // 10).astype(np.int8)
+        self.tiles = tile_masks(self.colors)
+        self.playable = np.bitwise_or.reduce(self.tiles[1:])  # Squares with a tile of the four colors
+
+        rules = get_rules(3)
+        self.start_occupied = np.stack([np.bitwise_or.reduce(np.where(owners == p, SQUARE_BITS, np.uint64(0)), axis=1)
+                                        for p in (1, 2)], axis=1)
+        self.start_attacked = np.array([sum(1 << r * 8 + c for r, c in rules.attacked_squares(board.tolist()))
+                                        for board in boards], dtype=np.uint64)
+        self.occupied = self.start_occupied.copy()  # Pawns of each player
+        self.attacked = self.start_attacked.copy()  # Squares some pawn could move to
+
+    def _reset(self, slots):
+        self.occupied[slots] = self.start_occupied[slots]
+        self.attacked[slots] = self.start_attacked[slots]
+
+    def safe(self, games):
+        # Squares open to a new pawn (the same for both players)
+        return self.playable[games] & ~(self.occupied[games, 0] | self.occupied[games, 1] | self.attacked[games])
+
+    def legal_mask(self, games=None):
+        # (n, 64) booleans: square of the placement
+        games = self.running() if games is None else games
+        return bits_of(self.safe(games)).astype(bool)
+
+    def moves(self, game):
+        return [(None, (int(square) // 8, int(square) % 8)) for square in np.flatnonzero(self.legal_mask(np.array([game]))[0])]
+
+    def _step(self, games, policy):
+        safe = self.safe(games)
+        counts = np.bitwise_count(safe).astype(np.int64)
+        stuck = counts == 0
+        if stuck.any():
+            self._end(games[stuck], 3 - self.current_player[games[stuck]])
+            games, safe, counts = games[~stuck], safe[~stuck], counts[~stuck]
+            if not len(games):
+                return
+
+        choice = self._choose(games, policy, counts)
+        square = choice if policy is not None else nth_bit(safe, choice)
+        p = (self.current_player[games] - 1).astype(np.int64)
+        self.occupied[games, p] |= SQUARE_BITS[square]
+        blockers = self.occupied[games, 0] | self.occupied[games, 1]
+        self.attacked[games] |= piece_attacks(square, self.colors[games, square], blockers, self.tiles[:, games])
+        self.plies[games] += 1
+
+        mover = p + 1
+        won = self.safe(games) == 0
+        self.current_player[games] = 3 - mover
+        self._end(games[won], mover[won])
+
+    def boards(self):
+        # (games, 8, 8) boards in the usual encoding
+        owners = bits_of(self.occupied[:, 0]).astype(np.int16) + 2 * bits_of(self.occupied[:, 1])
+        return (self.colors.astype(np.int16) * 10 + owners).reshape(-1, 8, 8)
+
+
+def batch_simulator(game_type, board, games, current_player=1, seed=None):
+    # Simulator of that many games from one starting position (a setup_board board)
+    boards = np.repeat(np.asarray(board, dtype=np.int16)[None], games, axis=0)
+    if game_type == 1:
+        return KatarengaBatch(boards, current_player, seed)
+    if game_type == 3:
+        return IsolationBatch(boards, current_player, seed)
+    raise ValueError(f"No batched simulator for {GAME_NAMES.get(game_type, game_type)}")
+
+
+def default_board():
+    # The four default squares of the board editor
+    from Board.Board import Board
+    return Board().get_default_tiles()
+
+
+def play_one_by_one(board, game_type, games, max_plies, seed):
+    # The same random games, one GameState at a time (for the speed comparison)
+    rng = random.Random(seed)
+    for _ in range(games):
+        state = GameState(game_type, [row[:] for row in board])
+        for _ in range(max_plies):
+            moves = state.legal_moves()
+            if not moves or state.apply(*rng.choice(moves)):
+                break
+
+
+def main():
+    from Board.FairnessAnalyzer import read_boards, wilson_interval
+
+    parser = argparse.ArgumentParser(description="Play random games in NumPy batches")
+    parser.add_argument("--game", type=int, choices=[1, 3], default=1, help="1=Katarenga, 3=Isolation")
+    parser.add_argument("--board", help="JSON file with an 8x8 board (default: the four default squares)")
+    parser.add_argument("--games", type=int, default=10000, help="games to play")
+    parser.add_argument("--batch", type=int, default=4096, help="games played side by side")
+    parser.add_argument("--max-plies", type=int, default=300, help="plies before a game counts as a draw")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--compare", type=int, default=0, help="also time this many games one GameState at a time")
+    args = parser.parse_args()
+
+    board_8x8 = next(read_boards(args.board)) if args.board else default_board()
+    board = get_rules(args.game).setup_board(board_8x8)
+    simulator = batch_simulator(args.game, board, min(args.batch, args.games), seed=args.seed)
+
+    start = time.perf_counter()
+    winners, plies = simulator.play(args.games, args.max_plies)
+    elapsed = time.perf_counter() - start
+    wins = [int(np.count_nonzero(winners == 1)), int(np.count_nonzero(winners == 2))]
+    low, high = wilson_interval(wins[0], wins[0] + wins[1])
+    rate = len(winners) / elapsed
+    print(f"{GAME_NAMES[args.game]}: {len(winners)} games in {elapsed:.2f}s ({rate:.0f} games/s)")
+    print(f"P1 {wins[0] / max(1, wins[0] + wins[1]) * 100:.1f}% [{low * 100:.1f}, {high * 100:.1f}]  "
+          f"{wins[0]}-{wins[1]}-{len(winners) - wins[0] - wins[1]}  length mean {plies.mean():.1f}")
+
+    if args.compare:
+        start = time.perf_counter()
+        play_one_by_one(board, args.game, args.compare, args.max_plies, args.seed)
+        single = args.compare / (time.perf_counter() - start)
+        print(f"One game at a time: {single:.0f} games/s, batch x{rate / single:.0f}")
+
+
+if __name__ == "__main__":
+    main()
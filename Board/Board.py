@@ -1,5 +1,5 @@
-import json
 import os
+from Board.SquareLibrary import get_square_library
 #in the following list:
     #the number 1 = blue
     #the number 2 = green
@@ -62,28 +62,28 @@ class Board:
         self._corners = [0]*4  # corners list
 
     def save_to_file(self, filename: str):
-        # Save squares to JSON file, merge if file exists
-        data = {}
-        if os.path.exists(filename) and os.path.getsize(filename) > 0:
-            try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-            except json.JSONDecodeError:
-                print(f"File '{filename}' exists but is invalid JSON, overwriting.")
-
-        if "square" not in data:
-            data["square"] = {}
-
-        data["square"].update(self._square_list)
+        # Save every square of the list, each one inserted or updated on its own
+        library = get_square_library(filename)
+        for name, square in self._square_list.items():
+            library.save_square(name, square)
+        print(f"Data saved to '{filename}' without overwriting other squares.")
+
+    def save_square(self, filename: str, name: str, square: list):
+        # Save a single square without touching the rest of the library
+        if not get_square_library(filename).save_square(name, square):
+            return False
+        self.set_square_list(name, square)
+        print(f"Square '{name}' saved.")
+        return True
 
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
-        print(f"Data saved to '{filename}' without overwriting other keys.")
+    def delete_square(self, filename: str, name: str):
+        # Delete a single square from the list and the library
+        self._square_list.pop(name, None)
+        return get_square_library(filename).delete_square(name)
 
     def save_to_file_manager(self, filename: str):
-        # Save only squares, overwrite file
-        with open(filename, 'w') as f:
-            json.dump({"square": self._square_list}, f, indent=4)
+        # Replace the whole library with the current list
+        get_square_library(filename).replace_all(self._square_list)
         print(f"Data saved to '{filename}'.")
 
     def check_or_create_file(self, filename: str):
@@ -100,18 +100,14 @@ class Board:
         return True
 
     def load_from_file(self, filename: str):
-        # Load squares and boards from file
-        if not self.check_or_create_file(filename):
+        # Editable copy of the shared library, the JSON file is imported on first run
+        squares = get_square_library(filename).get_squares()
+        if not squares:
+            print("No squares saved yet, using the default ones.")
             return
 
-        try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
-            self._square_list = {k:v for k,v in data.get("square", {}).items()}
-            self._board_list = {k:v for k,v in data.get("board", {}).items()}
-            print(f"Data loaded from '{filename}'.")
-        except json.JSONDecodeError:
-            print(f"Failed to read '{filename}': invalid JSON.")
+        self._square_list = {name: [list(row) for row in square] for name, square in squares.items()}
+        self._board_list = {}
 
     def create_final_board(self, matrix_8x8):
         # Set final board from 8x8 matrix copy
@@ -139,6 +135,12 @@ class Board:
     def get_default_board(self):
         return self._default_board
 
+    def get_default_tiles(self):
+        # 8x8 tile board of the four default squares, the board most games are played on
+        squares = [self._square_list[f"default {i}"] for i in range(1, 5)]
+        top = [squares[0][i] + squares[1][i] for i in range(4)]
+        return top + [squares[2][i] + squares[3][i] for i in range(4)]
+
     def get_default_square(self):
         return self._default_square
 
@@ -0,0 +1,173 @@
+# Board/BoardEnumerator.py
+# Lazily yields every distinct 8x8 board that can be built from the square library,
+# each quadrant holding one square in any of its rotations/flips.
+#
+# A board is handled as a tuple of 4 oriented-square indexes (top-left, top-right,
+# bottom-left, bottom-right). Boards are generated in lexicographic order and a board
+# is produced only if no symmetry of the chosen group maps it to a smaller tuple, so
+# each class of equivalent boards comes out exactly once, with nothing kept in memory.
+# Partial boards are pruned as soon as a symmetry proves a smaller equivalent exists.
+#
+# Usage: python -m Board.BoardEnumerator [--symmetry dihedral] [--count] [--limit N]
+import argparse
+import json
+import sys
+
+from Board.SquareSymmetry import SQUARE_SIZE, SYMMETRIES, build_symmetries, pack_colors, square_colors
+
+BOARD_SIZE = 2 * SQUARE_SIZE
+
+# Symmetry indexes (see build_symmetries): 0 is the identity, 4 the left-right flip
+SYMMETRY_GROUPS = {
+    "none": (0,),
+    "mirror": (0, 4),
+    "rotation": (0, 1, 2, 3),
+    "dihedral": tuple(range(8)),
+}
+
+
+def _quadrant_origin(position):
+    return (position // 2) * SQUARE_SIZE, (position % 2) * SQUARE_SIZE
+
+
+class BoardEnumerator:
+    def __init__(self, squares, symmetry="dihedral", distinct_squares=False):
+        if symmetry not in SYMMETRY_GROUPS:
+            raise ValueError(f"Unknown symmetry group: {symmetry}")
+
+        self.symmetry = symmetry
+        self.distinct_squares = distinct_squares
+
+        # All distinct oriented squares, as 16 tile values, with the library square they come from
+        self.oriented = []
+        self.origin = []
+        index_by_key = {}
+        base_by_key = {}
+        for square in squares:
+            colors = square_colors(square)
+            images = [tuple(colors[i] for i in perm) for perm in SYMMETRIES]
+            base_key = min(pack_colors(image) for image in images)
+            base = base_by_key.setdefault(base_key, len(base_by_key))
+            for image in images:
+                key = pack_colors(image)
+                if key not in index_by_key:
+                    index_by_key[key] = len(self.oriented)
+                    self.oriented.append(tuple(color * 10 for color in image))
+                    self.origin.append(base)
+
+        # For each board symmetry: source quadrant of every quadrant, and how the
+        # oriented square found there is transformed
+        board_symmetries = build_symmetries(BOARD_SIZE)
+        self.transforms = []
+        for g in SYMMETRY_GROUPS[symmetry][1:]:
+            perm = board_symmetries[g]
+            sources = []
+            tables = []
+            for position in range(4):
+                r0, c0 = _quadrant_origin(position)
+                source_cells = [perm[(r0 + i) * BOARD_SIZE + c0 + j]
+                                for i in range(SQUARE_SIZE) for j in range(SQUARE_SIZE)]
+                sr, sc = divmod(source_cells[0], BOARD_SIZE)
+                source = (sr // SQUARE_SIZE) * 2 + sc // SQUARE_SIZE
+                sr0, sc0 = _quadrant_origin(source)
+                local = [((cell // BOARD_SIZE) - sr0) * SQUARE_SIZE + (cell % BOARD_SIZE) - sc0
+                         for cell in source_cells]
+
+                table = []
+                for values in self.oriented:
+                    image = [values[i] // 10 for i in local]
+                    table.append(index_by_key[pack_colors(image)])
+                sources.append(source)
+                tables.append(table)
+            self.transforms.append((sources, tables))
+
+    def __iter__(self):
+        return (self.to_board(quadrants) for quadrants in self.iter_index_tuples())
+
+    def iter_index_tuples(self):
+        # Canonical quadrant tuples, in lexicographic order
+        count = len(self.oriented)
+        quadrants = [0, 0, 0, 0]
+
+        def search(depth):
+            for index in range(count):
+                if self.distinct_squares and self.origin[index] in (self.origin[q] for q in quadrants[:depth]):
+                    continue
+                quadrants[depth] = index
+                if self._can_be_canonical(quadrants, depth):
+                    if depth == 3:
+                        yield tuple(quadrants)
+                    else:
+                        yield from search(depth + 1)
+
+        return search(0)
+
+    def _can_be_canonical(self, quadrants, depth):
+        # False if some symmetry already maps the partial board (positions 0..depth)
+        # to a smaller one
+        for sources, tables in self.transforms:
+            for position in range(4):
+                source = sources[position]
+                if source > depth:
+                    break  # Not decided yet
+                image = tables[position][quadrants[source]]
+                if image < quadrants[position]:
+                    return False
+                if image > quadrants[position]:
+                    break
+        return True
+
+    def to_board(self, quadrants):
+        # 8x8 board in the format produced by Board.create_final_board
+        board = [[0] * BOARD_SIZE for _ in range(BOARD_SIZE)]
+        for position, index in enumerate(quadrants):
+            r0, c0 = _quadrant_origin(position)
+            values = self.oriented[index]
+            for i in range(SQUARE_SIZE):
+                for j in range(SQUARE_SIZE):
+                    board[r0 + i][c0 + j] = values[i * SQUARE_SIZE + j]
+        return board
+
+    def random_board(self, rng):
+        # Uniformly random board (not reduced by symmetry), for sampling the library
+        count = len(self.oriented)
+        while True:
+            quadrants = [rng.randrange(count) for _ in range(4)]
+            if not self.distinct_squares or len({self.origin[q] for q in quadrants}) == 4:
+                return self.to_board(quadrants)
+
+
+def iter_boards(squares=None, symmetry="dihedral", distinct_squares=False):
+    # Generator of every distinct board buildable from the squares (library by default)
+    if squares is None:
+        from Board.SquareLibrary import get_square_library
+        squares = get_square_library().get_squares().values()
+    elif isinstance(squares, dict):
+        squares = squares.values()
+    return iter(BoardEnumerator(squares, symmetry, distinct_squares))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enumerate the boards buildable from the square library")
+    parser.add_argument("--symmetry", choices=sorted(SYMMETRY_GROUPS), default="dihedral",
+                        help="boards equal up to these symmetries are listed once")
+    parser.add_argument("--distinct", action="store_true", help="use each library square at most once per board")
+    parser.add_argument("--count", action="store_true", help="only print the number of boards")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many boards")
+    args = parser.parse_args()
+
+    count = 0
+    for board in iter_boards(symmetry=args.symmetry, distinct_squares=args.distinct):
+        if not args.count:
+            # One JSON board per line, so the output can be streamed to other tools
+            sys.stdout.write(json.dumps(board) + "\n")
+        count += 1
+        if args.limit is not None and count >= args.limit:
+            break
+
+    if args.count:
+        print(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# Board/FairnessAnalyzer.py
+# Measures how balanced a board is by playing many headless AI-vs-AI games on it.
+# Games are split in batches and played across a process pool; for every board and
+# game the report gives the first player's win rate with a 95% confidence interval,
+# the draw count (games stopped at --max-plies) and the game length distribution.
+#
+# Results are cached in a JSON file keyed by a hash of the board, the game and the
+# run settings, so re-running on a growing list of boards only plays the new ones.
+#
+# Usage: python -m Board.FairnessAnalyzer --board board.json --games 2000
+#        python -m Board.FairnessAnalyzer --library --limit 50 --game 1 (one board per mirror pair)
+#        python -m Board.BoardEnumerator --limit 10 | python -m Board.FairnessAnalyzer --board -
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from Board.BoardEnumerator import SYMMETRY_GROUPS, iter_boards
+from Rules.GameRules import GAME_NAMES, get_rules
+from Rules.GameState import GameState
+
+CACHE_VERSION = 2
+Z_95 = 1.959963984540054
+
+# Board symmetries that keep each game's rules, for --library: a vertical flip or a
+# rotation of a Katarenga board swaps the players' corners and start rows, a mirror of
+# a Congress board swaps the pawn colors, Isolation has no orientation
+GAME_SYMMETRY = {1: "mirror", 2: "rotation", 3: "dihedral"}
+
+
+def setup_board(board_8x8, game_type):
+    # Starting position of the game on the board
+    if len(board_8x8) != 8 or any(len(row) != 8 for row in board_8x8):
+        raise ValueError("Board must be 8x8 matrix.")
+    return get_rules(game_type).setup_board(board_8x8)
+
+
+def board_hash(board_8x8, game_type, settings):
+    # Stable key of a board (tile colors only) for a game and run settings
+    colors = [[value // 10 for value in row] for row in board_8x8]
+    payload = json.dumps([CACHE_VERSION, game_type, colors, settings], separators=(',', ':'))
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def winning_moves(state):
+    # Moves that end the game in favour of the player to move
+    player = state.current_player
+    wins = []
+    for move in state.legal_moves():
+        if state.apply(*move) == player:
+            wins.append(move)
+        state.undo()
+    return wins
+
+
+def choose_move(state, rng):
+    # Takes a win in one when there is one, otherwise plays a random legal move
+    return rng.choice(winning_moves(state) or state.legal_moves())
+
+
+def play_game(start_board, game_type, rng, max_plies):
+    # Returns (winner, plies); winner is 0 when the game reached max_plies
+    state = GameState(game_type, [row[:] for row in start_board])
+
+    for ply in range(max_plies):
+        if not state.legal_moves():
+            # Only possible at the start, later a stuck player has already lost
+            return 3 - state.current_player, ply
+        if state.apply(*choose_move(state, rng)):
+            return state.winner, ply + 1
+
+    return 0, max_plies
+
+
+def play_batch(board, game_type, seed, games, max_plies):
+    # Worker entry point: plays a batch of games and returns the raw counts
+    rng = random.Random(seed)
+    wins = [0, 0]
+    draws = 0
+    lengths = {}
+    for _ in range(games):
+        winner, plies = play_game(board, game_type, rng, max_plies)
+        if winner:
+            wins[winner - 1] += 1
+        else:
+            draws += 1
+        lengths[plies] = lengths.get(plies, 0) + 1
+    return wins, draws, lengths
+
+
+def wilson_interval(successes, trials, z=Z_95):
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def length_percentile(lengths, pct):
+    # Nearest-rank percentile of a {plies: count} histogram
+    total = sum(lengths.values())
+    rank = max(1, math.ceil(pct / 100 * total))
+    seen = 0
+    for plies in sorted(lengths):
+        seen += lengths[plies]
+        if seen >= rank:
+            return plies
+    return 0
+
+
+def summarize(result):
+    wins = result["wins"]
+    decided = wins[0] + wins[1]
+    lengths = {int(k): v for k, v in result["lengths"].items()}
+    games = result["games"]
+    low, high = wilson_interval(wins[0], decided)
+    return {
+        "p1_rate": wins[0] / decided if decided else 0.0,
+        "ci": (low, high),
+        "draws": result["draws"],
+        "mean_length": sum(k * v for k, v in lengths.items()) / games if games else 0.0,
+        "median_length": length_percentile(lengths, 50),
+        "p90_length": length_percentile(lengths, 90),
+        "max_length": max(lengths) if lengths else 0,
+    }
+
+
+class FairnessCache:
+    # Results of earlier runs, one entry per board hash
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.results = {}
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            try:
+                with open(filename, 'r') as f:
+                    data = json.load(f)
+                if data.get("version") == CACHE_VERSION:
+                    self.results = data.get("results", {})
+            except json.JSONDecodeError:
+                print(f"Ignoring invalid cache file '{filename}'.")
+
+    def get(self, key):
+        return self.results.get(key)
+
+    def put(self, key, result):
+        self.results[key] = result
+
+    def save(self):
+        # Write then rename, so an interrupted run never leaves a truncated cache
+        tmp = self.filename + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump({"version": CACHE_VERSION, "results": self.results}, f, separators=(',', ':'))
+        os.replace(tmp, self.filename)
+
+
+def read_boards(source):
+    # A JSON file holding one 8x8 board or a list of boards, or JSON lines ('-' for stdin)
+    f = sys.stdin if source == '-' else open(source, 'r')
+    try:
+        text = f.read()
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        for line in text.splitlines():
+            if line.strip():
+                yield json.loads(line)
+        return
+
+    if data and isinstance(data[0][0], list):
+        yield from data
+    else:
+        yield data
+
+
+def analyze(pairs, args):
+    # pairs: (8x8 board, game type) to analyze
+    cache = FairnessCache(args.cache)
+    settings = {"games": args.games, "max_plies": args.max_plies, "seed": args.seed}
+    batches = max(1, math.ceil(args.games / args.batch_size))
+    analyzed = computed = 0
+    report = []
+
+    def finish(entry):
+        nonlocal computed
+        key, board_8x8, game_type, futures = entry
+        if futures is None:
+            result = cache.get(key)
+        else:
+            wins, draws, lengths = [0, 0], 0, {}
+            for future in futures:
+                batch_wins, batch_draws, batch_lengths = future.result()
+                wins[0] += batch_wins[0]
+                wins[1] += batch_wins[1]
+                draws += batch_draws
+                for plies, count in batch_lengths.items():
+                    lengths[str(plies)] = lengths.get(str(plies), 0) + count
+            result = {"game_type": game_type, "board": board_8x8, "games": args.games,
+                      "wins": wins, "draws": draws, "lengths": lengths}
+            cache.put(key, result)
+            computed += 1
+            if computed % 10 == 0:
+                cache.save()
+        print_result(key, result, cached=futures is None)
+        report.append((key, result))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pending = deque()
+        for board_8x8, game_type in pairs:
+            key = board_hash(board_8x8, game_type, settings)
+            if cache.get(key) is not None:
+                pending.append((key, board_8x8, game_type, None))
+            else:
+                board = setup_board(board_8x8, game_type)
+                futures = []
+                for i in range(batches):
+                    games = min(args.batch_size, args.games - i * args.batch_size)
+                    # Seeded from the board, so results don't depend on the run order
+                    seed = f"{args.seed}:{key}:{i}"
+                    futures.append(pool.submit(play_batch, board, game_type, seed, games, args.max_plies))
+                pending.append((key, [row[:] for row in board_8x8], game_type, futures))
+            analyzed += 1
+
+            # Keep a bounded number of boards in flight for long board streams
+            while len(pending) > args.workers * 2:
+                finish(pending.popleft())
+
+        while pending:
+            finish(pending.popleft())
+
+    cache.save()
+    return report, analyzed, computed
+
+
+def print_result(key, result, cached=False):
+    stats = summarize(result)
+    low, high = stats["ci"]
+    wins = result["wins"]
+    print(f"{key[:12]} {GAME_NAMES[result['game_type']]:<10} "
+          f"P1 {stats['p1_rate'] * 100:5.1f}% [{low * 100:5.1f}, {high * 100:5.1f}]  "
+          f"{wins[0]}-{wins[1]}-{result['draws']}  "
+          f"length mean {stats['mean_length']:.1f} median {stats['median_length']} "
+          f"p90 {stats['p90_length']} max {stats['max_length']}"
+          f"{'  (cached)' if cached else ''}")
+
+
+def print_summary(report, analyzed, computed, elapsed, top):
+    print()
+    print(f"{analyzed} board/game pairs, {computed} computed, {analyzed - computed} from cache, {elapsed:.1f}s")
+
+    # Boards whose interval excludes 50%, the most unbalanced first
+    unbalanced = []
+    for key, result in report:
+        stats = summarize(result)
+        low, high = stats["ci"]
+        if low > 0.5 or high < 0.5:
+            unbalanced.append((abs(stats["p1_rate"] - 0.5), key, result))
+    unbalanced.sort(key=lambda item: item[0], reverse=True)
+
+    print(f"Boards significantly favouring one player: {len(unbalanced)}")
+    for _, key, result in unbalanced[:top]:
+        print_result(key, result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure board fairness with headless self-play")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--board", help="JSON file with an 8x8 board, a list of boards or JSON lines ('-' for stdin)")
+    source.add_argument("--library", action="store_true", help="every board buildable from the square library")
+    parser.add_argument("--symmetry", choices=["game"] + sorted(SYMMETRY_GROUPS), default="game",
+                        help="with --library, symmetry group of the enumeration "
+                             "(game: the symmetries that keep the rules of each game)")
+    parser.add_argument("--distinct", action="store_true", help="with --library, each square at most once per board")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many boards")
+    parser.add_argument("--game", type=int, nargs='+', choices=[1, 2, 3], default=[1, 2, 3],
+                        help="1=Katarenga, 2=Congress, 3=Isolation")
+    parser.add_argument("--games", type=int, default=1000, help="games per board and game")
+    parser.add_argument("--max-plies", type=int, default=300, help="plies before a game counts as a draw")
+    parser.add_argument("--batch-size", type=int, default=100, help="games per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("--cache", default="fairness_cache.json", help="results cache file")
+    parser.add_argument("--top", type=int, default=10, help="unbalanced boards listed in the summary")
+    args = parser.parse_args()
+
+    def limited(boards):
+        return boards if args.limit is None else (board for _, board in zip(range(args.limit), boards))
+
+    if args.library:
+        # One enumeration per game, each reduced by the symmetries of that game
+        def library_pairs():
+            for game_type in args.game:
+                symmetry = GAME_SYMMETRY[game_type] if args.symmetry == "game" else args.symmetry
+                for board in limited(iter_boards(symmetry=symmetry, distinct_squares=args.distinct)):
+                    yield board, game_type
+        pairs = library_pairs()
+    else:
+        pairs = ((board, game_type) for board in limited(read_boards(args.board)) for game_type in args.game)
+
+    start = time.perf_counter()
+    report, analyzed, computed = analyze(pairs, args)
+    print_summary(report, analyzed, computed, time.perf_counter() - start, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import os
+from types import MappingProxyType
+from Board.SquareStore import get_square_store
+from Board.SquareSymmetry import canonical_square_key
+
+# Process-wide square library.
+# The library is read from storage once and kept parsed in memory; each access only
+# compares the file's mtime and size with the ones seen at load time, and reloads if
+# another process changed it. Screens get read-only views (squares are tuples of tuples).
+# Squares are also indexed by their canonical symmetry key, so a rotated or flipped copy
+# of a known square is found in O(1) and refused on save.
+
+_libraries = {}  # One library per file
+
+
+def get_square_library(filename: str = "game_data.json"):
+    library = _libraries.get(filename)
+    if library is None:
+        library = SquareLibrary(filename)
+        _libraries[filename] = library
+    return library
+
+
+def freeze_square(square):
+    return tuple(tuple(row) for row in square)
+
+
+class SquareLibrary:
+    def __init__(self, filename: str):
+        self.store = get_square_store(filename)
+        self._squares = {}
+        self._view = MappingProxyType(self._squares)  # Stays valid across reloads
+        self._by_key = {}  # canonical key -> names (older libraries may hold duplicates)
+        self._signature = None
+
+    def _index(self, name, square):
+        self._by_key.setdefault(canonical_square_key(square), []).append(name)
+
+    def _unindex(self, name, square):
+        key = canonical_square_key(square)
+        names = self._by_key.get(key, [])
+        if name in names:
+            names.remove(name)
+        if not names:
+            self._by_key.pop(key, None)
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.store.db_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _revalidate(self):
+        signature = self._file_signature()
+        if signature is not None and signature == self._signature:
+            return
+
+        # First access, or the file was changed by someone else
+        squares = self.store.get_squares()
+        self._squares.clear()
+        self._by_key.clear()
+        for name, square in squares.items():
+            self._squares[name] = freeze_square(square)
+            self._index(name, square)
+        self._signature = signature
+
+    def get_squares(self):
+        # Read-only mapping name -> square, in library order
+        self._revalidate()
+        return self._view
+
+    def get_square(self, name: str):
+        self._revalidate()
+        return self._squares.get(name)
+
+    def has_square(self, name: str):
+        self._revalidate()
+        return name in self._squares
+
+    def find_equivalent(self, square):
+        # Name of a known square equal to this one up to rotation/flip, or None
+        self._revalidate()
+        names = self._by_key.get(canonical_square_key(square))
+        return names[0] if names else None
+
+    def is_known(self, square):
+        return self.find_equivalent(square) is not None
+
+    def save_square(self, name: str, square):
+        # Returns False if the square duplicates another one of the library
+        self._revalidate()
+        for other in self._by_key.get(canonical_square_key(square), []):
+            if other != name:
+                print(f"Square '{name}' is a rotation or flip of '{other}', not saved.")
+                return False
+
+        self.store.insert_square(name, [list(row) for row in square])
+        # Our own write: update the parsed copy instead of reloading everything
+        if name in self._squares:
+            self._unindex(name, self._squares[name])
+        self._squares[name] = freeze_square(square)
+        self._index(name, square)
+        self._signature = self._file_signature()
+        return True
+
+    def delete_square(self, name: str):
+        self._revalidate()
+        deleted = self.store.delete_square(name)
+        square = self._squares.pop(name, None)
+        if square is not None:
+            self._unindex(name, square)
+        self._signature = self._file_signature()
+        return deleted
+
+    def replace_all(self, squares: dict):
+        self.store.replace_all({name: [list(row) for row in square] for name, square in squares.items()})
+        self._squares.clear()
+        self._by_key.clear()
+        for name, square in squares.items():
+            self._squares[name] = freeze_square(square)
+            self._index(name, square)
+        self._signature = self._file_signature()
@@ -0,0 +1,110 @@
+import json
+import os
+import sqlite3
+
+# Square library storage backed by SQLite.
+# Every insert or delete is its own transaction: a crash during a write leaves the
+# previous library intact, and saving one square no longer rewrites all the others.
+# The legacy JSON file is imported the first time the database is opened.
+
+_stores = {}  # One open store per database path
+
+
+def get_square_store(filename: str):
+    # Accepts the legacy JSON file name ("game_data.json") or the database path
+    db_path = os.path.splitext(filename)[0] + ".db"
+    store = _stores.get(db_path)
+    if store is None:
+        json_path = filename if filename.endswith(".json") else os.path.splitext(filename)[0] + ".json"
+        store = SquareStore(db_path, json_path)
+        _stores[db_path] = store
+    return store
+
+
+class SquareStore:
+    def __init__(self, db_path: str, legacy_json_path: str = None):
+        self.db_path = db_path
+        # Shared by the UI and the network threads, writes are serialised by SQLite
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS square ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " name TEXT NOT NULL UNIQUE,"
+                " cells TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+        if legacy_json_path and not self.get_meta("json_imported"):
+            self.import_json(legacy_json_path)
+
+    def get_meta(self, key: str):
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def import_json(self, filename: str):
+        # One-time import of the squares saved by older versions
+        squares = {}
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            try:
+                with open(filename, 'r') as f:
+                    squares = json.load(f).get("square", {})
+            except json.JSONDecodeError:
+                print(f"Failed to import '{filename}': invalid JSON.")
+                return
+
+        with self.connection:
+            for name, square in squares.items():
+                self.connection.execute(
+                    "INSERT OR IGNORE INTO square (name, cells) VALUES (?, ?)",
+                    (name, self._encode(square))
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                (filename,)
+            )
+        if squares:
+            print(f"Imported {len(squares)} squares from '{filename}'.")
+
+    def _encode(self, square):
+        return json.dumps(square, separators=(',', ':'))
+
+    def insert_square(self, name: str, square: list):
+        # Insert or update one square, keeping its position in the library
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO square (name, cells) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET cells = excluded.cells",
+                (name, self._encode(square))
+            )
+
+    def delete_square(self, name: str):
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM square WHERE name = ?", (name,))
+        return cursor.rowcount > 0
+
+    def get_square(self, name: str):
+        row = self.connection.execute("SELECT cells FROM square WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_squares(self):
+        # All squares in insertion order
+        rows = self.connection.execute("SELECT name, cells FROM square ORDER BY id").fetchall()
+        return {name: json.loads(cells) for name, cells in rows}
+
+    def replace_all(self, squares: dict):
+        # Atomically replace the whole library
+        with self.connection:
+            self.connection.execute("DELETE FROM square")
+            for name, square in squares.items():
+                self.connection.execute(
+                    "INSERT INTO square (name, cells) VALUES (?, ?)",
+                    (name, self._encode(square))
+                )
+
+    def close(self):
+        self.connection.close()
+        _stores.pop(self.db_path, None)
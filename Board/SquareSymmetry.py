@@ -0,0 +1,69 @@
+# Canonical form of 4x4 squares under the 8 rotations and reflections.
+# A square is reduced to its colors (value // 10), packed 3 bits per cell into an int
+# for each of the 8 symmetries; the smallest of the 8 ints is the canonical key.
+# Two squares have the same key exactly when one is a rotation/flip of the other.
+
+SQUARE_SIZE = 4
+
+
+def build_symmetries(n):
+    # The 8 symmetries of an n x n grid, identity first and the left-right flip at index 4.
+    # Each symmetry is a tuple giving, for every cell of the result, the source cell index
+    cells = [(r, c) for r in range(n) for c in range(n)]
+
+    def rotate_right(r, c):
+        # Cell (r, c) of the result comes from cell (n-1-c, r) of the source
+        return n - 1 - c, r
+
+    def flip_horizontal(r, c):
+        return r, n - 1 - c
+
+    symmetries = []
+    for flip in (False, True):
+        for turns in range(4):
+            perm = []
+            for r, c in cells:
+                sr, sc = r, c
+                for _ in range(turns):
+                    sr, sc = rotate_right(sr, sc)
+                if flip:
+                    sr, sc = flip_horizontal(sr, sc)
+                perm.append(sr * n + sc)
+            symmetries.append(tuple(perm))
+    return tuple(symmetries)
+
+
+SYMMETRIES = build_symmetries(SQUARE_SIZE)
+
+
+def square_colors(square):
+    # Flat tuple of the 16 tile colors, pawns ignored
+    return tuple(value // 10 for row in square for value in row)
+
+
+def pack_colors(colors):
+    key = 0
+    for color in colors:
+        key = (key << 3) | color
+    return key
+
+
+def symmetric_keys(square):
+    # Packed colors of the 8 images of the square
+    colors = square_colors(square)
+    return [pack_colors(colors[i] for i in perm) for perm in SYMMETRIES]
+
+
+def canonical_square_key(square):
+    return min(symmetric_keys(square))
+
+
+def canonical_square(square):
+    # Canonical representative as a 4x4 list of tile values
+    key = canonical_square_key(square)
+    cells = []
+    for _ in range(SQUARE_SIZE * SQUARE_SIZE):
+        cells.append((key & 7) * 10)
+        key >>= 3
+    cells.reverse()
+    return [cells[r * SQUARE_SIZE:(r + 1) * SQUARE_SIZE] for r in range(SQUARE_SIZE)]
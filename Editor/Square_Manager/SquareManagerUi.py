@@ -1,5 +1,6 @@
 import pygame
 from Board.Board import Board
+from Board.SquareLibrary import get_square_library
 from Board.Board_draw_tools import Board_draw_tools
 from UI_tools.BaseUi import BaseUI
 
@@ -9,8 +10,8 @@ class SquareManagerUi(BaseUI):
 
         self.board_obj = Board()
         self.board_ui = Board_draw_tools()
-        self.board_obj.load_from_file("game_data.json")  # Load squares data from file
-        self.square_list = self.board_obj.get_square_list()
+        self.library = get_square_library()  # Shared square library, parsed once per process
+        self.square_list = self.library.get_squares()
 
         self.screen_w = self.get_width()
         self.screen_h = self.get_height()
@@ -120,15 +121,9 @@ class SquareManagerUi(BaseUI):
             self.square_attached_to_mouse = False
             
     def delete_square(self):
-        # Remove selected square from both local and board's list, save changes, update buttons
+        # Remove selected square from the library (the list view follows), update buttons
         if self.selected_square_name in self.square_list:
-            del self.square_list[self.selected_square_name]
-
-            square_list_obj = self.board_obj.get_square_list()
-            if self.selected_square_name in square_list_obj:
-                del square_list_obj[self.selected_square_name]
-
-            self.board_obj.save_to_file_manager("game_data.json")
+            self.library.delete_square(self.selected_square_name)
 
             self.square_buttons = self.create_square_buttons()
 
@@ -2,6 +2,7 @@ import pygame
 import sys
 
 from Board.Board import Board
+from Board.SquareLibrary import get_square_library
 from Board.Board_draw_tools import Board_draw_tools
 from UI_tools.BaseUi import BaseUI
 
@@ -93,11 +94,9 @@ class SquareEditorUi(BaseUI):
 
             if all(count >= 4 for count in color_counts.values()):
                 print("Save pressed")
-                self.board_obj.set_square_list(self.text_input, self.square)
-                filename = "game_data.json"
-                self.board_obj.check_or_create_file(filename)
-                self.board_obj.save_to_file(filename)
-                self.running = False
+                # Refused if the pattern is a rotation or flip of a saved square
+                if get_square_library().save_square(self.text_input, self.square):
+                    self.running = False
             else:
                 return
 
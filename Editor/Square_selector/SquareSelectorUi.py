@@ -1,6 +1,7 @@
 import pygame
 
 from Board.Board import Board
+from Board.SquareLibrary import get_square_library
 from Board.Board_draw_tools import Board_draw_tools
 from UI_tools.BaseUi import BaseUI
 from Game_ui.Katarenga import Katarenga
@@ -55,9 +56,8 @@ class SquareSelectorUi(BaseUI):
         self.back_button_rect = pygame.Rect(20, 20, 120, 40)
         self.start_button_rect = pygame.Rect(self.get_width() // 2 - 100, self.get_height() - 70, 200, 50)
 
-        # Load predefined squares from file
-        self.board_obj.load_from_file("game_data.json")
-        self.square_list = self.board_obj.get_square_list()
+        # Squares from the shared library (parsed once per process), defaults if it is empty
+        self.square_list = get_square_library().get_squares() or self.board_obj.get_square_list()
         self.square_buttons = self.create_square_buttons()
 
         self.selected_square = None
@@ -1,11 +1,15 @@
 import pygame 
 import copy
-from collections import deque
 
 from UI_tools.BaseUi import BaseUI
 from Board.Board_draw_tools import Board_draw_tools
-from Game_ui.move_rules import Moves_rules
+from Rules.GameRules import get_rules
 from UI_tools.win_screen import WinScreen
+from AI.EngineProcess import EnginePlayer
+from UI_tools.MoveHints import MoveHints, draw_hint
+from Rules.GameRecord import GameRecorder
+from Rules.GameRules import clear_pawns
+from Rules.SaveGame import clear_saved_game, save_game
 
 class Congress(BaseUI):
     def __init__(self, ai, board, title="Congress"):
@@ -32,44 +36,39 @@ class Congress(BaseUI):
         # Back button rectangle for navigation
         self.back_button_rect = pygame.Rect(20, 20, 120, 40)
 
+        # Move rules and victory check
+        self.rules = get_rules(2)
+
         # Initialize the game board with pawns placed according to Congress rules
         self.board = self.place_pawn_congress(self.base_board)
+        self.connectivity = self.rules.tracker(self.board)  # Groups of pawns, for the victory check
+        self.board_version = 0  # Moves played, for the move hints cache
+        self.hints = MoveHints(self.rules)  # Destinations of the selected pawn
+        self.show_hints = True
 
-        # Tools for board drawing and move validation
+        # Tool for board drawing
         self.board_ui = Board_draw_tools()
-        self.moves_rules = Moves_rules(self.board)
 
         # Game state variables
         self.current_player = 1
         self.selected_pawn = None
         self.info_font = pygame.font.SysFont(None, 36)
 
-        self.__ai = ai  # AI player flag or instance
+        self.__ai = ai  # AI player flag, or the name of its engine
+        self.ai_player = None  # Engine process, started with the game
+        self.recorder = None  # Game record, written while the game runs
+        self.start_board = [row[:] for row in self.board]
+        self.moves = []  # Moves played, kept for the quick-save
+        self.game_over = False
+        self.resumed = False  # Continues the quick-saved game
         
         # Flags for victory handling
         self.network_mode = False
         self.victory_callback = None  # Callback for network mode
 
     def place_pawn_congress(self, base_board):
-        new_board = copy.deepcopy(base_board)
-        for i in range(self.grid_dim):
-            for j in range(self.grid_dim):
-                color_code = new_board[i][j] // 10
-                new_board[i][j] = color_code * 10  # Clear pawns, keep base color
-
-        # Direct placement of pawns
-        black_pawns = [(0, 1), (0, 4), (1, 7), (3, 0), (4, 7), (6, 0), (7, 3), (7, 6)]
-        white_pawns = [(0, 3), (0, 6), (1, 0), (3, 7), (4, 0), (6, 7), (7, 1), (7, 4)]
-
-        for r, c in black_pawns:
-            color = new_board[r][c] // 10
-            new_board[r][c] = color * 10 + 2
-
-        for r, c in white_pawns:
-            color = new_board[r][c] // 10
-            new_board[r][c] = color * 10 + 1
-
-        return new_board
+        # Clear pawns, keep base colors, then place both sides
+        return self.rules.setup_board(base_board)
 
     def set_network_mode(self, network_mode=True, victory_callback=None):
         self.network_mode = network_mode
@@ -77,6 +76,10 @@ class Congress(BaseUI):
 
     def run(self):
         # Main game loop: handles events, draws UI, updates display, and runs AI if active.
+        if self.__ai:
+            self.ai_player = EnginePlayer(self.__ai if isinstance(self.__ai, str) else None)
+        self.recorder = GameRecorder.start(2, self.board, self.current_player)
+
         while self.running:
             self.handle_events()
             self.draw()
@@ -84,9 +87,34 @@ class Congress(BaseUI):
             self.clock.tick(60)
 
             # If AI is active and it is AI's turn (player 2)
-            if self.__ai and self.current_player == 2:
+            if self.__ai and self.current_player == 2 and self.running:
                 self.congress_ai()
 
+        if self.ai_player:
+            self.ai_player.close()
+        if self.recorder:
+            self.recorder.close()
+        self.save_progress()
+
+    def resume(self, save):
+        # Continue a quick-saved game (see Rules/SaveGame.py)
+        self.board = save["board"]
+        self.base_board = clear_pawns(self.board)
+        self.start_board = save["start_board"]
+        self.moves = list(save["moves"])
+        self.current_player = save["current_player"]
+        self.connectivity = self.rules.tracker(self.board)
+        self.board_version = len(self.moves)
+        self.resumed = True
+
+    def save_progress(self):
+        # A game left before its end is quick-saved; the resumed one is cleared once over
+        if self.game_over:
+            if self.resumed:
+                clear_saved_game()
+        elif self.moves and save_game(2, self.start_board, self.board, self.current_player, self.moves, self.__ai):
+            print("Game saved, resume it from the main menu")
+
     def handle_events(self):
         # Event handler for quitting, back button, and board clicks.
         for event in pygame.event.get():
@@ -100,6 +128,9 @@ class Congress(BaseUI):
 
     def handle_board_click(self, pos):
         # Handles clicks inside the board grid, converting pixel to grid coordinates.
+        if self.__ai and self.current_player == 2:
+            return  # The AI is thinking
+
         x, y = pos
         if (self.left_offset <= x < self.left_offset + self.grid_size and
             self.top_offset <= y < self.top_offset + self.grid_size):
@@ -129,7 +160,7 @@ class Congress(BaseUI):
                 print(f"New pawn selected at ({row}, {col})")
             else:
                 # Attempt move to empty square
-                if self.board[row][col] % 10 == 0 and self.is_valid_move(sel_r, sel_c, row, col):
+                if self.is_valid_move(sel_r, sel_c, row, col):
                     self.make_move(sel_r, sel_c, row, col)
                     self.selected_pawn = None
                     
@@ -142,6 +173,19 @@ class Congress(BaseUI):
                 else:
                     print("Invalid move or square occupied")
 
+    def congress_ai(self):
+        # The AI (player 2) plays the engine's move once it is found
+        move = self.ai_player.get_move(self.board, 2, 2)
+        if move is None:
+            return  # Still thinking
+
+        (fr, fc), (tr, tc) = move
+        self.make_move(fr, fc, tr, tc)
+        self.check_and_handle_victory()
+        if self.running:
+            self.switch_player()
+            self.ai_player.ponder(self.board, 2, 1)
+
     def check_and_handle_victory(self):
         winner = self.check_all_players_victory()
         if winner:
@@ -157,16 +201,18 @@ class Congress(BaseUI):
                 self.trigger_victory_local(winner)
 
     def is_valid_move(self, fr, fc, tr, tc):
-        # Checks if move is valid by delegating to move rules verifier.
-        case_color = self.board[fr][fc]
-        return self.moves_rules.verify_move(case_color, fr, fc, tr, tc)
+        # Checks if move is valid (pawn move to an empty square) with the shared rules.
+        return self.rules.is_legal(self.board, self.current_player, (fr, fc), (tr, tc))
 
     def make_move(self, fr, fc, tr, tc):
         # Executes move on board: clears origin cell, places pawn on target cell.
-        dest_color = self.base_board[tr][tc] // 10
-        orig_color = self.base_board[fr][fc] // 10
-        self.board[fr][fc] = orig_color * 10  # Clear origin cell
-        self.board[tr][tc] = dest_color * 10 + self.current_player  # Place pawn at destination
+        record = self.rules.apply_move(self.board, self.current_player, (fr, fc), (tr, tc))
+        for row, col, old in record:
+            self.connectivity.change(row, col, old, self.board[row][col])
+        self.board_version += 1
+        self.moves.append(((fr, fc), (tr, tc)))
+        if self.recorder:
+            self.recorder.add_move((fr, fc), (tr, tc), self.board)
         print(f"Moved from ({fr}, {fc}) to ({tr}, {tc})")
 
     def switch_player(self):
@@ -175,32 +221,17 @@ class Congress(BaseUI):
         print(f"Player {self.current_player}'s turn")
 
     def check_victory(self, player):
-        positions = [(i, j) for i in range(self.grid_dim) for j in range(self.grid_dim)
-                     if self.board[i][j] % 10 == player]
-        if not positions:
-            return False
-        visited = set([positions[0]])
-        queue = deque([positions[0]])
-        while queue:
-            x, y = queue.popleft()
-            for dx, dy in [(-1,0), (1,0), (0,-1), (0,1)]:
-                nx, ny = x + dx, y + dy
-                if (0 <= nx < self.grid_dim and 0 <= ny < self.grid_dim and
-                    (nx, ny) not in visited and self.board[nx][ny] % 10 == player):
-                    visited.add((nx, ny))
-                    queue.append((nx, ny))
         # Victory if all player's pawns are connected
-        return len(visited) == len(positions)
+        return self.connectivity.is_connected(player)
 
     def check_all_players_victory(self):
-        for player in [1, 2]:
-            if self.check_victory(player):
-                return player
-        return None
+        # Called after the current player's move; a player left without moves loses
+        return self.rules.winner(self.board, self.current_player, self.connectivity)
 
     def trigger_victory_local(self, winner):
         # print(f"Local victory triggered: Player {winner} wins!")
         self.running = False
+        self.game_over = True
         
         try:
             # Display the win screen with the appropriate name
@@ -214,6 +245,31 @@ class Congress(BaseUI):
         except Exception as e:
             print(f"Error showing win screen: {e}")
 
+    def cell_rect(self, row, col):
+        return pygame.Rect(col * self.cell_size + self.left_offset, row * self.cell_size + self.top_offset,
+                           self.cell_size, self.cell_size)
+
+    def draw_cell(self, screen, row, col, hints=()):
+        # One square: tile, selection, move hint and pawn (also used by the replay)
+        rect = self.cell_rect(row, col)
+        color = self.board_ui.get_color_from_board(self.base_board[row][col] // 10)
+        pygame.draw.rect(screen, color, rect)
+        pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+
+        # Highlight selected pawn and its legal destinations
+        if self.selected_pawn == (row, col):
+            pygame.draw.rect(screen, (255, 255, 0), rect, 4)
+        if (row, col) in hints:
+            draw_hint(screen, rect)
+
+        player_code = self.board[row][col] % 10
+        if player_code:
+            color = (255, 255, 255) if player_code == 1 else (0, 0, 0)
+            outline = (0, 0, 0) if player_code == 1 else (255, 255, 255)
+            pygame.draw.circle(screen, color, rect.center, self.cell_size // 3)
+            pygame.draw.circle(screen, outline, rect.center, self.cell_size // 3, 2)
+        return rect
+
     def draw(self):
         # Draw the full game screen: background, board grid, pawns, UI elements.
         screen = self.get_screen()
@@ -225,18 +281,20 @@ class Congress(BaseUI):
         screen.blit(self.title_surface, self.title_rect)
 
         # Draw the board cells and pawns
+        hints = ()
+        if self.show_hints:
+            hints = self.hints.get(self.board, self.current_player, self.selected_pawn, self.board_version)
         for row in range(self.grid_dim):
             for col in range(self.grid_dim):
-                rect = pygame.Rect(
-                    col * self.cell_size + self.left_offset,
-                    row * self.cell_size + self.top_offset,
-                    self.cell_size,
-                    self.cell_size
-                )
-                base_val = self.base_board[row][col]
-                color_code = base_val // 10
-                color = self.board_ui.get_color_from_board(color_code)
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, (255, 255, 255), rect, 1)
-
-                # Highlight selected...
+                self.draw_cell(screen, row, col, hints)
+
+        # Draw back button
+        pygame.draw.rect(screen, (70, 70, 70), self.back_button_rect)
+        pygame.draw.rect(screen, (255, 255, 255), self.back_button_rect, 2)
+        back_text = pygame.font.SysFont(None, 36).render("Back", True, (255, 255, 255))
+        screen.blit(back_text, back_text.get_rect(center=self.back_button_rect.center))
+
+        # Player to move
+        text = self.info_font.render(f"Player {self.current_player}'s turn", True, (255, 255, 255))
+        screen.blit(text, (self.left_offset, self.top_offset + self.grid_size + 20))
+
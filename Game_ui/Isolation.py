@@ -1,17 +1,19 @@
 
 import pygame
-import random
-import time
 from UI_tools.BaseUi import BaseUI
 from Board.Board_draw_tools import Board_draw_tools
-from Game_ui.move_rules import Moves_rules
+from Rules.GameRules import get_rules
 from UI_tools.win_screen import WinScreen
+from AI.EngineProcess import EnginePlayer
+from UI_tools.MoveHints import MoveHints, draw_hint
+from Rules.GameRecord import GameRecorder
+from Rules.SaveGame import clear_saved_game, save_game
 
 class Isolation(BaseUI):
     def __init__(self, ai, board, title="Isolation"):
         super().__init__(title)
-        self.board = board
-        self.rules = Moves_rules(board)
+        self.rules = get_rules(3)  # placement rules and victory
+        self.board = self.rules.setup_board(board)
         self.board_ui = Board_draw_tools()
 
         self.cell_size = 60
@@ -29,23 +31,58 @@ class Isolation(BaseUI):
 
         self.current_player = 1
         self.total_moves = 0
-        self.max_moves = self.grid_dim * self.grid_dim
-
-        self.__AI = ai  # AI opponent enabled if True
+        self.board_version = 0  # Placements made, for the move hints cache
+        self.hints = MoveHints(self.rules)  # Safe squares of the position
+        self.show_hints = True
+
+        self.__AI = ai  # AI opponent enabled if True, or the name of its engine
+        self.ai_player = None  # Engine process, started with the game
+        self.recorder = None  # Game record, written while the game runs
+        self.start_board = [row[:] for row in self.board]
+        self.moves = []  # Placements made, kept for the quick-save
+        self.game_over = False
+        self.resumed = False  # Continues the quick-saved game
 
     def run(self):
         self.running = True
+        if self.__AI:
+            self.ai_player = EnginePlayer(self.__AI if isinstance(self.__AI, str) else None)
+        self.recorder = GameRecorder.start(3, self.board, self.current_player)
+
         while self.running:
             self.handle_events()
             self.draw()
             pygame.display.flip()
             self.clock.tick(60)
 
-            # If AI is player 2, make AI move after a short delay
+            # If AI is player 2, play its move once the engine has found it
             if self.__AI and self.current_player == 2 and self.running:
-                time.sleep(2)
                 self.play_ai_move()
 
+        if self.ai_player:
+            self.ai_player.close()
+        if self.recorder:
+            self.recorder.close()
+        self.save_progress()
+
+    def resume(self, save):
+        # Continue a quick-saved game (see Rules/SaveGame.py)
+        self.board = save["board"]
+        self.start_board = save["start_board"]
+        self.moves = list(save["moves"])
+        self.current_player = save["current_player"]
+        self.total_moves = len(self.moves)
+        self.board_version = len(self.moves)
+        self.resumed = True
+
+    def save_progress(self):
+        # A game left before its end is quick-saved; the resumed one is cleared once over
+        if self.game_over:
+            if self.resumed:
+                clear_saved_game()
+        elif self.moves and save_game(3, self.start_board, self.board, self.current_player, self.moves, self.__AI):
+            print("Game saved, resume it from the main menu")
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
@@ -66,39 +103,58 @@ class Isolation(BaseUI):
 
         # Check if click is inside the grid
         if 0 <= row < self.grid_dim and 0 <= col < self.grid_dim:
-            case = self.board[row][col]
             # Check if the cell is free and not under threat
-            if case % 10 == 0 and not self.in_prise(row, col):
-                color = case // 10
-                self.board[row][col] = color * 10 + self.current_player
-                self.total_moves += 1
-                # Check for game end conditions
-                if self.total_moves >= self.max_moves or not self.can_play():
+            if self.rules.is_legal(self.board, self.current_player, None, (row, col)):
+                self.place_pawn(self.current_player, row, col)
+                # The player wins if no safe square is left for the opponent
+                if not self.can_play():
                     print(f"Player {self.current_player} wins!")
                     WinScreen(f"Player {self.current_player}")
                     self.running = False
+                    self.game_over = True
                 else:
                     # Switch player
                     self.current_player = 2 if self.current_player == 1 else 1
 
+    def place_pawn(self, player, row, col):
+        self.rules.apply_move(self.board, player, None, (row, col))
+        self.total_moves += 1
+        self.board_version += 1
+        self.moves.append((None, (row, col)))
+        if self.recorder:
+            self.recorder.add_move(None, (row, col), self.board)
+
     def in_prise(self, x, y):
-        # Check if the move at (x,y) is under attack by any opponent move
-        for i in range(self.grid_dim):
-            for j in range(self.grid_dim):
-                case = self.board[i][j]
-                if case % 10 != 0:
-                    if self.rules.verify_move(case, i, j, x, y):
-                        return True
-        return False
+        # Check if the move at (x,y) is under attack by any pawn on the board
+        return self.rules.is_attacked(self.board, x, y)
 
     def can_play(self):
-        # Check if current player has any valid moves left
-        for i in range(self.grid_dim):
-            for j in range(self.grid_dim):
-                case = self.board[i][j]
-                if case not in (0, 50, 60) and case % 10 == 0 and not self.in_prise(i, j):
-                    return True
-        return False
+        # Check if any safe square is left (the same squares are open to both players)
+        return bool(self.rules.safe_squares(self.board))
+
+    def cell_rect(self, row, col):
+        return pygame.Rect(col * self.cell_size + self.left_offset, row * self.cell_size + self.top_offset,
+                           self.cell_size, self.cell_size)
+
+    def draw_cell(self, screen, row, col, hints=()):
+        # One square: tile, safe square hint and pawn (also used by the replay)
+        rect = self.cell_rect(row, col)
+        value = self.board[row][col]
+        color = self.board_ui.get_color_from_board(value // 10)
+        pygame.draw.rect(screen, color, rect)
+        pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+        if (row, col) in hints:
+            draw_hint(screen, rect)
+
+        # Draw player pieces
+        if value % 10 != 0:
+            center = rect.center
+            radius = self.cell_size // 3
+            if value % 10 == 1:
+                pygame.draw.circle(screen, (255, 0, 0), center, radius)
+            elif value % 10 == 2:
+                pygame.draw.circle(screen, (0, 0, 255), center, radius)
+        return rect
 
     def draw(self):
         #Draw the full game screen: background, board grid, pawns, UI elements.
@@ -108,28 +164,13 @@ class Isolation(BaseUI):
         # Draw title
         screen.blit(self.title_surface, self.title_rect)  # draw title
 
-        # Draw the game board grid and pieces
+        # Draw the game board grid and pieces, and the safe squares on a player's turn
+        hints = ()
+        if self.show_hints and not (self.__AI and self.current_player == 2):
+            hints = self.hints.get(self.board, self.current_player, None, self.board_version)
         for row in range(self.grid_dim):
             for col in range(self.grid_dim):
-                rect = pygame.Rect(
-                    col * self.cell_size + self.left_offset,
-                    row * self.cell_size + self.top_offset,
-                    self.cell_size,
-                    self.cell_size
-                )
-                value = self.board[row][col]
-                color = self.board_ui.get_color_from_board(value // 10)
-                pygame.draw.rect(screen, color, rect)
-                pygame.draw.rect(screen, (255, 255, 255), rect, 1)
-
-                # Draw player pieces
-                if value % 10 != 0:
-                    center = rect.center
-                    radius = self.cell_size // 3
-                    if value % 10 == 1:
-                        pygame.draw.circle(screen, (255, 0, 0), center, radius)
-                    elif value % 10 == 2:
-                        pygame.draw.circle(screen, (0, 0, 255), center, radius)
+                self.draw_cell(screen, row, col, hints)
 
         # Draw back button
         pygame.draw.rect(screen, (70, 70, 70), self.back_button_rect)
@@ -138,37 +179,31 @@ class Isolation(BaseUI):
         screen.blit(back_text, back_text.get_rect(center=self.back_button_rect.center))
 
     def play_ai_move(self):
-        possibles = []
-        # Collect all possible moves for AI player
-        for i in range(self.grid_dim):
-            for j in range(self.grid_dim):
-                case = self.board[i][j]
-                if case not in (0, 50, 60) and case % 10 == 0 and not self.in_prise(i, j):
-                    possibles.append((i, j))
-
-        if not possibles:
+        if not self.can_play():
             print("AI can't move, Player 1 wins!")
             try:
                 WinScreen("Player 1")
             except Exception as e:
                 print(f"Error showing win screen: {e}")
             self.running = False
+            self.game_over = True
             return
 
-        # Random pick valid move
-        i, j = random.choice(possibles)
-        case = self.board[i][j]
-        color = case // 10
-        self.board[i][j] = color * 10 + 2
-        self.total_moves += 1
+        move = self.ai_player.get_move(self.board, 3, 2)
+        if move is None:
+            return  # Still thinking
+
+        i, j = move[1]
+        self.place_pawn(2, i, j)
 
-        
-        if self.total_moves >= self.max_moves or not self.can_play():
+        if not self.can_play():
             print("AI (Player 2) wins!")
             try:
                 WinScreen("Player 2 (AI)")
             except Exception as e:
                 print(f"Error showing win screen: {e}")
             self.running = False
+            self.game_over = True
         else:
-            self.current_player = 1
\ No newline at end of file
+            self.current_player = 1
+            self.ai_player.ponder(self.board, 3, 1)
\ No newline at end of file
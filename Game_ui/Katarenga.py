@@ -1,11 +1,12 @@
 import pygame
-import copy
-import time
-import random
 from UI_tools.win_screen import WinScreen
 from UI_tools.BaseUi import BaseUI
 from Board.Board_draw_tools import Board_draw_tools
-from Game_ui.move_rules import Moves_rules
+from Rules.GameRules import get_rules
+from AI.EngineProcess import EnginePlayer
+from UI_tools.MoveHints import MoveHints, draw_hint
+from Rules.GameRecord import GameRecorder
+from Rules.SaveGame import clear_saved_game, save_game
 
 
 class Katarenga(BaseUI):
@@ -15,9 +16,14 @@ class Katarenga(BaseUI):
         if board is None:
             raise ValueError("Board can't be None")  # check input
 
+        self.rules = get_rules(1)  # move rules and victory
         self.board = self.place_pawn_katarenga(board)  # setup pawns
+        self.material = self.rules.tracker(self.board)  # pawn counts and corners held
+        self.board_version = 0  # moves played, for the move hints cache
+        self.hints = MoveHints(self.rules)  # destinations of the selected pawn
+        self.show_hints = True
+        self.show_distances = False  # moves from each square to the corners, D toggles
         self.board_ui = Board_draw_tools()  # drawing helper
-        self.moves_rules = Moves_rules(self.board)  # move rules
 
         self.cell_size = 60  # size of one cell
         self.grid_dim = 10  # 10x10 grid
@@ -35,33 +41,61 @@ class Katarenga(BaseUI):
         self.current_player = 1  # player 1 starts
         self.selected_pawn = None  # no pawn selected
 
-        self.__ai = ai  # AI mode on/off
+        self.__ai = ai  # AI mode on/off, or the name of the engine to play against
+        self.ai_player = None  # Engine process, started with the game
+        self.recorder = None  # game record, written while the game runs
+        self.start_board = [row[:] for row in self.board]
+        self.moves = []  # moves played, kept for the quick-save
+        self.game_over = False
+        self.resumed = False  # continues the quick-saved game
 
         self.info_font = pygame.font.SysFont(None, 36)  # font for info text
-
-        # Movement directions by pawn color
-        self.directions = {
-            1: [(dx, dy) for dx in [-1,0,1] for dy in [-1,0,1] if dx != 0 or dy != 0],  # blue = all around
-            2: [(2,1),(1,2),(-1,2),(-2,1),(-2,-1),(-1,-2),(1,-2),(2,-1)],  # green = knight moves
-            3: [(-1,-1),(-1,1),(1,-1),(1,1)],  # yellow = diagonals
-            4: [(-1,0),(1,0),(0,-1),(0,1)]  # red = straight lines
-        }
+        self.distance_font = pygame.font.SysFont(None, 22)
 
     def run(self):
+        if self.__ai:
+            self.ai_player = EnginePlayer(self.__ai if isinstance(self.__ai, str) else None)
+        self.recorder = GameRecorder.start(1, self.board, self.current_player)
+
         while self.running:
             self.handle_events()
             self.draw()
             pygame.display.flip()
             self.clock.tick(60)
 
-            if self.__ai and self.current_player == 2:
-                time.sleep(1)
+            if self.__ai and self.current_player == 2 and self.running:
                 self.play_ai_turn()
 
+        if self.ai_player:
+            self.ai_player.close()
+        if self.recorder:
+            self.recorder.close()
+        self.save_progress()
+
+    def resume(self, save):
+        # Continue a quick-saved game (see Rules/SaveGame.py)
+        self.board = save["board"]
+        self.start_board = save["start_board"]
+        self.moves = list(save["moves"])
+        self.current_player = save["current_player"]
+        self.material = self.rules.tracker(self.board)
+        self.board_version = len(self.moves)
+        self.resumed = True
+
+    def save_progress(self):
+        # A game left before its end is quick-saved; the resumed one is cleared once over
+        if self.game_over:
+            if self.resumed:
+                clear_saved_game()
+        elif self.moves and save_game(1, self.start_board, self.board, self.current_player, self.moves, self.__ai):
+            print("Game saved, resume it from the main menu")
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 self.running = False  # quit game
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_d:
+                self.show_distances = not self.show_distances
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.back_button_rect.collidepoint(event.pos):
                     self.running = False  # back clicked
@@ -69,6 +103,9 @@ class Katarenga(BaseUI):
                     self.handle_board_click(event.pos)  # board clicked
 
     def handle_board_click(self, pos):
+        if self.__ai and self.current_player == 2:
+            return  # The AI is thinking
+
         x, y = pos
         if (self.left_offset <= x < self.left_offset + self.grid_size and
             self.top_offset <= y < self.top_offset + self.grid_size):
@@ -80,19 +117,8 @@ class Katarenga(BaseUI):
                 self.process_move(row, col)
 
     def place_pawn_katarenga(self, board):
-        new_board = copy.deepcopy(board)  # copy board to avoid mutation
-
-        # Player 2 pawns top row
-        for col in range(1, 9):
-            color = new_board[1][col] // 10
-            new_board[1][col] = color * 10 + 2
-
-        # Player 1 pawns bottom row
-        for col in range(1, 9):
-            color = new_board[8][col] // 10
-            new_board[8][col] = color * 10 + 1
-
-        return new_board
+        # Border, corners and pawns on a copy of the board
+        return self.rules.setup_board(board)
 
     def process_move(self, row, col):
         cell_value = self.board[row][col]
@@ -112,19 +138,8 @@ class Katarenga(BaseUI):
                 self.selected_pawn = (row, col)
                 print(f"Nouveau pion sélectionné à ({row}, {col})")
             else:
-                if self.current_player == 1 and 1 <= selected_col <= 9 and selected_row == 1 and (row, col) in [(0, 0), (0, 9)]:
-                    self.make_move(selected_row, selected_col, row, col)
-                    self.selected_pawn = None
-                    winner = self.check_victory()
-                    if winner == 0:
-                        self.switch_player()
-                elif self.current_player == 2 and 1 <= selected_col <= 9 and selected_row == 8 and (row, col) in [(9, 0), (9, 9)]:
-                    self.make_move(selected_row, selected_col, row, col)
-                    self.selected_pawn = None
-                    winner = self.check_victory()
-                    if winner == 0:
-                        self.switch_player()
-                elif self.is_valid_move(selected_row, selected_col, row, col):
+                # Includes the jumps into the opponent's corners
+                if self.is_valid_move(selected_row, selected_col, row, col):
                     self.make_move(selected_row, selected_col, row, col)
                     self.selected_pawn = None
                     winner = self.check_victory()
@@ -134,47 +149,22 @@ class Katarenga(BaseUI):
                     print("invalid movement")
 
     def is_valid_move(self, fr, fc, tr, tc):
-        case_color = self.board[fr][fc]
-        return self.moves_rules.verify_move(case_color, fr, fc, tr, tc)
+        return self.rules.is_legal(self.board, self.current_player, (fr, fc), (tr, tc))
 
     def make_move(self, fr, fc, tr, tc):
-        dest_color = self.board[tr][tc] // 10
-        origin_color = self.board[fr][fc] // 10
-        self.board[fr][fc] = origin_color * 10  # empty old spot
-        self.board[tr][tc] = dest_color * 10 + self.current_player  # place pawn
+        record = self.rules.apply_move(self.board, self.current_player, (fr, fc), (tr, tc))
+        for row, col, old in record:
+            self.material.change(row, col, old, self.board[row][col])
+        self.board_version += 1
+        self.moves.append(((fr, fc), (tr, tc)))
+        if self.recorder:
+            self.recorder.add_move((fr, fc), (tr, tc), self.board)
         print(f"Moved from ({fr},{fc}) to ({tr},{tc})")
 
     def switch_player(self):
         self.current_player = 2 if self.current_player == 1 else 1
         print(f"Player {self.current_player}'s turn")
 
-    def play_ai_turn(self):
-        # Simple AI for local mode
-        player_pawns = []
-        for row in range(self.grid_dim):
-            for col in range(self.grid_dim):
-                if self.board[row][col] % 10 == 2:
-                    player_pawns.append((row, col))
-        
-        if not player_pawns:
-            return
-        
-        random.shuffle(player_pawns)
-        for from_row, from_col in player_pawns:
-            possible_moves = []
-            for to_row in range(self.grid_dim):
-                for to_col in range(self.grid_dim):
-                    if self.is_valid_move(from_row, from_col, to_row, to_col):
-                        possible_moves.append((to_row, to_col))
-            
-            if possible_moves:
-                to_row, to_col = random.choice(possible_moves)
-                self.make_move(from_row, from_col, to_row, to_col)
-                
-                if self.check_victory() == 0:
-                    self.switch_player()
-                return
-
     def draw_pawn(self, screen, rect, player_code):
         center = rect.center
         radius = self.cell_size // 3
@@ -196,31 +186,12 @@ class Katarenga(BaseUI):
         # Draw title
         screen.blit(self.title_surface, self.title_rect)  # draw title
 
+        hints = ()
+        if self.show_hints:
+            hints = self.hints.get(self.board, self.current_player, self.selected_pawn, self.board_version)
         for row in range(self.grid_dim):
             for col in range(self.grid_dim):
-                rect = pygame.Rect(
-                    col * self.cell_size + self.left_offset,
-                    row * self.cell_size + self.top_offset,
-                    self.cell_size,
-                    self.cell_size
-                )
-                value = self.board[row][col]
-                color_code = value // 10
-                player_code = value % 10
-
-                color = self.board_ui.get_color_from_board(color_code)
-                pygame.draw.rect(screen, color, rect)
-
-                if self.selected_pawn == (row, col):
-                    pygame.draw.rect(screen, (255, 255, 0), rect, 4)  # highlight selected
-
-                pygame.draw.rect(screen, (255, 255, 255), rect, 1)  # grid lines
-
-                if player_code > 0:
-                    self.draw_pawn(screen, rect, player_code)  # draw pawn
-
-                if player_code > 0:
-                    self.draw_pawn(screen, rect, player_code)
+                self.draw_cell(screen, row, col, hints)
         
         # Draw back button
         pygame.draw.rect(screen, (70, 70, 70), self.back_button_rect)
@@ -232,6 +203,38 @@ class Katarenga(BaseUI):
         self.draw_game_info(screen)
 
 
+    def cell_rect(self, row, col):
+        return pygame.Rect(col * self.cell_size + self.left_offset, row * self.cell_size + self.top_offset,
+                           self.cell_size, self.cell_size)
+
+    def draw_cell(self, screen, row, col, hints=()):
+        # One square: tile, selection, grid line, pawn and move hint (also used by the replay)
+        rect = self.cell_rect(row, col)
+        value = self.board[row][col]
+        player_code = value % 10
+
+        color = self.board_ui.get_color_from_board(value // 10)
+        pygame.draw.rect(screen, color, rect)
+
+        if self.selected_pawn == (row, col):
+            pygame.draw.rect(screen, (255, 255, 0), rect, 4)  # highlight selected
+
+        pygame.draw.rect(screen, (255, 255, 255), rect, 1)  # grid lines
+
+        if player_code > 0:
+            self.draw_pawn(screen, rect, player_code)  # draw pawn
+
+        if (row, col) in hints:
+            draw_hint(screen, rect, player_code > 0)  # legal destination
+
+        if self.show_distances:
+            # Moves to the current player's corners, read from the layout's table
+            distance = self.material.distances[self.current_player][row][col]
+            if distance is not None:
+                text = self.distance_font.render(str(distance), True, (255, 255, 255), (40, 40, 40))
+                screen.blit(text, (rect.left + 3, rect.top + 3))
+        return rect
+
     def draw_pawn(self, screen, rect, player):
         center_x = rect.centerx
         center_y = rect.centery
@@ -265,98 +268,46 @@ class Katarenga(BaseUI):
         if self.selected_pawn:
             instruction = "Click a case to move the selected pawn"
         else:
-            instruction = "Click on a pawn to select it, then click a case to move it"
+            instruction = "Click on a pawn to select it, then click a case to move it (D: moves to the corners)"
         
         instruction_surface = pygame.font.SysFont(None, 24).render(instruction, True, (200, 200, 200))
         instruction_rect = instruction_surface.get_rect()
         instruction_rect.topleft = (self.left_offset, text_rect.bottom + 10)
         screen.blit(instruction_surface, instruction_rect)
 
-    def count_pawns(self):
-        player1_count = 0
-        player2_count = 0
-        
-        for row in range(10):
-            for col in range(10):
-                player = self.board[row][col] % 10
-                if player == 1:
-                    player1_count += 1
-                elif player == 2:
-                    player2_count += 1
-        
-        return player1_count, player2_count
-    
     def check_victory(self):
-        player1_count, player2_count = self.count_pawns()
-        
-        if player1_count == 0:
-            print("The player 2 has won (no pawns left for player 1)!")
-            self.running = False
-            WinScreen("Player 2")
-            return 2
-        if player2_count == 0:
-            print("The player 1 has won (no pawns left for player 2)!")
-            WinScreen("Player 1")
-            self.running = False
-            return 1
-
-        if self.board[9][0] % 10 == 2 and self.board[9][9] % 10 == 2:
-            print("The player 1 has won (occupied the corners bottom left and right)!")
-            WinScreen("Player 1")   
-            self.running = False
-            return 1
-
-        if self.board[0][0] % 10 == 1 and self.board[0][9] % 10 == 1:
-            print("the player 2 has won (occupied the corners top left and right)!")
-            WinScreen("Player 2")
-            self.running = False
-            return 2
-
-        return 0
-    
-    def play_ai_turn(self):
-        from random import choice, shuffle
+        # Called after the current player's move
+        winner = self.rules.winner(self.board, self.current_player, self.material)
+        if winner is None:
+            return 0
+
+        if self.material.pawns[3 - winner] == 0:
+            print(f"The player {winner} has won (no pawns left for player {3 - winner})!")
+        elif winner == 1 and self.material.corners[1] == 2:
+            print("The player 1 has won (occupied the corners top left and right)!")
+        elif winner == 2 and self.material.corners[2] == 2:
+            print("The player 2 has won (occupied the corners bottom left and right)!")
+        else:
+            print(f"The player {winner} has won (player {3 - winner} cannot move)!")
+        WinScreen(f"Player {winner}")
+        self.running = False
+        self.game_over = True
+        return winner
 
+    def play_ai_turn(self):
+        # The AI (player 2) plays the engine's move once it is found
         if self.current_player != 2:
             return
 
-        pawns = []
-        for x in range(10):
-            for y in range(10):
-                if self.board[x][y] % 10 == 2:
-                    pawns.append((x, y))
-
-        shuffle(pawns)
-
-        for x, y in pawns:
-            couleur = self.board[x][y] // 10
-            dir_list = self.directions.get(couleur, [])
-            shuffle(dir_list)
-
-            for dx, dy in dir_list:
-                steps = 1
-                while True:
-                    new_x = x + dx * steps
-                    new_y = y + dy * steps
-
-                    if not (0 <= new_x < 10 and 0 <= new_y < 10):
-                        break
-
-                    if self.moves_rules.verify_move(self.board[x][y], x, y, new_x, new_y):
-                        self.make_move(x, y, new_x, new_y)
-                        print(f"IA a joué de ({x}, {y}) à ({new_x}, {new_y})")
-
-                        winner = self.check_victory()
-                        if winner == 0:
-                            self.switch_player()
-                        return
-
-                    if couleur in [1, 2]:
-                        break
-
-                    if self.board[new_x][new_y] != 0:
-                        break
+        move = self.ai_player.get_move(self.board, 1, 2)
+        if move is None:
+            return  # Still thinking
 
-                    steps += 1
+        (x, y), (new_x, new_y) = move
+        self.make_move(x, y, new_x, new_y)
+        print(f"IA a joué de ({x}, {y}) à ({new_x}, {new_y})")
 
-        print("L'IA n'a pas trouvé de coup valide.")
\ No newline at end of file
+        winner = self.check_victory()
+        if winner == 0:
+            self.switch_player()
+            self.ai_player.ponder(self.board, 1, 1)
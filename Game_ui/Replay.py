@@ -0,0 +1,285 @@
+import pygame
+
+from UI_tools.BaseUi import BaseUI
+from Rules.GameRecord import GameRecord, list_records
+from Rules.GameRules import GAME_NAMES, clear_pawns
+
+SPEEDS = (0.5, 1, 2, 4, 8)  # Plies per second of the autoplay
+LAST_MOVE_COLOR = (255, 200, 0)
+
+
+class Replay(BaseUI):
+    # Replays the games of records/ (see Rules/GameRecord.py) with the game screens' own
+    # square drawing. After the first frame only the squares a step changes and the
+    # control bar are drawn again and sent to the display.
+    def __init__(self, title="Replay"):
+        super().__init__(title)
+        self.records = list_records()
+        self.record_index = 0
+        self.record = None
+        self.game = None  # Game screen used to draw the board
+        self.state = None
+        self.ply = 0
+
+        self.playing = False
+        self.speed_index = 1
+        self.next_step_at = 0
+        self.dragging = False
+        self.full_redraw = True
+        self.changed = set()  # Squares to draw again
+        self.dirty = []  # Screen rectangles to send to the display
+
+        self.info_font = pygame.font.SysFont(None, 32)
+        self.button_font = pygame.font.SysFont(None, 30)
+        self.back_button_rect = pygame.Rect(20, 20, 120, 40)
+
+        if self.records:
+            self.open_record(0)
+
+    def open_record(self, index):
+        if self.record:
+            self.record.close()
+        self.record_index = index % len(self.records)
+        try:
+            self.record = GameRecord(self.records[self.record_index])
+        except (OSError, ValueError) as e:
+            print(f"Error opening record: {e}")
+            self.record = None
+            self.game = None
+            self.full_redraw = True
+            return
+
+        self.state = self.record.state(0)
+        self.game = self._create_game(self.record.game_type, self.state.board)
+        self.ply = 0
+        self.playing = False
+        self._layout()
+        self.full_redraw = True
+
+    def _create_game(self, game_type, board):
+        # The game screens are only used to draw, like in NetworkGameAdapter
+        from Game_ui.Katarenga import Katarenga
+        from Game_ui.Congress import Congress
+        from Game_ui.Isolation import Isolation
+        screen_class = {1: Katarenga, 2: Congress, 3: Isolation}[game_type]
+        game = screen_class(False, [row[:] for row in board])
+        game.board = board
+        if game_type == 2:
+            game.base_board = clear_pawns(board)
+        game.show_hints = False
+        return game
+
+    def _layout(self):
+        # Control bar under the board
+        top = self.game.top_offset + self.game.grid_size + 20
+        left = self.game.left_offset
+        width = self.game.grid_size
+        self.bar_rect = pygame.Rect(0, top, self.get_width(), self.get_height() - top)
+        self.slider_rect = pygame.Rect(left, top + 40, width, 16)
+        labels = ["|<", "<", "Play", ">", ">|", "Speed", "Next game"]
+        widths = [50, 50, 90, 50, 50, 120, 150]
+        spacing = 10
+        x = left + (width - sum(widths) - spacing * (len(widths) - 1)) // 2
+        self.buttons = []
+        for label, button_width in zip(labels, widths):
+            self.buttons.append((label, pygame.Rect(x, top + 80, button_width, 40)))
+            x += button_width + spacing
+
+    def run(self):
+        while self.running:
+            self.handle_events()
+            self.update()
+            self.draw()
+            if self.full_redraw:
+                pygame.display.flip()
+                self.full_redraw = False
+            elif self.dirty:
+                pygame.display.update(self.dirty)
+            self.dirty = []
+            self.clock.tick(60)
+        if self.record:
+            self.record.close()
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                self.handle_key(event.key)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                self.handle_click(event.pos)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.dragging = False
+            elif event.type == pygame.MOUSEMOTION and self.dragging:
+                self.scrub(event.pos[0])
+
+    def handle_key(self, key):
+        if key == pygame.K_ESCAPE:
+            self.running = False
+        elif not self.record:
+            return
+        elif key == pygame.K_RIGHT:
+            self.seek(self.ply + 1)
+        elif key == pygame.K_LEFT:
+            self.seek(self.ply - 1)
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(len(self.record))
+        elif key == pygame.K_SPACE:
+            self.toggle_play()
+        elif key == pygame.K_UP:
+            self.speed_index = min(self.speed_index + 1, len(SPEEDS) - 1)
+        elif key == pygame.K_DOWN:
+            self.speed_index = max(self.speed_index - 1, 0)
+        elif key == pygame.K_PAGEDOWN:
+            self.open_record(self.record_index + 1)
+        elif key == pygame.K_PAGEUP:
+            self.open_record(self.record_index - 1)
+
+    def handle_click(self, pos):
+        if self.back_button_rect.collidepoint(pos):
+            self.running = False
+            return
+        if not self.record:
+            return
+        if self.slider_rect.inflate(0, 20).collidepoint(pos):
+            self.dragging = True
+            self.scrub(pos[0])
+            return
+        for label, rect in self.buttons:
+            if rect.collidepoint(pos):
+                if label == "|<":
+                    self.seek(0)
+                elif label == "<":
+                    self.seek(self.ply - 1)
+                elif label == "Play":
+                    self.toggle_play()
+                elif label == ">":
+                    self.seek(self.ply + 1)
+                elif label == ">|":
+                    self.seek(len(self.record))
+                elif label == "Speed":
+                    self.speed_index = (self.speed_index + 1) % len(SPEEDS)
+                elif label == "Next game":
+                    self.open_record(self.record_index + 1)
+
+    def toggle_play(self):
+        if not self.playing and self.ply >= len(self.record):
+            self.seek(0)
+        self.playing = not self.playing
+        self.next_step_at = pygame.time.get_ticks()
+
+    def scrub(self, x):
+        fraction = (x - self.slider_rect.left) / self.slider_rect.width
+        self.seek(round(max(0.0, min(1.0, fraction)) * len(self.record)))
+
+    def seek(self, ply):
+        # One move forward is played on the current state, any other jump starts from
+        # the record's nearest snapshot
+        ply = max(0, min(ply, len(self.record)))
+        if ply == self.ply:
+            return
+        before = [row[:] for row in self.state.board]
+        previous_move = self._last_move()
+        if ply == self.ply + 1:
+            self.state.apply(*self.record.move(self.ply))
+        else:
+            self.state = self.record.state(ply)
+            # The screen draws the list it holds: copy the new position into it
+            for row, new_row in zip(self.game.board, self.state.board):
+                row[:] = new_row
+            self.state.board = self.game.board
+        self.ply = ply
+        self.game.current_player = self.state.current_player
+
+        changed = {(r, c) for r, row in enumerate(before) for c, value in enumerate(row)
+                   if value != self.state.board[r][c]}
+        for square in (previous_move or ()) + (self._last_move() or ()):
+            if square is not None:
+                changed.add(square)
+        self.changed |= changed
+
+    def _last_move(self):
+        if self.ply == 0:
+            return None
+        return self.record.move(self.ply - 1)
+
+    def update(self):
+        if self.playing and pygame.time.get_ticks() >= self.next_step_at:
+            if self.ply >= len(self.record):
+                self.playing = False
+            else:
+                self.seek(self.ply + 1)
+                self.next_step_at = pygame.time.get_ticks() + int(1000 / SPEEDS[self.speed_index])
+
+    def draw(self):
+        screen = self.get_screen()
+        if self.full_redraw:
+            if self.game:
+                self.game.draw()  # Background, title and board of the game screen
+                self.changed = set()
+                self.draw_last_move(screen)
+            else:
+                screen.blit(self.get_background(), (0, 0))
+                message = self.info_font.render("No recorded game yet: play one first", True, (255, 255, 255))
+                screen.blit(message, message.get_rect(center=(self.get_width() // 2, self.get_height() // 2)))
+            self.draw_back_button(screen)
+            if self.game:
+                self.draw_controls(screen)
+            return
+
+        if self.changed:
+            # Only the squares the step changed, and the controls
+            for row, col in self.changed:
+                self.dirty.append(self.game.draw_cell(screen, row, col))
+            self.draw_last_move(screen)
+            self.changed = set()
+        self.dirty.append(self.draw_controls(screen))
+
+    def draw_last_move(self, screen):
+        move = self._last_move()
+        if move:
+            for square in move:
+                if square is not None:
+                    pygame.draw.rect(screen, LAST_MOVE_COLOR, self.game.cell_rect(*square), 3)
+
+    def draw_back_button(self, screen):
+        pygame.draw.rect(screen, (70, 70, 70), self.back_button_rect)
+        pygame.draw.rect(screen, (255, 255, 255), self.back_button_rect, 2)
+        back_text = pygame.font.SysFont(None, 36).render("Back", True, (255, 255, 255))
+        screen.blit(back_text, back_text.get_rect(center=self.back_button_rect.center))
+
+    def draw_controls(self, screen):
+        # Control bar: drawn over its own piece of background, returns its rectangle
+        screen.blit(self.get_background(), self.bar_rect, self.bar_rect)
+        plies = len(self.record)
+        status = f"{GAME_NAMES[self.record.game_type]} - move {self.ply}/{plies}"
+        if self.state.winner:
+            status += f" - player {self.state.winner} wins"
+        elif self.ply:
+            status += f" - player {self.state.current_player} to move"
+        text = self.info_font.render(status, True, (255, 255, 255))
+        screen.blit(text, (self.slider_rect.left, self.bar_rect.top))
+
+        pygame.draw.rect(screen, (60, 60, 60), self.slider_rect)
+        filled = self.slider_rect.copy()
+        filled.width = int(self.slider_rect.width * (self.ply / plies if plies else 0))
+        pygame.draw.rect(screen, (100, 180, 255), filled)
+        pygame.draw.rect(screen, (255, 255, 255), self.slider_rect, 1)
+        pygame.draw.circle(screen, (255, 255, 255), (self.slider_rect.left + filled.width, self.slider_rect.centery), 10)
+
+        for label, rect in self.buttons:
+            if label == "Play" and self.playing:
+                label = "Pause"
+            elif label == "Speed":
+                label = f"x{SPEEDS[self.speed_index]:g}"
+            pygame.draw.rect(screen, (70, 70, 70), rect)
+            pygame.draw.rect(screen, (255, 255, 255), rect, 2)
+            surface = self.button_font.render(label, True, (255, 255, 255))
+            screen.blit(surface, surface.get_rect(center=rect.center))
+
+        name = self.button_font.render(f"{self.record_index + 1}/{len(self.records)}  "
+                                       f"{self.records[self.record_index]}", True, (200, 200, 200))
+        screen.blit(name, (self.slider_rect.left, self.buttons[0][1].bottom + 15))
+        return self.bar_rect
@@ -1,18 +1,26 @@
-from UI_tools.win_screen import WinScreen
 import json
 import copy
-from Game_ui.move_rules import Moves_rules
+import time
+import threading
 from Online.NetworkGameLogic import NetworkGameLogic
+from Rules.GameRecord import GameRecorder
+from Rules.GameState import GameState
 
-try:
-    NETWORK_LOGIC_AVAILABLE = True
-except ImportError:
-    #print("NetworkGameLogic not found, using basic validation only")
-    NETWORK_LOGIC_AVAILABLE = False
+# Time controls per game type: (base time, increment per move) in seconds
+DEFAULT_TIME_CONTROLS = {
+    1: (300, 5),  # Katarenga
+    2: (300, 5),  # Congress
+    3: (120, 2)   # Isolation
+}
+
+PING_INTERVAL = 2.0  # Seconds between two latency measurements
+MAX_LATENCY_CORRECTION = 1.0  # Upper bound of the time given back for network delay
 
 class GameSession:
     
-    def __init__(self, game_type, network_manager):
+    record_games = True  # Games written to records/ (see Rules/GameRecord.py)
+    
+    def __init__(self, game_type, network_manager, time_control=None):
         self.game_type = game_type  # 1=Katarenga, 2=Congress, 3=Isolation
         self.network = network_manager
         self.board = None
@@ -21,14 +29,21 @@ class GameSession:
         self.game_started = False
         self.game_finished = False
         
-        # Movement rules
-        self.moves_rules = None
+        # Position and rules of the game, shared with the game screen through self.board
+        self.state = None
         
-        # Game logic handler
-        if NETWORK_LOGIC_AVAILABLE:
-            self.game_logic = NetworkGameLogic()
-        else:
-            self.game_logic = None
+        # Clocks, run by the host: (base, increment) or None for untimed games
+        self.time_control = time_control
+        self.clocks = None  # Remaining seconds per player
+        self.turn_started_at = None
+        self.turn_id = 0
+        self.flag_timer = None
+        self.round_trip_time = 0.0
+        self.clock_lock = threading.Lock()
+        
+        # Game information handler
+        self.game_logic = NetworkGameLogic()
+        self.recorder = None  # Started with the first move, on both peers
         
         # Callbacks for game events
         self.on_board_update = None
@@ -47,8 +62,7 @@ class GameSession:
     
     def set_board(self, board_data):
         self.board = copy.deepcopy(board_data)
-        # Initialize movement rules with new board
-        self.moves_rules = Moves_rules(self.board)
+        self.state = GameState(self.game_type, self.board)
         
         if self.is_host:
             # Send board data to client
@@ -65,12 +79,17 @@ class GameSession:
         
         self.game_started = True
         self.current_player = 1  # Host always starts
+        self.state.set_position(self.board, self.current_player)
         
         if self.is_host:
             message = {
                 'type': 'GAME_START',
                 'current_player': self.current_player
             }
+            if self.time_control:
+                self._start_clocks()
+                message['time_control'] = list(self.time_control)
+                message['clocks'] = self._clock_frame()
             self.network.send_message(json.dumps(message))
         
         if self.on_player_change:
@@ -91,11 +110,12 @@ class GameSession:
 
         #print(f"[DEBUG] Attempting move: {from_pos} -> {to_pos} by Player {self.current_player}")
 
-        if self.game_logic and self.game_logic.validate_move(
-            self.board, self.moves_rules, self.game_type,
-            self.current_player, from_pos, to_pos
-        ):
-            self._apply_move(from_pos, to_pos)
+        if self.state.is_legal(from_pos, to_pos):
+            # Too late: the flag timer ends the game
+            if self.is_host and self.clocks and not self._charge_clock(self.current_player, remote=False):
+                return False
+
+            winner = self._apply_move(from_pos, to_pos)
 
             message = {
                 'type': 'MOVE',
@@ -103,10 +123,11 @@ class GameSession:
                 'to': to_pos,
                 'player': self.current_player
             }
+            if self.is_host and self.clocks:
+                message['clocks'] = self._clock_frame()
             #print(f"[DEBUG] Sending MOVE to opponent: {message}")
             self.network.send_message(json.dumps(message))
 
-            winner = self.game_logic.check_victory(self.board, self.game_type, self.current_player)
             if winner:
                 #print(f"[DEBUG] Victory detected for Player {winner}")
                 self._end_game(winner)
@@ -115,19 +136,6 @@ class GameSession:
 
             return True
 
-        elif not self.game_logic and self._basic_validate_move(from_pos, to_pos):
-            self._apply_move(from_pos, to_pos)
-
-            message = {
-                'type': 'MOVE',
-                'from': from_pos,
-                'to': to_pos,
-                'player': self.current_player
-            }
-            self.network.send_message(json.dumps(message))
-            self._switch_player()
-            return True
-
         #print("[DEBUG] Invalid move.")
         return False
     
@@ -140,13 +148,17 @@ class GameSession:
             if msg_type == 'BOARD_DATA':
                 self.board = data['board']
                 self.game_type = data['game_type']
-                self.moves_rules = Moves_rules(self.board)
+                self.state = GameState(self.game_type, self.board)
                 if self.on_board_update:
                     self.on_board_update(self.board)
 
             elif msg_type == 'GAME_START':
                 self.game_started = True
                 self.current_player = data['current_player']
+                self.state.set_position(self.board, self.current_player)
+                if data.get('time_control'):
+                    self.time_control = tuple(data['time_control'])
+                    self._set_clocks(data['clocks'])
                 if self.on_player_change:
                     self.on_player_change(self.current_player)
 
@@ -154,21 +166,54 @@ class GameSession:
                 from_pos = tuple(data['from']) if data['from'] else None
                 to_pos = tuple(data['to'])
                 player = data['player']
-                #print(f"[DEBUG] Applying opponent move: {from_pos} -> {to_pos}")
 
-                self._apply_move(from_pos, to_pos)
+                # The host is authoritative: every incoming move is checked against
+                # the legal move set of the current position before being applied
+                if self.is_host and not self._is_legal_remote_move(player, from_pos, to_pos):
+                    self._reject_move(from_pos, to_pos)
+                    return
+
+                # Time used by the opponent, minus the measured network delay
+                if self.is_host and self.clocks and not self._charge_clock(player, remote=True):
+                    self._end_game(1 if player == 2 else 2)
+                    return
+
+                if not self.is_host and 'clocks' in data:
+                    self._set_clocks(data['clocks'])
+
+                #print(f"[DEBUG] Applying opponent move: {from_pos} -> {to_pos}")
 
-                winner = None
-                if self.game_logic:
-                    winner = self.game_logic.check_victory(
-                        self.board, self.game_type, self.current_player
-                    )
+                winner = self._apply_move(from_pos, to_pos)
                 if winner:
                     #print(f"[DEBUG] Opponent triggered victory: Player {winner}")
                     # Appeler _end_game pour que WinScreen soit affiché aussi côté client
                     self._end_game(winner)
                 else:
                     self._switch_player()
+                    if self.is_host and self.clocks:
+                        self._send_clocks()
+
+            elif msg_type == 'CLOCK':
+                self._set_clocks(data['clocks'])
+
+            elif msg_type == 'PING':
+                self.network.send_message(json.dumps({'type': 'PONG', 'sent': data['sent']}))
+
+            elif msg_type == 'PONG':
+                self._record_round_trip(data['sent'])
+
+            elif msg_type == 'MOVE_REJECTED':
+                # Host refused our last move: restore its authoritative position
+                print(f"Move rejected by host: {data.get('from')} -> {data.get('to')}")
+                self.board = data['board']
+                self.current_player = data['current_player']
+                self.state.set_position(self.board, self.current_player)
+                if self.recorder:
+                    self.recorder.truncate(self.recorder.plies - 1)
+                if self.on_board_update:
+                    self.on_board_update(self.board)
+                if self.on_player_change:
+                    self.on_player_change(self.current_player)
 
             elif msg_type == 'GAME_END':
                 winner = data['winner']
@@ -178,56 +223,175 @@ class GameSession:
         except Exception as e:
             print(f"Error processing message: {e}")
     
+    def _is_legal_remote_move(self, player, from_pos, to_pos):
+        if not self.game_started or self.game_finished:
+            return False
+
+        remote_player = 2 if self.is_host else 1
+        if player != remote_player or self.current_player != remote_player:
+            return False
+
+        return self.state.is_legal(from_pos, to_pos)
+
+    def _reject_move(self, from_pos, to_pos):
+        print(f"Rejected illegal move from opponent: {from_pos} -> {to_pos}")
+        message = {
+            'type': 'MOVE_REJECTED',
+            'from': from_pos,
+            'to': to_pos,
+            'board': self.board,
+            'current_player': self.current_player
+        }
+        self.network.send_message(json.dumps(message))
+
+    def _start_clocks(self):
+        base, _ = self.time_control
+        with self.clock_lock:
+            self.clocks = {1: float(base), 2: float(base)}
+            self.turn_started_at = time.monotonic()
+        self._arm_flag_timer()
+        threading.Thread(target=self._measure_latency, daemon=True).start()
+
+    def _charge_clock(self, player, remote):
+        # Deduct the time spent on this move, then add the increment.
+        # Returns False if the player ran out of time.
+        _, increment = self.time_control
+        with self.clock_lock:
+            elapsed = time.monotonic() - self.turn_started_at
+            if remote:
+                # The move travelled both ways: our frame to the peer and its move back
+                elapsed -= min(self.round_trip_time, MAX_LATENCY_CORRECTION)
+            self.clocks[player] -= max(0.0, elapsed)
+            if self.clocks[player] <= 0:
+                self.clocks[player] = 0.0
+                return False
+            self.clocks[player] += increment
+            # The move is in time: the flag timer still running is now out of date
+            self.turn_id += 1
+            return True
+
+    def _arm_flag_timer(self):
+        if self.flag_timer:
+            self.flag_timer.cancel()
+
+        local_player = 1 if self.is_host else 2
+        with self.clock_lock:
+            self.turn_id += 1
+            delay = self.clocks[self.current_player]
+            if self.current_player != local_player:
+                delay += min(self.round_trip_time, MAX_LATENCY_CORRECTION)
+
+        self.flag_timer = threading.Timer(delay, self._on_flag_fall, args=(self.current_player, self.turn_id))
+        self.flag_timer.daemon = True
+        self.flag_timer.start()
+
+    def _on_flag_fall(self, player, turn_id):
+        with self.clock_lock:
+            if self.game_finished or turn_id != self.turn_id:
+                return
+            self.clocks[player] = 0.0
+        print(f"Player {player} ran out of time")
+        self._end_game(1 if player == 2 else 2)
+
+    def _stop_clocks(self):
+        if self.flag_timer:
+            self.flag_timer.cancel()
+            self.flag_timer = None
+
+    def _clock_frame(self):
+        with self.clock_lock:
+            return {str(player): remaining for player, remaining in self.clocks.items()}
+
+    def _set_clocks(self, clock_frame):
+        # Client side: the host's clocks are authoritative
+        with self.clock_lock:
+            self.clocks = {int(player): remaining for player, remaining in clock_frame.items()}
+            self.turn_started_at = time.monotonic()
+
+    def _send_clocks(self):
+        message = {
+            'type': 'CLOCK',
+            'clocks': self._clock_frame()
+        }
+        self.network.send_message(json.dumps(message))
+
+    def _measure_latency(self):
+        while self.game_started and not self.game_finished and self.network.is_connected:
+            self.network.send_message(json.dumps({'type': 'PING', 'sent': time.monotonic()}))
+            time.sleep(PING_INTERVAL)
+
+    def _record_round_trip(self, sent):
+        sample = time.monotonic() - sent
+        if sample < 0:
+            return
+        # Smoothed so a single slow packet does not move the clocks much
+        if self.round_trip_time == 0.0:
+            self.round_trip_time = sample
+        else:
+            self.round_trip_time = 0.8 * self.round_trip_time + 0.2 * sample
+
+    def get_clocks(self):
+        # Remaining time per player, counting down for the player to move
+        if not self.clocks:
+            return None
+        with self.clock_lock:
+            clocks = dict(self.clocks)
+            if self.game_started and not self.game_finished and self.turn_started_at is not None:
+                elapsed = time.monotonic() - self.turn_started_at
+                clocks[self.current_player] = max(0.0, clocks[self.current_player] - elapsed)
+        return clocks
+
     def _handle_disconnect(self):
         if not self.game_finished:
             self._end_game("Disconnection")
     
     def _apply_move(self, from_pos, to_pos):
-        if not self.board:
-            return
-        
-        to_row, to_col = to_pos
+        # Plays the move on the shared board and returns the winner, if any
+        if not self.state:
+            return None
         
-        if self.game_type == 3:  # Isolation
-            # For Isolation, just place the piece
-            dest_color = self.board[to_row][to_col] // 10
-            self.board[to_row][to_col] = dest_color * 10 + self.current_player
+        if self.game_type != 3 and from_pos is None:  # Katarenga and Congress move a pawn
+            print("Error : from is None")
+            return None
         
-        else:  # Katarenga and Congress
-            if from_pos is None:
-                print("Error : from is None")
-                return
-            
-            from_row, from_col = from_pos
-            
-            # Verify source has correct player piece
-            piece = self.board[from_row][from_col]
-            if piece % 10 != self.current_player:
-                return
-            
-            # Clear source square
-            source_color = piece // 10
-            self.board[from_row][from_col] = source_color * 10
-            
-            # Place piece at destination
-            dest_color = self.board[to_row][to_col] // 10
-            self.board[to_row][to_col] = dest_color * 10 + self.current_player
+        if self.recorder is None and self.record_games:
+            self.recorder = GameRecorder.start(self.game_type, self.board, self.state.current_player)
+            self.record_games = self.recorder is not None  # Not retried if it cannot be written
         
-        # Update move rules with new board state
-        if self.moves_rules:
-            self.moves_rules._Moves_rules__board = self.board
+        winner = self.state.apply(from_pos, to_pos)
+        if self.recorder:
+            self.recorder.add_move(from_pos, to_pos, self.board)
         
         if self.on_board_update:
             self.on_board_update(self.board)
+        
+        return winner
     
     def _switch_player(self):
         self.current_player = 2 if self.current_player == 1 else 1
+        if self.clocks:
+            with self.clock_lock:
+                self.turn_started_at = time.monotonic()
+            if self.is_host:
+                self._arm_flag_timer()
         if self.on_player_change:
             self.on_player_change(self.current_player)
     
+    def _finish(self):
+        # True for the first caller only: the flag timer, a move and a GAME_END message
+        # may all try to end the game, on different threads
+        with self.clock_lock:
+            if self.game_finished:
+                return False
+            self.game_finished = True
+            return True
+
     def _end_game(self, winner):
         #print(f"[DEBUG] _end_game called - Winner: Player {winner}")
-        self.game_finished = True
+        if not self._finish():
+            return
+        self._stop_clocks()
+        self._close_record()
 
         message = {
             'type': 'GAME_END',
@@ -247,7 +411,10 @@ class GameSession:
     
     def _end_game_received(self, winner):
         #print(f"[DEBUG] _end_game_received called - Winner: Player {winner}")
-        self.game_finished = True
+        if not self._finish():
+            return
+        self._stop_clocks()
+        self._close_record()
 
         if self.on_game_end:
             #print("[DEBUG] Calling on_game_end callback from _end_game_received")
@@ -258,8 +425,16 @@ class GameSession:
         # Affiche WinScreen côté client à la réception de GAME_END
         self.close_all_and_show_win_screen(f"Player {winner}")
     
+    def _close_record(self):
+        if self.recorder:
+            self.recorder.close()
+            print(f"Game recorded in {self.recorder.filename}")
+            self.recorder = None
+    
     def close_all_and_show_win_screen(self, winner):
         #print(f"[DEBUG] Closing all and showing WinScreen for {winner}")
+        # Imported here so the session itself can run without a display
+        from UI_tools.win_screen import WinScreen
         WinScreen(winner)
     
     def send_chat_message(self, text):
@@ -276,38 +451,18 @@ class GameSession:
             'game_finished': self.game_finished,
             'current_player': self.current_player,
             'is_host': self.is_host,
-            'local_player': 1 if self.is_host else 2
+            'local_player': 1 if self.is_host else 2,
+            'clocks': self.get_clocks()
         }
     
     def get_game_info(self): #Get game state information
-        if self.board and self.game_logic:
+        if self.board:
             return self.game_logic.get_game_state_info(
-                self.board, self.game_type, self.current_player
+                self.board, self.game_type, self.current_player, self.state
             )
         return None
     
     def get_valid_moves(self):
-        if self.board and self.game_logic:
-            return self.game_logic.get_valid_moves(
-                self.board, self.moves_rules, self.game_type, self.current_player
-            )
+        if self.state:
+            return self.state.legal_moves()
         return []
-    
-    def _basic_validate_move(self, from_pos, to_pos): # get move validation if NetworkGameLogic not available
-        if not self.moves_rules or not self.board:
-            return False
-        
-        to_row, to_col = to_pos
-        if not (0 <= to_row < len(self.board) and 0 <= to_col < len(self.board[0])):
-            return False
-        
-        if self.game_type == 3:  # Isolation
-            return from_pos is None and self.board[to_row][to_col] % 10 == 0
-        
-        else:  # Katarenga and Congress
-            if from_pos is None:
-                return False
-            from_row, from_col = from_pos
-            if not (0 <= from_row < len(self.board) and 0 <= from_col < len(self.board[0])):
-                return False
-            case_color = self.board[from_row][from_col]
\ No newline at end of file
@@ -1,11 +1,13 @@
 import pygame
 from UI_tools.BaseUi import BaseUI
 from Online.NetworkManager import NetworkManager
+from Online.LanDiscovery import DiscoveryResponder
 from Online.NetworkGameAdapter import NetworkGameAdapter
-from Online.GameSession import GameSession
+from Online.GameSession import GameSession, DEFAULT_TIME_CONTROLS
 from Editor.Square_selector.SquareSelectorUi import SquareSelectorUi
+from Rules.GameRules import get_rules
+from AI.EngineProcess import engine_names
 
-import copy
 import time
 class HostUI(BaseUI):
 
@@ -13,8 +15,14 @@ class HostUI(BaseUI):
         super().__init__(title)
         
         self.network = NetworkManager()
+        self.discovery = None
         self.session = None
         self.selected_game = None
+        self.timed_game = False
+        
+        # Who plays the host's side: the user (None) or a configured engine
+        self.engine_choices = [None] + engine_names()
+        self.engine_index = 0
         
         self.server_started = False
         self.client_connected = False
@@ -58,6 +66,12 @@ class HostUI(BaseUI):
         # Button for starting the server
         self.start_server_button = pygame.Rect(center_x, start_y + len(games) * (button_height + spacing) + 50, button_width, button_height)
         
+        # Button toggling the game clock
+        self.clock_button = pygame.Rect(center_x, start_y + len(games) * (button_height + spacing) + 130, button_width, button_height)
+        
+        # Button choosing who plays the host's side
+        self.engine_button = pygame.Rect(center_x - 75, start_y + len(games) * (button_height + spacing) + 210, button_width + 150, button_height)
+        
         # Button for board selection (visible only when client is connected)
         self.select_board_button = pygame.Rect(center_x, start_y + len(games) * (button_height + spacing) + 130, button_width, button_height)
         
@@ -71,6 +85,8 @@ class HostUI(BaseUI):
             pygame.display.flip()
             self.clock.tick(60)
         
+        if self.discovery:
+            self.discovery.stop()
         if self.network:
             self.network.disconnect()
     
@@ -95,6 +111,14 @@ class HostUI(BaseUI):
                     print(f"Game selected: {button['name']}")
                     return
             
+            if self.clock_button.collidepoint(pos):
+                self.timed_game = not self.timed_game
+                return
+            
+            if self.engine_button.collidepoint(pos):
+                self.engine_index = (self.engine_index + 1) % len(self.engine_choices)
+                return
+            
             # Start server
             if self.start_server_button.collidepoint(pos) and self.selected_game:
                 self.start_server()
@@ -113,6 +137,10 @@ class HostUI(BaseUI):
                 message_callback=self.handle_network_message,
                 disconnect_callback=self.handle_client_disconnect
             )
+            
+            # Answer LAN discovery requests so clients can list this game
+            self.discovery = DiscoveryResponder(self.selected_game)
+            self.discovery.start()
         else:
             pass
     
@@ -121,6 +149,8 @@ class HostUI(BaseUI):
         if not self.client_connected:
             self.client_connected = True
             self.waiting_for_client = False
+            if self.discovery:
+                self.discovery.set_status("full")
             
             # Send confirmation to client
             if hasattr(self, 'network') and self.network:
@@ -130,10 +160,13 @@ class HostUI(BaseUI):
         self.client_connected = False
         self.waiting_for_client = True
         self.board_selected = False
+        if self.discovery:
+            self.discovery.set_status("waiting")
     
     def launch_board_selection(self):
         # Create game session
-        self.session = GameSession(self.selected_game, self.network)
+        time_control = DEFAULT_TIME_CONTROLS.get(self.selected_game) if self.timed_game else None
+        self.session = GameSession(self.selected_game, self.network, time_control=time_control)
         
         # Launch board selection in NETWORK MODE
         selector = SquareSelectorUi(self.selected_game, network_mode=True)
@@ -143,22 +176,9 @@ class HostUI(BaseUI):
         if hasattr(selector, 'board') and selector.is_board_filled():
             self.board_selected = True
             
-            # Prepare board according to game type
-            if self.selected_game == 1:  # Katarenga
-                pre_final_board = selector.board_obj.create_final_board(selector.board)
-                final_board = selector.board_obj.add_border_and_corners(pre_final_board)
-                # Place pawns for Katarenga
-                final_board = self._place_pawns_katarenga(final_board)
-                
-            elif self.selected_game == 2:  # Congress
-                # Pour Congress, utiliser directement le plateau 8x8 sans borders
-                final_board = selector.board_obj.create_final_board(selector.board)
-                # Place pawns for Congress
-                final_board = self._place_pawns_congress(final_board)
-                
-            elif self.selected_game == 3:  # Isolation
-                final_board = selector.board_obj.create_final_board(selector.board)
-                # No pawn placement require for Isolation
+            # Starting position of the selected game (border, corners and pawns)
+            pre_final_board = selector.board_obj.create_final_board(selector.board)
+            final_board = get_rules(self.selected_game).setup_board(pre_final_board)
             
             # Send board to client
             self.session.set_board(final_board)
@@ -175,56 +195,13 @@ class HostUI(BaseUI):
         if self.session and self.board_selected:
             # Close host interface BEFORE launching game
             self.running = False
+            if self.discovery:
+                self.discovery.set_status("in_game")
             
             # Create and launch network game adapter
-            network_game = NetworkGameAdapter(self.session)
+            network_game = NetworkGameAdapter(self.session, engine=self.engine_choices[self.engine_index])
             network_game.run()
     
-    def _place_pawns_katarenga(self, board):
-        new_board = copy.deepcopy(board)
-        
-        # First row, columns 1 to 8 (top of the board) - Player 2
-        for col in range(1, 9):
-            if col < len(new_board[0]):
-                color = new_board[1][col] // 10
-                new_board[1][col] = color * 10 + 2  # Player 2
-        
-        # Last row, columns 1 to 8 - Player 1
-        for col in range(1, 9):
-            if col < len(new_board[0]) and len(new_board) > 8:
-                color = new_board[8][col] // 10
-                new_board[8][col] = color * 10 + 1  # Player 1
-        
-        return new_board
-    
-    def _place_pawns_congress(self, board):
-        new_board = copy.deepcopy(board)
-        grid_dim = len(new_board)  # Should be 8 for Congress
-        
-        # Clean board first
-        for i in range(grid_dim):
-            for j in range(grid_dim):
-                color_code = new_board[i][j] // 10
-                new_board[i][j] = color_code * 10
-        
-        # Positions directes pour plateau 8x8 (sans décalage)
-        black_pawns = [(0, 1), (0, 4), (1, 7), (3, 0), (4, 7), (6, 0), (7, 3), (7, 6)]
-        white_pawns = [(0, 3), (0, 6), (1, 0), (3, 7), (4, 0), (6, 7), (7, 1), (7, 4)]
-        
-        # Place black pawns (Player 2)
-        for r, c in black_pawns:
-            if r < grid_dim and c < grid_dim:
-                color = new_board[r][c] // 10
-                new_board[r][c] = color * 10 + 2  # Player 2
-        
-        # Place white pawns (Player 1) 
-        for r, c in white_pawns:
-            if r < grid_dim and c < grid_dim:
-                color = new_board[r][c] // 10
-                new_board[r][c] = color * 10 + 1  # Player 1
-        
-        return new_board
-    
     def draw(self):
         screen = self.get_screen()
         screen.fill((30, 30, 30))
@@ -262,6 +239,19 @@ class HostUI(BaseUI):
         start_text = self.button_font.render("Start Server", True, (255, 255, 255))
         screen.blit(start_text, start_text.get_rect(center=self.start_server_button.center))
         
+        # Clock toggle
+        pygame.draw.rect(screen, (70, 130, 180) if self.timed_game else (70, 70, 70), self.clock_button)
+        pygame.draw.rect(screen, (255, 255, 255), self.clock_button, 2)
+        clock_text = self.button_font.render(f"Clock: {self.get_time_control_label()}", True, (255, 255, 255))
+        screen.blit(clock_text, clock_text.get_rect(center=self.clock_button.center))
+        
+        # Player of the host's side
+        engine = self.engine_choices[self.engine_index]
+        pygame.draw.rect(screen, (70, 130, 180) if engine else (70, 70, 70), self.engine_button)
+        pygame.draw.rect(screen, (255, 255, 255), self.engine_button, 2)
+        engine_text = self.button_font.render(f"Played by: {engine or 'You'}", True, (255, 255, 255))
+        screen.blit(engine_text, engine_text.get_rect(center=self.engine_button.center))
+        
         # Instructions
         if not self.selected_game:
             instruction = "Select a game to host and click 'Start Server'"
@@ -271,6 +261,14 @@ class HostUI(BaseUI):
         inst_surface = self.info_font.render(instruction, True, (200, 200, 200))
         screen.blit(inst_surface, (50, self.info_y))
     
+    def get_time_control_label(self):
+        if not self.timed_game:
+            return "Off"
+        if not self.selected_game:
+            return "On"
+        base, increment = DEFAULT_TIME_CONTROLS[self.selected_game]
+        return f"{base // 60}+{increment}"
+    
     def update(self):
         pass
     
@@ -3,6 +3,7 @@ import pygame
 import threading
 from UI_tools.BaseUi import BaseUI
 from Online.NetworkManager import NetworkManager
+from Online.LanDiscovery import discover_hosts
 from Online.GameSession import GameSession
 from Online.NetworkGameAdapter import NetworkGameAdapter
 
@@ -20,6 +21,7 @@ class JoinUI(BaseUI):
         self.game_started = False
         
         self.ip_text = "127.0.0.1"
+        self.server_port = 5000
         self.ip_active = False
         self.cursor_visible = True
         self.cursor_timer = 0
@@ -27,12 +29,17 @@ class JoinUI(BaseUI):
         self.status_message = ""
         self.status_color = (255, 255, 255)
         
+        # Hosts found on the LAN
+        self.found_hosts = []
+        self.scanning = False
+        
         self.title_font = pygame.font.SysFont(None, 48)
         self.button_font = pygame.font.SysFont(None, 36)
         self.input_font = pygame.font.SysFont(None, 32)
         self.info_font = pygame.font.SysFont(None, 24)
         
         self.setup_ui()
+        self.start_scan()
     
     def setup_ui(self):
         self.title_surface = self.title_font.render("Join a game", True, (255, 255, 255))
@@ -50,6 +57,20 @@ class JoinUI(BaseUI):
         self.start_game_button = pygame.Rect(center_x - 100, center_y + 30, 200, 50)
         
         self.info_y = center_y + 100
+        
+        # LAN games list, on the right of the IP input
+        self.scan_button = pygame.Rect(center_x + 260, center_y - 100, 320, 50)
+        self.host_list_y = center_y - 30
+        self.host_entry_height = 45
+        self.max_listed_hosts = 6
+    
+    def get_host_rects(self):
+        rects = []
+        for i, host in enumerate(self.found_hosts[:self.max_listed_hosts]):
+            rect = pygame.Rect(self.scan_button.x, self.host_list_y + i * (self.host_entry_height + 10),
+                               self.scan_button.width, self.host_entry_height)
+            rects.append((host, rect))
+        return rects
     
     def run(self):
         while self.running:
@@ -86,6 +107,19 @@ class JoinUI(BaseUI):
             # Connection button
             if self.connect_button.collidepoint(pos) and not self.connecting and not self.connected:
                 self.attempt_connection()
+                return
+            
+            # LAN scan and discovered hosts
+            if self.scan_button.collidepoint(pos):
+                self.start_scan()
+                return
+            
+            for host, rect in self.get_host_rects():
+                if rect.collidepoint(pos) and not self.connecting:
+                    self.ip_text = host['ip']
+                    self.server_port = host['port']
+                    self.attempt_connection()
+                    return
         
         # Button to start game
         elif self.board_received and self.start_game_button.collidepoint(pos):
@@ -101,6 +135,21 @@ class JoinUI(BaseUI):
             # Only allow printable characters and limit length for ip adress
             if event.unicode.isdigit() or event.unicode == ".":
                 self.ip_text += event.unicode
+                self.server_port = 5000
+    
+    def start_scan(self):
+        if self.scanning:
+            return
+        
+        self.scanning = True
+        threading.Thread(target=self.scan_lan, daemon=True).start()
+    
+    def scan_lan(self):
+        hosts = discover_hosts()
+        # Joinable games first
+        hosts.sort(key=lambda host: (host['status'] != "waiting", host['name']))
+        self.found_hosts = hosts
+        self.scanning = False
     
     def attempt_connection(self):
         if not self.ip_text.strip():
@@ -114,7 +163,7 @@ class JoinUI(BaseUI):
         threading.Thread(target=self.connect_to_server, daemon=True).start()
     
     def connect_to_server(self):
-        if self.network.connect_to_server(self.ip_text.strip()):
+        if self.network.connect_to_server(self.ip_text.strip(), self.server_port):
             # Connection SUCCESS
             self.connected = True
             self.connecting = False
@@ -237,10 +286,13 @@ class JoinUI(BaseUI):
             status_rect = status_surface.get_rect(centerx=self.get_width() // 2, y=self.info_y)
             screen.blit(status_surface, status_rect)
         
+        self.draw_lan_games(screen)
+        
         # Instructions
         instructions = [
             "Enter the IP address of the server",
             "The address should be shown in the host UI",
+            "or pick a game found on your network",
         ]
         
         for i, instruction in enumerate(instructions):
@@ -248,6 +300,34 @@ class JoinUI(BaseUI):
             inst_rect = inst_surface.get_rect(centerx=self.get_width() // 2, y=self.info_y + 50 + i * 25)
             screen.blit(inst_surface, inst_rect)
     
+    def draw_lan_games(self, screen):
+        scan_color = (100, 100, 100) if self.scanning else (70, 130, 180)
+        pygame.draw.rect(screen, scan_color, self.scan_button)
+        pygame.draw.rect(screen, (255, 255, 255), self.scan_button, 2)
+        
+        scan_text = "Searching..." if self.scanning else "Search LAN games"
+        scan_surface = self.button_font.render(scan_text, True, (255, 255, 255))
+        screen.blit(scan_surface, scan_surface.get_rect(center=self.scan_button.center))
+        
+        if not self.found_hosts and not self.scanning:
+            empty_surface = self.info_font.render("No game found on the network", True, (200, 200, 200))
+            screen.blit(empty_surface, (self.scan_button.x, self.host_list_y))
+            return
+        
+        for host, rect in self.get_host_rects():
+            joinable = host['status'] == "waiting"
+            entry_color = (60, 120, 60) if joinable else (80, 80, 80)
+            pygame.draw.rect(screen, entry_color, rect)
+            pygame.draw.rect(screen, (255, 255, 255), rect, 1)
+            
+            label = f"{host['game_name']} - {host['name']} ({host['ip']})"
+            label_surface = self.info_font.render(label, True, (255, 255, 255))
+            screen.blit(label_surface, (rect.x + 10, rect.y + 5))
+            
+            status_text = "Open" if joinable else host['status'].replace("_", " ").capitalize()
+            status_surface = self.info_font.render(status_text, True, (200, 200, 200))
+            screen.blit(status_surface, (rect.x + 10, rect.y + 24))
+    
     def draw_game_interface(self, screen):
         info_texts = [
             f"Connected to: {self.ip_text}",
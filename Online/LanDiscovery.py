@@ -0,0 +1,125 @@
+# Online/LanDiscovery.py
+import socket
+import threading
+import json
+import time
+
+from Rules.GameRules import GAME_NAMES
+
+DISCOVERY_PORT = 5001
+DISCOVERY_REQUEST = b"KATARENGA_DISCOVER"
+DISCOVERY_REPLY_TYPE = "KATARENGA_HOST"
+
+
+class DiscoveryResponder:
+    # Host side: answers discovery requests broadcast by clients on the LAN
+
+    def __init__(self, game_type, game_port=5000, host_name=None):
+        self.game_type = game_type
+        self.game_port = game_port
+        self.host_name = host_name or socket.gethostname()
+        self.status = "waiting"
+        self.running = False
+        self.socket = None
+
+    def set_status(self, status):
+        # "waiting" while no client is connected, then "full" or "in_game"
+        self.status = status
+
+    def start(self):
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind(('', DISCOVERY_PORT))
+            self.socket.settimeout(0.5)
+        except Exception as e:
+            print(f"LAN discovery unavailable: {e}")
+            self.socket = None
+            return False
+
+        self.running = True
+        threading.Thread(target=self._serve, daemon=True).start()
+        return True
+
+    def _serve(self):
+        while self.running:
+            try:
+                data, address = self.socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except Exception:
+                break
+
+            if data.strip() != DISCOVERY_REQUEST:
+                continue
+
+            reply = {
+                'type': DISCOVERY_REPLY_TYPE,
+                'name': self.host_name,
+                'game_type': self.game_type,
+                'status': self.status,
+                'port': self.game_port
+            }
+            try:
+                self.socket.sendto(json.dumps(reply).encode('utf-8'), address)
+            except Exception:
+                continue
+
+    def stop(self):
+        self.running = False
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+
+def discover_hosts(timeout=1.0):
+    # Client side: broadcasts a discovery request and collects the answers
+    hosts = {}
+
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            s.settimeout(0.2)
+
+            # Loopback is queried too so a host running on this machine is listed
+            for target in ('<broadcast>', '127.0.0.1'):
+                try:
+                    s.sendto(DISCOVERY_REQUEST, (target, DISCOVERY_PORT))
+                except Exception:
+                    continue
+
+            deadline = time.time() + timeout
+            while time.time() < deadline:
+                try:
+                    data, address = s.recvfrom(1024)
+                except socket.timeout:
+                    continue
+
+                try:
+                    reply = json.loads(data.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                if reply.get('type') != DISCOVERY_REPLY_TYPE:
+                    continue
+
+                ip = address[0]
+                port = reply.get('port', 5000)
+                hosts[(ip, port)] = {
+                    'ip': ip,
+                    'port': port,
+                    'name': reply.get('name', ip),
+                    'game_type': reply.get('game_type'),
+                    'game_name': GAME_NAMES.get(reply.get('game_type'), "Unknown"),
+                    'status': reply.get('status', "unknown")
+                }
+    except Exception as e:
+        print(f"LAN discovery failed: {e}")
+
+    # A host answering on both loopback and its LAN address is listed once
+    by_name = {}
+    for host in hosts.values():
+        key = (host['name'], host['port'])
+        if key not in by_name or by_name[key]['ip'] == '127.0.0.1':
+            by_name[key] = host
+
+    return list(by_name.values())
@@ -0,0 +1,279 @@
+# Online/LoadTest.py
+# Headless load test for NetworkManager and GameSession.
+# Each simulated client connects to its own host on localhost and both sides play
+# random legal moves; the run reports throughput, move latency and error counts.
+#
+# Usage: python -m Online.LoadTest --clients 8 --game 1 --rate 20 --duration 30
+import argparse
+import copy
+import random
+import threading
+import time
+
+from Board.Board import Board
+from Online.NetworkManager import NetworkManager
+from Online.GameSession import GameSession
+from Rules.GameRules import GAME_NAMES, get_rules
+
+
+class HeadlessGameSession(GameSession):
+    # Game session without any window, reporting to the match statistics
+
+    record_games = False
+
+    def __init__(self, game_type, network_manager, match):
+        super().__init__(game_type, network_manager)
+        self.match = match
+        self.local_player = 1 if self.is_host else 2
+        self.set_game_callbacks(board_update=self._on_board_update)
+
+    def _on_board_update(self, board):
+        # A board update while the opponent is to move is the arrival of its move
+        if self.game_started and self.current_player != self.local_player:
+            self.match.move_received()
+
+    def _reject_move(self, from_pos, to_pos):
+        self.match.stats.add_error("rejected_moves")
+        super()._reject_move(from_pos, to_pos)
+
+    def _handle_disconnect(self):
+        if not self.game_finished and not self.match.closing:
+            self.match.stats.add_error("disconnects")
+        super()._handle_disconnect()
+
+    def close_all_and_show_win_screen(self, winner):
+        pass
+
+
+class LoadTestStats:
+    # Counters shared by every simulated match
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.moves = 0
+        self.games_started = 0
+        self.games_finished = 0
+        self.games_capped = 0
+        self.errors = {
+            "connection_failures": 0,
+            "rejected_moves": 0,
+            "invalid_local_moves": 0,
+            "disconnects": 0,
+            "stalled_games": 0,
+            "exceptions": 0
+        }
+
+    def add_latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+            self.moves += 1
+
+    def add_error(self, name):
+        with self.lock:
+            self.errors[name] += 1
+
+    def add_game(self, finished, capped):
+        with self.lock:
+            self.games_started += 1
+            if finished:
+                self.games_finished += 1
+            elif capped:
+                self.games_capped += 1
+
+
+def build_board(game_type):
+    # Starting position on the board made of the four default squares
+    board_obj = Board()
+    return get_rules(game_type).setup_board(board_obj.create_final_board(board_obj.get_default_tiles()))
+
+
+def wait_until(condition, timeout):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+class SimulatedMatch(threading.Thread):
+    # One simulated client playing successive games against its own local host
+
+    def __init__(self, index, args, stats, deadline):
+        super().__init__(daemon=True)
+        self.index = index
+        self.args = args
+        self.stats = stats
+        self.deadline = deadline
+        self.port = args.port + index
+        self.rng = random.Random(args.seed + index if args.seed is not None else None)
+        self.board = build_board(args.game)
+
+        self.closing = False
+        self.sent_at = None  # Send time of the move in flight, one move at a time per match
+
+    def move_received(self):
+        sent_at = self.sent_at
+        if sent_at is not None:
+            self.sent_at = None
+            self.stats.add_latency(time.perf_counter() - sent_at)
+
+    def run(self):
+        while time.perf_counter() < self.deadline:
+            try:
+                self.play_game()
+            except Exception as e:
+                print(f"[client {self.index}] {e}")
+                self.stats.add_error("exceptions")
+                time.sleep(0.1)
+
+    def connect(self):
+        host_network = NetworkManager()
+        client_network = NetworkManager()
+
+        if not host_network.start_server(self.port):
+            self.stats.add_error("connection_failures")
+            return None, None
+        if not client_network.connect_to_server('127.0.0.1', self.port):
+            host_network.disconnect()
+            self.stats.add_error("connection_failures")
+            return None, None
+        if not wait_until(lambda: host_network.clients, self.args.timeout):
+            host_network.disconnect()
+            client_network.disconnect()
+            self.stats.add_error("connection_failures")
+            return None, None
+
+        return host_network, client_network
+
+    def play_game(self):
+        host_network, client_network = self.connect()
+        if host_network is None:
+            time.sleep(0.1)
+            return
+
+        self.closing = False
+        client = HeadlessGameSession(self.args.game, client_network, self)
+        host = HeadlessGameSession(self.args.game, host_network, self)
+        sessions = {1: host, 2: client}
+
+        finished = capped = False
+        try:
+            host.set_board(copy.deepcopy(self.board))
+            if not wait_until(lambda: client.board is not None, self.args.timeout):
+                self.stats.add_error("stalled_games")
+                return
+            host.start_game()
+            if not wait_until(lambda: client.game_started, self.args.timeout):
+                self.stats.add_error("stalled_games")
+                return
+
+            plies = 0
+            think_time = 1.0 / self.args.rate if self.args.rate > 0 else 0.0
+            while time.perf_counter() < self.deadline:
+                if host.game_finished or client.game_finished:
+                    finished = True
+                    break
+                if plies >= self.args.max_plies:
+                    capped = True
+                    break
+
+                mover = sessions[host.current_player]
+                # Wait for the mover to have received the previous move
+                if not wait_until(lambda: mover.current_player == mover.local_player
+                                  or mover.game_finished, self.args.timeout):
+                    self.stats.add_error("stalled_games")
+                    break
+                if mover.game_finished:
+                    continue
+
+                legal_moves = mover.state.legal_moves()
+                if not legal_moves:
+                    finished = True
+                    break
+                from_pos, to_pos = self.rng.choice(legal_moves)
+
+                if think_time:
+                    time.sleep(think_time)
+
+                self.sent_at = time.perf_counter()
+                if not mover.make_move(from_pos, to_pos):
+                    self.sent_at = None
+                    self.stats.add_error("invalid_local_moves")
+                    break
+                plies += 1
+
+                # Let the opponent apply the move before the next turn is decided
+                opponent = sessions[3 - mover.local_player]
+                if not wait_until(lambda: opponent.current_player == opponent.local_player
+                                  or opponent.game_finished or mover.game_finished, self.args.timeout):
+                    self.stats.add_error("stalled_games")
+                    break
+        finally:
+            if finished:
+                # Let both sides exchange GAME_END before the connection is closed
+                wait_until(lambda: host.game_finished and client.game_finished, 0.5)
+            self.stats.add_game(finished, capped)
+            self.closing = True
+            client_network.disconnect()
+            host_network.disconnect()
+
+
+def print_report(stats, args, elapsed):
+    latencies = sorted(stats.latencies)
+    throughput = stats.moves / elapsed if elapsed > 0 else 0.0
+
+    print()
+    print(f"Load test: {args.clients} clients, {GAME_NAMES.get(args.game, args.game)}, "
+          f"rate {args.rate if args.rate > 0 else 'unlimited'} moves/s per player, {elapsed:.1f}s")
+    print(f"Games: {stats.games_started} played, {stats.games_finished} finished, "
+          f"{stats.games_capped} stopped at {args.max_plies} plies")
+    print(f"Moves: {stats.moves} delivered, throughput {throughput:.1f} moves/s")
+    if latencies:
+        print(f"Move latency: p50 {percentile(latencies, 50) * 1000:.2f} ms, "
+              f"p99 {percentile(latencies, 99) * 1000:.2f} ms, "
+              f"max {latencies[-1] * 1000:.2f} ms")
+    total_errors = sum(stats.errors.values())
+    print(f"Errors: {total_errors}")
+    for name, count in stats.errors.items():
+        print(f"  {name.replace('_', ' ')}: {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless load test for the network stack")
+    parser.add_argument("--clients", type=int, default=4, help="number of simulated clients")
+    parser.add_argument("--game", type=int, choices=[1, 2, 3], default=1,
+                        help="1=Katarenga, 2=Congress, 3=Isolation")
+    parser.add_argument("--rate", type=float, default=10.0,
+                        help="moves per second for each player, 0 for no think time")
+    parser.add_argument("--duration", type=float, default=10.0, help="test duration in seconds")
+    parser.add_argument("--max-plies", type=int, default=200, help="plies before a game is abandoned")
+    parser.add_argument("--port", type=int, default=5100, help="first host port, one port per client")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds before a game counts as stalled")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible runs")
+    args = parser.parse_args()
+
+    stats = LoadTestStats()
+    start = time.perf_counter()
+    deadline = start + args.duration
+
+    matches = [SimulatedMatch(i, args, stats, deadline) for i in range(args.clients)]
+    for match in matches:
+        match.start()
+    for match in matches:
+        match.join(args.duration + args.timeout * 2 + 5)
+
+    print_report(stats, args, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,16 @@
 import pygame 
 import copy
 from UI_tools.BaseUi import BaseUI
-from Board.Board_draw_tools import Board_draw_tools
-from Game_ui.move_rules import Moves_rules
 from UI_tools.win_screen import WinScreen
 
 from Game_ui.Katarenga import Katarenga
 from Game_ui.Congress import Congress
 from Game_ui.Isolation import Isolation
+from AI.EngineProcess import EnginePlayer
 
 class NetworkGameAdapter(BaseUI):
     
-    def __init__(self, game_session, title="Network Game"):
+    def __init__(self, game_session, title="Network Game", engine=None):
         super().__init__(title)
         
         # Network game session
@@ -29,6 +28,12 @@ class NetworkGameAdapter(BaseUI):
         self.game_finished = False
         self.status_message = ""
         self.status_color = (255, 255, 255)
+        self.hud_font = pygame.font.SysFont(None, 36)
+        self.info_font = pygame.font.SysFont(None, 26)
+        
+        # Engine playing the local side instead of the user (name from engines.json)
+        self.engine_name = engine
+        self.ai_player = None
         
         # Set up callbacks
         self.session.set_game_callbacks(
@@ -38,10 +43,13 @@ class NetworkGameAdapter(BaseUI):
         )
     
     def _create_game_instance(self):
+        # Only used to draw the board, rules come from the session's game state
         ai_disabled = False
         
         if self.game_type == 1:
-            return Katarenga(ai_disabled, self.board)
+            katarenga_instance = Katarenga(ai_disabled, self.board)
+            katarenga_instance.board = self.board
+            return katarenga_instance
         elif self.game_type == 2:
             # For Congress, we use the original file but configure network mode
             congress_instance = Congress(ai_disabled, self.board)
@@ -52,7 +60,9 @@ class NetworkGameAdapter(BaseUI):
             congress_instance.set_network_mode(True, victory_callback=self._handle_local_victory)
             return congress_instance
         elif self.game_type == 3:
-            return Isolation(ai_disabled, self.board)
+            isolation_instance = Isolation(ai_disabled, self.board)
+            isolation_instance.board = self.board
+            return isolation_instance
         else:
             raise ValueError(f"Unknown game type: {self.game_type}")
     
@@ -73,6 +83,8 @@ class NetworkGameAdapter(BaseUI):
         return base_board
     
     def run(self):
+        if self.engine_name:
+            self.ai_player = EnginePlayer(self.engine_name)
         self.session.start_game()
         
         while self.running and not self.game_finished:
@@ -82,6 +94,10 @@ class NetworkGameAdapter(BaseUI):
             pygame.display.flip()
             self.clock.tick(60)
         
+        if self.ai_player:
+            self.ai_player.close()
+            self.ai_player = None
+        
         # Wait for user to close window after game ends
         if self.game_finished:
             waiting_for_close = True
@@ -115,6 +131,10 @@ class NetworkGameAdapter(BaseUI):
                 self.running = False
                 return
         
+        # The engine plays the local side
+        if self.ai_player:
+            return
+        
         # Check if it's the player's turn for game moves
         if self.current_player != self.local_player:
             self.set_status("It's not your turn", (255, 255, 100))
@@ -263,3 +283,82 @@ class NetworkGameAdapter(BaseUI):
         else:
             self.set_status("You lose! Press Escape to quit", (255, 100, 100))
             WinScreen(f"Player {3 - self.local_player}")
+    
+    def set_status(self, message, color):
+        self.status_message = message
+        self.status_color = color
+    
+    def update(self):
+        # Keep the game screen in sync with the session so it draws the right state
+        self.game_instance.current_player = self.current_player
+        if self.session.state:
+            self.game_instance.board_version = self.session.state.version  # Move hints cache
+        if hasattr(self.game_instance, 'selected_pawn'):
+            self.game_instance.selected_pawn = self.selected_pawn
+        
+        if self.ai_player and self.session.game_started and not self.game_finished:
+            self.play_engine_move()
+    
+    def play_engine_move(self):
+        if self.session.current_player != self.local_player:
+            return
+        
+        move = self.ai_player.get_move(self.session.board, self.game_type, self.local_player)
+        if move is None:
+            return  # Still thinking
+        
+        # Refused if the position changed meanwhile: the engine is asked again next frame
+        if self.session.make_move(*move):
+            self.set_status("Engine moved", (100, 255, 100))
+            self.ai_player.ponder(self.session.board, self.game_type, 3 - self.local_player)
+    
+    def draw(self):
+        # Board and pawns are drawn by the game screen, the network HUD on top of it
+        self.game_instance.draw()
+        screen = self.get_screen()
+        
+        if self.status_message:
+            status_surface = self.hud_font.render(self.status_message, True, self.status_color)
+            screen.blit(status_surface, status_surface.get_rect(centerx=self.get_width() // 2, y=self.get_height() - 60))
+        
+        self.draw_clocks(screen)
+        self.draw_game_info(screen)
+    
+    def draw_game_info(self, screen):
+        # One line of position statistics under the back button
+        info = self.session.get_game_info()
+        if not info:
+            return
+        
+        mine, theirs = self.local_player, 3 - self.local_player
+        if self.game_type == 1:
+            text = f"Pawns: you {info[f'player{mine}_pieces']}, opponent {info[f'player{theirs}_pieces']}"
+        elif self.game_type == 2:
+            groups = info['connectivity']
+            text = (f"Groups: you {groups[f'player_{mine}']['connected_components']}, "
+                    f"opponent {groups[f'player_{theirs}']['connected_components']}")
+        else:
+            text = f"Safe squares: {info['valid_moves_count']}"
+        
+        surface = self.info_font.render(text, True, (220, 220, 220))
+        screen.blit(surface, (20, 72))
+    
+    def draw_clocks(self, screen):
+        clocks = self.session.get_clocks()
+        if not clocks:
+            return
+        
+        x = self.get_width() - 240
+        for i, player in enumerate((1, 2)):
+            remaining = clocks[player]
+            minutes, seconds = divmod(int(remaining + 0.999), 60)
+            label = f"{'You' if player == self.local_player else 'Opponent'}  {minutes}:{seconds:02d}"
+            
+            rect = pygame.Rect(x, 20 + i * 50, 220, 40)
+            active = player == self.current_player and not self.game_finished
+            pygame.draw.rect(screen, (70, 70, 70) if active else (40, 40, 40), rect)
+            pygame.draw.rect(screen, (255, 255, 255) if active else (120, 120, 120), rect, 2)
+            
+            color = (255, 100, 100) if remaining < 10 else (255, 255, 255)
+            text = self.hud_font.render(label, True, color)
+            screen.blit(text, text.get_rect(center=rect.center))
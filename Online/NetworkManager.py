@@ -6,6 +6,9 @@ import time
 
 class NetworkManager:
     
+    # Local interface address, resolved once per process
+    _local_ip = None
+    
     def __init__(self):
         self.is_host = False
         self.is_connected = False
@@ -14,6 +17,10 @@ class NetworkManager:
         self.clients = []
         self.message_callback = None
         self.disconnect_callback = None
+        self.send_lock = threading.Lock()  # Messages from several threads must not interleave
+        
+        if NetworkManager._local_ip is None:
+            NetworkManager._local_ip = self._detect_local_ip()
         
     def set_callbacks(self, message_callback=None, disconnect_callback=None):
         self.message_callback = message_callback
@@ -55,14 +62,21 @@ class NetworkManager:
                     print(f"Error accepting client: {e}")
                 break
     
+    def _dispatch_messages(self, buffer):
+        # Messages are newline delimited: a recv may hold several of them or only a part of one
+        while b'\n' in buffer:
+            line, buffer = buffer.split(b'\n', 1)
+            if line and self.message_callback:
+                self.message_callback(line.decode('utf-8'))
+        return buffer
+    
     def _listen_client(self, client_socket):
+        buffer = b''
         while self.is_connected:
             try:
-                data = client_socket.recv(1024)
+                data = client_socket.recv(4096)
                 if data:
-                    message = data.decode('utf-8')
-                    if self.message_callback:
-                        self.message_callback(message)
+                    buffer = self._dispatch_messages(buffer + data)
                 else:
                     break
                     
@@ -97,13 +111,12 @@ class NetworkManager:
             return False
         
     def _listen_server(self):
+        buffer = b''
         while self.is_connected:
             try:
-                data = self.socket.recv(1024)
+                data = self.socket.recv(4096)
                 if data:
-                    message = data.decode('utf-8')
-                    if self.message_callback:
-                        self.message_callback(message)
+                    buffer = self._dispatch_messages(buffer + data)
                 else:
                     break
                     
@@ -120,14 +133,16 @@ class NetworkManager:
         if not self.is_connected:
             return False
         
+        data = (message + '\n').encode('utf-8')
         try:
-            if self.is_host:
-                # Send to all clients
-                for client in self.clients:
-                    client.send(message.encode('utf-8'))
-            else:
-                # Send to server
-                self.socket.send(message.encode('utf-8'))
+            with self.send_lock:
+                if self.is_host:
+                    # Send to all clients
+                    for client in self.clients:
+                        client.sendall(data)
+                else:
+                    # Send to server
+                    self.socket.sendall(data)
             return True
             
         except Exception as e:
@@ -151,13 +166,26 @@ class NetworkManager:
         
         #print("Disconnected")
     
-    def get_local_ip(self):
+    def _detect_local_ip(self):
+        # Routing lookup only, no packet is sent
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
                 s.connect(('8.8.8.8', 80))
                 return s.getsockname()[0]
-        except:
-            return '127.0.0.1'
+        except OSError:
+            pass
+        
+        # Offline: fall back to the address bound to the host name
+        try:
+            ip = socket.gethostbyname(socket.gethostname())
+            if ip:
+                return ip
+        except OSError:
+            pass
+        return '127.0.0.1'
+    
+    def get_local_ip(self):
+        return NetworkManager._local_ip
     
     def get_status(self):
         return {
@@ -0,0 +1,72 @@
+# Rules/CongressRules.py
+# Congress: 8x8 board, eight pawns each. Pawns move like the piece of the tile they
+# stand on but only to empty squares (no captures). A player wins as soon as all of
+# their pawns form a single group connected orthogonally.
+from collections import deque
+from Rules.Connectivity import ConnectivityTracker
+from Rules.GameRules import GameRules, clear_pawns, pawn_positions, piece_targets
+
+BLACK_PAWNS = ((0, 1), (0, 4), (1, 7), (3, 0), (4, 7), (6, 0), (7, 3), (7, 6))  # Player 2
+WHITE_PAWNS = ((0, 3), (0, 6), (1, 0), (3, 7), (4, 0), (6, 7), (7, 1), (7, 4))  # Player 1
+
+
+class CongressRules(GameRules):
+    game_type = 2
+    name = "Congress"
+    size = 8
+
+    def setup_board(self, board):
+        board = clear_pawns(board)
+        for player, pawns in ((2, BLACK_PAWNS), (1, WHITE_PAWNS)):
+            for r, c in pawns:
+                board[r][c] = board[r][c] // 10 * 10 + player
+        return board
+
+    def legal_moves(self, board, player):
+        moves = []
+        for from_pos in pawn_positions(board, player):
+            for r, c in piece_targets(board, *from_pos):
+                if board[r][c] % 10 == 0:
+                    moves.append((from_pos, (r, c)))
+        return moves
+
+    def is_legal(self, board, player, from_pos, to_pos):
+        if from_pos is None:
+            return False
+        from_row, from_col = from_pos
+        if not (0 <= from_row < 8 and 0 <= from_col < 8) or board[from_row][from_col] % 10 != player:
+            return False
+        to_row, to_col = to_pos
+        return (to_row, to_col) in piece_targets(board, from_row, from_col) and board[to_row][to_col] % 10 == 0
+
+    def components(self, board, player):
+        # Number of orthogonally connected groups of the player's pawns
+        size = len(board)
+        seen = set()
+        groups = 0
+        for start in pawn_positions(board, player):
+            if start in seen:
+                continue
+            groups += 1
+            seen.add(start)
+            queue = deque([start])
+            while queue:
+                x, y = queue.popleft()
+                for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                    if (0 <= nx < size and 0 <= ny < size and (nx, ny) not in seen
+                            and board[nx][ny] % 10 == player):
+                        seen.add((nx, ny))
+                        queue.append((nx, ny))
+        return groups
+
+    def is_connected(self, board, player):
+        return self.components(board, player) == 1
+
+    def tracker(self, board):
+        return ConnectivityTracker(board)
+
+    def victory(self, board, mover, tracker=None):
+        for player in (1, 2):
+            if tracker.is_connected(player) if tracker else self.is_connected(board, player):
+                return player
+        return None
@@ -0,0 +1,110 @@
+# Rules/Connectivity.py
+# Orthogonally connected groups of each player's pawns, kept up to date move by move
+# (Congress victory: all of a player's pawns in one group).
+#
+# A pawn arriving merges the groups around it into the biggest one (the smaller ones are
+# relabelled). A pawn leaving can split its group: only that group is flooded again, and
+# only if the pawn had two neighbours of its own or more (a leaf never disconnects
+# anything). Group counts are then read in constant time.
+
+
+class ConnectivityTracker:
+    def __init__(self, board):
+        rows, cols = len(board), len(board[0])
+        self.cols = cols
+        self.owner = [board[r][c] % 10 for r in range(rows) for c in range(cols)]
+        self.label = [-1] * (rows * cols)
+        self.members = {}  # Group id -> set of cell indexes
+        self.groups = {1: 0, 2: 0}
+        self.pawns = {1: 0, 2: 0}
+        self.next_label = 0
+        self.neighbours = []
+        for r in range(rows):
+            for c in range(cols):
+                self.neighbours.append(tuple((nr * cols + nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                                             if 0 <= nr < rows and 0 <= nc < cols))
+
+        for index, player in enumerate(self.owner):
+            if player and self.label[index] == -1:
+                self._flood(index, player, None)
+            if player:
+                self.pawns[player] += 1
+
+    def _new_group(self, player, cells):
+        label = self.next_label
+        self.next_label += 1
+        self.members[label] = cells
+        for index in cells:
+            self.label[index] = label
+        self.groups[player] += 1
+
+    def _flood(self, start, player, allowed):
+        # New group of the pawns reachable from start (within allowed, if given)
+        cells = {start}
+        stack = [start]
+        owner, neighbours = self.owner, self.neighbours
+        while stack:
+            for index in neighbours[stack.pop()]:
+                if index not in cells and owner[index] == player and (allowed is None or index in allowed):
+                    cells.add(index)
+                    stack.append(index)
+        self._new_group(player, cells)
+        return cells
+
+    def _add(self, index, player):
+        self.owner[index] = player
+        self.pawns[player] += 1
+        around = {self.label[n] for n in self.neighbours[index] if self.owner[n] == player}
+        if not around:
+            self._new_group(player, {index})
+            return
+        # The biggest group around takes the new pawn and the other groups
+        target = max(around, key=lambda label: len(self.members[label]))
+        cells = self.members[target]
+        for label in around:
+            if label != target:
+                for cell in self.members.pop(label):
+                    self.label[cell] = target
+                    cells.add(cell)
+        cells.add(index)
+        self.label[index] = target
+        self.groups[player] -= len(around) - 1
+
+    def _remove(self, index, player):
+        label = self.label[index]
+        cells = self.members.pop(label)
+        cells.discard(index)
+        self.owner[index] = 0
+        self.label[index] = -1
+        self.pawns[player] -= 1
+        self.groups[player] -= 1
+
+        own = [n for n in self.neighbours[index] if self.owner[n] == player]
+        if not cells:
+            return
+        if len(own) < 2:
+            self.members[label] = cells
+            self.groups[player] += 1
+            return
+        # The group may have split: flood it again from each former neighbour
+        left = set(cells)
+        for start in own:
+            if start in left:
+                left -= self._flood(start, player, cells)
+
+    def change(self, row, col, old, new):
+        # The cell's value went from old to new (board encoding)
+        old, new = old % 10, new % 10
+        if old == new:
+            return
+        index = row * self.cols + col
+        if old:
+            self._remove(index, old)
+        if new:
+            self._add(index, new)
+
+    def components(self, player):
+        return self.groups[player]
+
+    def is_connected(self, player):
+        return self.groups[player] == 1
@@ -0,0 +1,213 @@
+# Rules/GameRecord.py
+# Binary record of a game, written move by move while it is played (append only, so a
+# game cut short still leaves a readable record).
+#
+# Layout: a 21-byte header (magic, game type, rows, cols, snapshot interval K, first
+# player, start time), the starting board (one byte per cell, usual encoding), then one
+# 2-byte entry per move (GameRules.move_to_code), with after every K moves a
+# snapshot of the board (rows * cols bytes). Players alternate, so the player of each
+# move is known from its ply. Every entry has a fixed size, so the offset of any move or
+# snapshot is computed, and the position at any ply is the snapshot before it plus at
+# most K - 1 moves replayed.
+#
+# Usage: python -m Rules.GameRecord records/Katarenga_20250101-120000.ktr [--ply 12]
+import argparse
+import mmap
+import os
+import struct
+import time
+
+from Rules.GameRules import GAME_NAMES, code_to_move, move_to_code
+from Rules.GameState import GameState
+
+RECORDS_DIR = "records"
+EXTENSION = ".ktr"
+MAGIC = b"KTREC001"
+HEADER = struct.Struct("<8sBBBBBd")
+MOVE = struct.Struct("<H")
+SNAPSHOT_INTERVAL = 16
+
+
+def record_filename(game_type, directory=RECORDS_DIR):
+    # New file name in the records directory, from the game and the time
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    name = os.path.join(directory, f"{GAME_NAMES[game_type]}_{stamp}{EXTENSION}")
+    index = 1
+    while os.path.exists(name):
+        index += 1
+        name = os.path.join(directory, f"{GAME_NAMES[game_type]}_{stamp}_{index}{EXTENSION}")
+    return name
+
+
+def list_records(directory=RECORDS_DIR):
+    # Record files, newest first
+    if not os.path.isdir(directory):
+        return []
+    names = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(EXTENSION)]
+    return sorted(names, key=os.path.getmtime, reverse=True)
+
+
+class _Layout:
+    # Offsets of the entries of a record
+    def __init__(self, rows, cols, interval):
+        self.cells = rows * cols
+        self.interval = interval
+        self.start = HEADER.size + self.cells
+
+    def move_offset(self, ply):
+        # Move played at ply (0 = first move), after the snapshots of the plies before
+        return self.start + ply * MOVE.size + (ply // self.interval) * self.cells
+
+    def snapshot_offset(self, ply):
+        # Snapshot of the board at ply, a multiple of the interval (> 0)
+        return self.move_offset(ply) - self.cells
+
+    def size(self, plies):
+        return self.move_offset(plies)
+
+    def plies(self, size):
+        # Number of complete moves in a file of that size
+        block = self.interval * MOVE.size + self.cells
+        blocks, rest = divmod(max(0, size - self.start), block)
+        return blocks * self.interval + min(rest // MOVE.size, self.interval)
+
+
+class GameRecorder:
+    def __init__(self, filename, game_type, board, first_player=1, interval=SNAPSHOT_INTERVAL):
+        self.filename = filename
+        self.layout = _Layout(len(board), len(board[0]), interval)
+        self.plies = 0
+        self.file = open(filename, "wb")
+        self.file.write(HEADER.pack(MAGIC, game_type, len(board), len(board[0]), interval, first_player, time.time()))
+        self.file.write(self._board_bytes(board))
+        self.file.flush()
+
+    @classmethod
+    def start(cls, game_type, board, first_player=1):
+        # Recorder of a new game in the records directory, or None if it cannot be written
+        try:
+            return cls(record_filename(game_type), game_type, board, first_player)
+        except OSError as e:
+            print(f"Game not recorded: {e}")
+            return None
+
+    def _board_bytes(self, board):
+        return bytes(value for row in board for value in row)
+
+    def add_move(self, from_pos, to_pos, board):
+        # board: the position after the move
+        data = MOVE.pack(move_to_code((from_pos, to_pos)))
+        self.plies += 1
+        if self.plies % self.layout.interval == 0:
+            data += self._board_bytes(board)
+        try:
+            self.file.write(data)
+            self.file.flush()
+        except (OSError, ValueError) as e:
+            print(f"Error writing game record: {e}")
+
+    def truncate(self, plies):
+        # Forget the moves from ply on (a move taken back, e.g. refused by the host)
+        if plies < self.plies:
+            self.plies = plies
+            self.file.truncate(self.layout.size(plies))
+            self.file.seek(0, os.SEEK_END)
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class GameRecord:
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"Not a game record: {filename}")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.game_type, self.rows, self.cols, interval, self.first_player, self.started = \
+            HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or self.game_type not in GAME_NAMES or interval == 0:
+            self.map.close()
+            raise ValueError(f"Not a game record: {filename}")
+        self.layout = _Layout(self.rows, self.cols, interval)
+        if len(self.map) < self.layout.start:
+            self.map.close()
+            raise ValueError(f"Truncated game record: {filename}")
+        self.plies = self.layout.plies(len(self.map))
+
+    def __len__(self):
+        return self.plies
+
+    def _board(self, offset):
+        data = self.map[offset:offset + self.layout.cells]
+        return [list(data[r * self.cols:(r + 1) * self.cols]) for r in range(self.rows)]
+
+    def player(self, ply):
+        # Player to move at ply
+        return self.first_player if ply % 2 == 0 else 3 - self.first_player
+
+    def move(self, ply):
+        # Move played at ply, as (from_pos, to_pos)
+        if not 0 <= ply < self.plies:
+            raise IndexError(ply)
+        return code_to_move(MOVE.unpack_from(self.map, self.layout.move_offset(ply))[0])
+
+    def moves(self):
+        for ply in range(self.plies):
+            yield self.move(ply)
+
+    def board(self, ply):
+        # Board at ply (0 = start): nearest snapshot, then the moves after it
+        if not 0 <= ply <= self.plies:
+            raise IndexError(ply)
+        return self.state(ply).board
+
+    def state(self, ply):
+        # GameState at ply; its winner is set if the game ended with the move before
+        if not 0 <= ply <= self.plies:
+            raise IndexError(ply)
+        base = ply - ply % self.layout.interval
+        if base and self.layout.snapshot_offset(base) + self.layout.cells > len(self.map):
+            base -= self.layout.interval  # Last snapshot cut short (the game was interrupted)
+        if base:
+            board = self._board(self.layout.snapshot_offset(base))
+        else:
+            board = self._board(HEADER.size)
+        state = GameState(self.game_type, board, self.player(base))
+        for index in range(base, ply):
+            state.apply(*self.move(index))
+        return state
+
+    def close(self):
+        self.map.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a game record")
+    parser.add_argument("record", nargs="?", help="record file (default: the newest one)")
+    parser.add_argument("--ply", type=int, help="print the board at this ply")
+    args = parser.parse_args()
+
+    filename = args.record or next(iter(list_records()), None)
+    if filename is None:
+        parser.error(f"no record in {RECORDS_DIR}/")
+    record = GameRecord(filename)
+    print(f"{filename}: {GAME_NAMES[record.game_type]}, {len(record)} moves, "
+          f"started {time.strftime('%Y-%m-%d %H:%M', time.localtime(record.started))}")
+    if args.ply is None:
+        for ply, (from_pos, to_pos) in enumerate(record.moves()):
+            print(f"  {ply + 1:3d}. player {record.player(ply)}: {from_pos or 'place'} -> {to_pos}")
+        winner = record.state(len(record)).winner
+        if winner:
+            print(f"Winner: player {winner}")
+    else:
+        for row in record.board(args.ply):
+            print(" ".join(f"{value:2d}" for value in row))
+    record.close()
+
+
+if __name__ == "__main__":
+    main()
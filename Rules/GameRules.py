@@ -0,0 +1,156 @@
+# Rules/GameRules.py
+# Pure-Python rules of the three games, shared by the game screens, the network
+# sessions, the AIs and the tools. Nothing here imports pygame, so the rules can be
+# used headless and load in a few milliseconds.
+#
+# Boards use the usual encoding: tile color * 10 + player (0 = no pawn), 0 for the
+# Katarenga border and 50/60 for its corners. Moves are (from_pos, to_pos) tuples,
+# from_pos is None for Isolation placements.
+
+GAME_NAMES = {1: "Katarenga", 2: "Congress", 3: "Isolation"}
+
+# Tile colors
+BLUE = 1    # King: one step in any direction
+GREEN = 2   # Knight: L-shaped jump
+YELLOW = 3  # Bishop: diagonals, stopped by yellow tiles
+RED = 4     # Rook: straight lines, stopped by red tiles
+
+KING_STEPS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+KNIGHT_STEPS = ((2, 1), (1, 2), (-1, 2), (-2, 1), (-2, -1), (-1, -2), (1, -2), (2, -1))
+DIAGONALS = ((-1, -1), (-1, 1), (1, -1), (1, 1))
+LINES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _ray_targets(board, row, col, player, directions, blocking_color, targets):
+    rows, cols = len(board), len(board[0])
+    for dr, dc in directions:
+        r, c = row + dr, col + dc
+        while 0 <= r < rows and 0 <= c < cols:
+            value = board[r][c]
+            if value != 0 and value % 10 != player:
+                targets.append((r, c))
+            # Pawns and tiles of the piece's own color stop the line
+            if value % 10 != 0 or value // 10 == blocking_color:
+                break
+            r, c = r + dr, c + dc
+
+
+def _step_targets(board, row, col, player, steps, targets):
+    rows, cols = len(board), len(board[0])
+    for dr, dc in steps:
+        r, c = row + dr, col + dc
+        if 0 <= r < rows and 0 <= c < cols:
+            value = board[r][c]
+            if value != 0 and value % 10 != player:
+                targets.append((r, c))
+
+
+def piece_targets(board, row, col):
+    # Squares the piece on (row, col) may move to with the move of its tile:
+    # empty or enemy squares, never the border (0); a pawn in a corner cannot move
+    value = board[row][col]
+    color, player = value // 10, value % 10
+    targets = []
+    if color == BLUE:
+        _step_targets(board, row, col, player, KING_STEPS, targets)
+    elif color == GREEN:
+        _step_targets(board, row, col, player, KNIGHT_STEPS, targets)
+    elif color == YELLOW:
+        _ray_targets(board, row, col, player, DIAGONALS, YELLOW, targets)
+    elif color == RED:
+        _ray_targets(board, row, col, player, LINES, RED, targets)
+    return targets
+
+
+def move_to_code(move):
+    # 16-bit code of a move: from square * 128 + to square, squares as row * 10 + col
+    # and 127 as the from square of a placement
+    from_pos, to_pos = move
+    from_index = 127 if from_pos is None else from_pos[0] * 10 + from_pos[1]
+    return from_index * 128 + to_pos[0] * 10 + to_pos[1]
+
+
+def code_to_move(code):
+    from_index, to_index = divmod(code, 128)
+    from_pos = None if from_index == 127 else divmod(from_index, 10)
+    return from_pos, divmod(to_index, 10)
+
+
+def pawn_positions(board, player):
+    return [(r, c) for r, row in enumerate(board) for c, value in enumerate(row) if value % 10 == player]
+
+
+def clear_pawns(board):
+    return [[value // 10 * 10 for value in row] for row in board]
+
+
+class GameRules:
+    # Base class of the rules of one game type; rules objects hold no game state
+
+    game_type = None
+    name = None
+
+    def setup_board(self, board):
+        # Starting position built from a board of tiles (pawns already on it are removed)
+        raise NotImplementedError
+
+    def legal_moves(self, board, player):
+        raise NotImplementedError
+
+    def is_legal(self, board, player, from_pos, to_pos):
+        from_pos = tuple(from_pos) if from_pos is not None else None
+        return (from_pos, tuple(to_pos)) in self.legal_moves(board, player)
+
+    def apply_move(self, board, player, from_pos, to_pos):
+        # Plays the move and returns what undo_move needs to take it back
+        to_row, to_col = to_pos
+        record = [(to_row, to_col, board[to_row][to_col])]
+        if from_pos is not None:
+            from_row, from_col = from_pos
+            record.append((from_row, from_col, board[from_row][from_col]))
+            board[from_row][from_col] = board[from_row][from_col] // 10 * 10
+        board[to_row][to_col] = board[to_row][to_col] // 10 * 10 + player
+        return record
+
+    def undo_move(self, board, record):
+        for row, col, value in reversed(record):
+            board[row][col] = value
+
+    def tracker(self, board):
+        # Object kept up to date with the board through its change(row, col, old, new),
+        # making victory() cheap (see GameState); None if the game needs none
+        return None
+
+    def victory(self, board, mover, tracker=None):
+        # Winner by the game's own winning condition after mover's move, or None
+        return None
+
+    def winner(self, board, mover, tracker=None):
+        # Full end-of-game check after mover's move: the game's winning condition,
+        # or the opponent being left without any legal move
+        winner = self.victory(board, mover, tracker)
+        if winner is None and not self.legal_moves(board, 3 - mover):
+            winner = mover
+        return winner
+
+
+_rules = {}
+
+
+def get_rules(game_type):
+    # Shared rules object of a game type (1=Katarenga, 2=Congress, 3=Isolation)
+    rules = _rules.get(game_type)
+    if rules is None:
+        if game_type == 1:
+            from Rules.KatarengaRules import KatarengaRules
+            rules = KatarengaRules()
+        elif game_type == 2:
+            from Rules.CongressRules import CongressRules
+            rules = CongressRules()
+        elif game_type == 3:
+            from Rules.IsolationRules import IsolationRules
+            rules = IsolationRules()
+        else:
+            raise ValueError(f"Unknown game type: {game_type}")
+        _rules[game_type] = rules
+    return rules
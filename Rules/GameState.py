@@ -0,0 +1,114 @@
+# Rules/GameState.py
+# A game in progress: board, player to move and winner, with apply/undo.
+# The board list is used in place (not copied), so screens and sessions holding a
+# reference to it always see the current position.
+from Rules.GameRules import get_rules
+from Rules.Zobrist import PLAYER_2_KEY, board_hash, square_key
+
+
+class GameState:
+    def __init__(self, game_type, board, current_player=1):
+        self.game_type = game_type
+        self.rules = get_rules(game_type)
+        self.board = board
+        self.current_player = current_player
+        self.winner = None
+        self.ply = 0
+        self.version = 0  # Changes with every move, for caches keyed on the position
+        self.hash = board_hash(board, game_type, current_player)  # Zobrist key, kept up to date
+        self.tracker = self.rules.tracker(board)  # Game-specific victory data, kept up to date
+        self._history = []
+        self._legal_moves = None
+        self._legal_set = None
+
+    @classmethod
+    def new_game(cls, game_type, board):
+        # Starting position of the game on a board of tiles
+        return cls(game_type, get_rules(game_type).setup_board(board))
+
+    def _changed(self):
+        self.version += 1
+        self._legal_moves = None
+        self._legal_set = None
+
+    def set_position(self, board, current_player, winner=None):
+        # Replace the position, e.g. with the one sent by the host
+        self.board = board
+        self.current_player = current_player
+        self.winner = winner
+        self.hash = board_hash(board, self.game_type, current_player)
+        self.tracker = self.rules.tracker(board)
+        self._history.clear()
+        self._changed()
+
+    def legal_moves(self):
+        if self._legal_moves is None:
+            self._legal_moves = [] if self.winner else self.rules.legal_moves(self.board, self.current_player)
+        return self._legal_moves
+
+    def is_legal(self, from_pos, to_pos):
+        if self._legal_set is None:
+            self._legal_set = frozenset(self.legal_moves())
+        from_pos = tuple(from_pos) if from_pos is not None else None
+        return (from_pos, tuple(to_pos)) in self._legal_set
+
+    def apply(self, from_pos, to_pos):
+        # Plays a move (assumed legal) for the player to move and returns the winner, if any
+        from_pos = tuple(from_pos) if from_pos is not None else None
+        to_pos = tuple(to_pos)
+        mover = self.current_player
+        record = self.rules.apply_move(self.board, mover, from_pos, to_pos)
+        self._history.append((record, mover, self.winner, (from_pos, to_pos), self.hash))
+        self.ply += 1
+        self._changed()
+
+        h = self.hash
+        tracker = self.tracker
+        for row, col, old in record:
+            new = self.board[row][col]
+            h ^= square_key(row, col, old) ^ square_key(row, col, new)
+            if tracker:
+                tracker.change(row, col, old, new)
+
+        winner = self.rules.victory(self.board, mover, tracker)
+        if winner is None:
+            self.current_player = 3 - mover
+            # The opponent's moves are needed next anyway, so this check is free
+            if not self.legal_moves():
+                winner = mover
+        if winner:
+            # The game is over: the winning move's player stays the current player
+            self.current_player = mover
+            self._legal_moves = []
+            self._legal_set = None
+        else:
+            h ^= PLAYER_2_KEY
+        self.hash = h
+        self.winner = winner
+        return winner
+
+    def undo(self):
+        record, mover, winner, _, h = self._history.pop()
+        if self.tracker:
+            for row, col, old in reversed(record):
+                self.tracker.change(row, col, self.board[row][col], old)
+        self.rules.undo_move(self.board, record)
+        self.current_player = mover
+        self.winner = winner
+        self.hash = h
+        self.ply -= 1
+        self._changed()
+
+    def last_move(self):
+        return self._history[-1][3] if self._history else None
+
+    def copy(self):
+        state = GameState(self.game_type, [row[:] for row in self.board], self.current_player)
+        state.winner = self.winner
+        state.ply = self.ply
+        state.hash = self.hash
+        return state
+
+    def key(self):
+        # Hashable identity of the position (board and player to move)
+        return (self.game_type, self.current_player, tuple(tuple(row) for row in self.board))
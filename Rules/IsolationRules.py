@@ -0,0 +1,43 @@
+# Rules/IsolationRules.py
+# Isolation: 8x8 board, no pawns at the start. Each turn the player places a pawn on
+# an empty square that no pawn on the board (of either side) could move to. The
+# player who leaves the opponent without any such square wins.
+from Rules.GameRules import GameRules, clear_pawns, piece_targets
+
+
+class IsolationRules(GameRules):
+    game_type = 3
+    name = "Isolation"
+    size = 8
+
+    def setup_board(self, board):
+        return clear_pawns(board)
+
+    def attacked_squares(self, board):
+        attacked = set()
+        for r, row in enumerate(board):
+            for c, value in enumerate(row):
+                if value % 10 != 0:
+                    attacked.update(piece_targets(board, r, c))
+        return attacked
+
+    def is_attacked(self, board, row, col):
+        return (row, col) in self.attacked_squares(board)
+
+    def safe_squares(self, board):
+        attacked = self.attacked_squares(board)
+        return [(r, c) for r, row in enumerate(board) for c, value in enumerate(row)
+                if value not in (0, 50, 60) and value % 10 == 0 and (r, c) not in attacked]
+
+    def legal_moves(self, board, player):
+        # The same squares are open to both players
+        return [(None, square) for square in self.safe_squares(board)]
+
+    def is_legal(self, board, player, from_pos, to_pos):
+        if from_pos is not None:
+            return False
+        to_row, to_col = to_pos
+        if not (0 <= to_row < len(board) and 0 <= to_col < len(board[0])):
+            return False
+        value = board[to_row][to_col]
+        return value not in (0, 50, 60) and value % 10 == 0 and not self.is_attacked(board, to_row, to_col)
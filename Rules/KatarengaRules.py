@@ -0,0 +1,188 @@
+# Rules/KatarengaRules.py
+# Katarenga: 10x10 board (8x8 tiles, a border and four corners). Player 2 starts on
+# row 1 and player 1 on row 8. A pawn standing on the last row before the opposite
+# side may jump into one of that side's corners; a player wins by holding both of
+# those corners or by taking every enemy pawn.
+from collections import deque
+
+from Rules.GameRules import GameRules, clear_pawns, piece_targets
+
+# Corners each player must hold, and the row its pawns jump into them from
+CORNERS = {
+    1: ((0, 0), (0, 9)),
+    2: ((9, 0), (9, 9)),
+}
+CORNER_ROWS = {1: 1, 2: 8}
+START_ROWS = {1: 8, 2: 1}
+CORNER_OWNERS = {corner: player for player, corners in CORNERS.items() for corner in corners}
+NO_ROUTE = 16  # Distance counted for a pawn missing from the race to the corners
+_distance_cache = {}  # Tile layout -> corner distances
+
+
+def corner_distances(board):
+    # Moves each square is from the nearest corner each player must take, on the tile
+    # layout alone (pawns are ignored, tiles of a line's own color still stop it), as
+    # {player: 10x10 table}, None where no such corner can be reached. A breadth-first
+    # search from the corners over the reversed moves, done once per layout.
+    layout = tuple(value // 10 for row in board for value in row)
+    tables = _distance_cache.get(layout)
+    if tables is not None:
+        return tables
+
+    # Moves of a lone pawn from every square: the same for both players, but the jumps
+    empty = [[value // 10 * 10 for value in row] for row in board]
+    sources = {}
+    for row in range(1, 9):
+        for col in range(1, 9):
+            empty[row][col] += 1
+            for target in piece_targets(empty, row, col):
+                sources.setdefault(target, []).append((row, col))
+            empty[row][col] -= 1
+
+    tables = {}
+    for player, corners in CORNERS.items():
+        distance = [[None] * len(row) for row in board]
+        queue = deque()
+        for r, c in corners:
+            distance[r][c] = 0
+            queue.append((r, c))
+        while queue:
+            square = queue.popleft()
+            steps = distance[square[0]][square[1]] + 1
+            previous = sources.get(square, [])
+            if square in corners:
+                previous = previous + [(CORNER_ROWS[player], col) for col in range(1, 9)]
+            for r, c in previous:
+                if distance[r][c] is None:
+                    distance[r][c] = steps
+                    queue.append((r, c))
+        tables[player] = distance
+
+    if len(_distance_cache) >= 256:
+        _distance_cache.clear()
+    _distance_cache[layout] = tables
+    return tables
+
+
+def pawn_counts(board):
+    counts = {1: 0, 2: 0}
+    for row in board:
+        for value in row:
+            player = value % 10
+            if player:
+                counts[player] += 1
+    return counts
+
+
+class MaterialTracker:
+    # Pawn counts, corners held by each player and how many of its pawns are at each
+    # distance from its corners, kept up to date move by move (a capture is the taken
+    # pawn's square changing owner), so victory needs no board scan
+    def __init__(self, board):
+        self.pawns = pawn_counts(board)
+        self.corners = {player: sum(1 for r, c in corners if board[r][c] % 10 == player)
+                        for player, corners in CORNERS.items()}
+        self.distances = corner_distances(board)
+        self.near = {player: [0] * (max(d for row in table for d in row if d is not None) + 1)
+                     for player, table in self.distances.items()}
+        for r, row in enumerate(board):
+            for c, value in enumerate(row):
+                self._count(value % 10, r, c, 1)
+
+    def _count(self, player, row, col, delta):
+        if player:
+            distance = self.distances[player][row][col]
+            if distance is not None:
+                self.near[player][distance] += delta
+
+    def corner_race(self, player):
+        # Moves the player's two pawns nearest to its corners need to reach them,
+        # NO_ROUTE for each missing pawn
+        total, found = 0, 0
+        for distance, count in enumerate(self.near[player]):
+            used = min(count, 2 - found)
+            total += used * distance
+            found += used
+            if found == 2:
+                return total
+        return total + (2 - found) * NO_ROUTE
+
+    def change(self, row, col, old, new):
+        old, new = old % 10, new % 10
+        if old == new:
+            return
+        if old:
+            self.pawns[old] -= 1
+        if new:
+            self.pawns[new] += 1
+        self._count(old, row, col, -1)
+        self._count(new, row, col, 1)
+        player = CORNER_OWNERS.get((row, col))
+        if player:
+            # Only the player whose corner it is can count it as held
+            self.corners[player] += (new == player) - (old == player)
+
+
+class KatarengaRules(GameRules):
+    game_type = 1
+    name = "Katarenga"
+    size = 10
+
+    def setup_board(self, board):
+        board = clear_pawns(board)
+        if len(board) == 8:
+            # Add the border and the corners (50 on player 1's side, 60 on player 2's)
+            board = [[0] + row + [0] for row in board]
+            board.insert(0, [0] * 10)
+            board.append([0] * 10)
+            board[0][0] = board[0][9] = 50
+            board[9][0] = board[9][9] = 60
+
+        for player, row in START_ROWS.items():
+            for col in range(1, 9):
+                board[row][col] = board[row][col] // 10 * 10 + player
+        return board
+
+    def legal_moves(self, board, player):
+        moves = []
+        corner_row = CORNER_ROWS[player]
+        for row in range(1, 9):
+            for col in range(1, 9):
+                if board[row][col] % 10 != player:
+                    continue
+                targets = piece_targets(board, row, col)
+                if row == corner_row:
+                    for corner in CORNERS[player]:
+                        if corner not in targets and board[corner[0]][corner[1]] % 10 != player:
+                            targets.append(corner)
+                moves.extend(((row, col), target) for target in targets)
+        return moves
+
+    def is_legal(self, board, player, from_pos, to_pos):
+        if from_pos is None:
+            return False
+        from_row, from_col = from_pos
+        if not (1 <= from_row <= 8 and 1 <= from_col <= 8) or board[from_row][from_col] % 10 != player:
+            return False
+        to_pos = tuple(to_pos)
+        if from_row == CORNER_ROWS[player] and to_pos in CORNERS[player]:
+            return board[to_pos[0]][to_pos[1]] % 10 != player
+        return to_pos in piece_targets(board, from_row, from_col)
+
+    def pawn_counts(self, board):
+        return pawn_counts(board)
+
+    def tracker(self, board):
+        return MaterialTracker(board)
+
+    def victory(self, board, mover, tracker=None):
+        counts = tracker.pawns if tracker else self.pawn_counts(board)
+        if counts[1] == 0:
+            return 2
+        if counts[2] == 0:
+            return 1
+        for player in (2, 1):
+            if tracker.corners[player] == 2 if tracker else \
+                    all(board[r][c] % 10 == player for r, c in CORNERS[player]):
+                return player
+        return None
@@ -0,0 +1,85 @@
+# Rules/SaveGame.py
+# Quick-save of a local game in progress, resumed from the main menu.
+#
+# One small binary file: a header (magic, game type, rows, cols, player to move, number
+# of moves, AI flag, length of the engine name), the engine name (UTF-8, empty for the
+# default engine), the starting board and the current board (one byte per cell, usual
+# encoding), then the moves played (2 bytes each, GameRules.move_to_code). Loading reads
+# it in one go: the current board is stored, so nothing is replayed.
+import os
+import struct
+
+from Rules.GameRules import GAME_NAMES, code_to_move, move_to_code
+
+SAVE_FILE = "savegame.bin"
+MAGIC = b"KTSAVE01"
+HEADER = struct.Struct("<8sBBBBIBB")
+
+
+def save_game(game_type, start_board, board, current_player, moves, ai=False, filename=SAVE_FILE):
+    # ai: False, True (default engine) or the name of the engine
+    name = ai.encode("utf-8")[:255] if isinstance(ai, str) else b""
+    rows, cols = len(board), len(board[0])
+    data = bytearray(HEADER.pack(MAGIC, game_type, rows, cols, current_player, len(moves), 1 if ai else 0, len(name)))
+    data += name
+    data += bytes(value for row in start_board for value in row)
+    data += bytes(value for row in board for value in row)
+    data += struct.pack(f"<{len(moves)}H", *(move_to_code(move) for move in moves))
+
+    temp = filename + ".tmp"
+    try:
+        with open(temp, "wb") as f:
+            f.write(data)
+        os.replace(temp, filename)
+    except OSError as e:
+        print(f"Error saving game: {e}")
+        return False
+    return True
+
+
+def load_game(filename=SAVE_FILE):
+    # The saved game as a dict, or None if there is none (or it cannot be read)
+    try:
+        with open(filename, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    try:
+        magic, game_type, rows, cols, current_player, count, ai_flag, name_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or game_type not in GAME_NAMES:
+            raise ValueError("not a saved game")
+        offset = HEADER.size
+        name = data[offset:offset + name_size].decode("utf-8")
+        offset += name_size
+        cells = rows * cols
+
+        def board_at(start):
+            return [list(data[start + r * cols:start + (r + 1) * cols]) for r in range(rows)]
+
+        start_board = board_at(offset)
+        board = board_at(offset + cells)
+        codes = struct.unpack_from(f"<{count}H", data, offset + 2 * cells)
+    except (struct.error, ValueError) as e:
+        print(f"Error loading saved game: {e}")
+        return None
+
+    return {
+        "game_type": game_type,
+        "start_board": start_board,
+        "board": board,
+        "current_player": current_player,
+        "moves": [code_to_move(code) for code in codes],
+        "ai": (name or True) if ai_flag else False,
+    }
+
+
+def has_saved_game(filename=SAVE_FILE):
+    return os.path.exists(filename)
+
+
+def clear_saved_game(filename=SAVE_FILE):
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,30 @@
+# Rules/Zobrist.py
+# 64-bit Zobrist keys of positions. Every (square, cell value) pair has a fixed random
+# key and a position's hash is the XOR of the keys of its squares, the game type and
+# the player to move. A move changes the hash with a few XORs (see GameState.apply).
+# The table comes from a fixed seed, so hashes are the same in every process and can
+# be stored in files (opening book) or shared between processes.
+import random
+
+MAX_CELLS = 100   # Squares are indexed row * 10 + col, enough for the 10x10 Katarenga board
+MAX_VALUE = 70    # Cell values go up to 62 (corner with a pawn of player 2)
+
+_rng = random.Random(0x4B415441)
+SQUARE_KEYS = [[_rng.getrandbits(64) for _ in range(MAX_VALUE)] for _ in range(MAX_CELLS)]
+GAME_KEYS = {game_type: _rng.getrandbits(64) for game_type in (1, 2, 3)}
+PLAYER_2_KEY = _rng.getrandbits(64)
+
+
+def square_key(row, col, value):
+    return SQUARE_KEYS[row * 10 + col][value]
+
+
+def board_hash(board, game_type, current_player):
+    h = GAME_KEYS[game_type]
+    for r, row in enumerate(board):
+        keys = SQUARE_KEYS[r * 10:(r + 1) * 10]
+        for c, value in enumerate(row):
+            h ^= keys[c][value]
+    if current_player == 2:
+        h ^= PLAYER_2_KEY
+    return h
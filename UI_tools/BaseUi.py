@@ -1,5 +1,8 @@
 import pygame
 
+# Background gradients already built, by screen size: every screen of the game shares one
+_background_cache = {}
+
 # Base class for UI screens to avoid repeating common UI logic (screen, font, background, etc.)
 class BaseUI:
     def __init__(self, title="Katarenga"):
@@ -32,9 +35,13 @@ class BaseUI:
     def get_background(self):
         return self.background_surface
 
-    # Creates a radial blue gradient for the background
+    # Creates a radial blue gradient for the background, once per screen size
     def create_blue_gradient_background(self):
         width, height = self.__width, self.__height
+        cached = _background_cache.get((width, height))
+        if cached is not None:
+            return cached
+
         surface = pygame.Surface((width, height))
         center_x, center_y = width // 2, height // 2
         max_dist = (center_x ** 2 + center_y ** 2) ** 0.5
@@ -52,4 +59,5 @@ class BaseUI:
 
                 surface.set_at((x, y), (r, g, b))
 
+        _background_cache[(width, height)] = surface
         return surface
\ No newline at end of file
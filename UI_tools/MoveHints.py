@@ -0,0 +1,36 @@
+# UI_tools/MoveHints.py
+# Squares to highlight for the player: the legal destinations of the selected pawn, or
+# every safe square in Isolation. They are computed once per selection and kept while
+# the board version is the same, so drawing them every frame costs no rule evaluation.
+import pygame
+
+HINT_COLOR = (80, 220, 80)
+
+
+class MoveHints:
+    def __init__(self, rules):
+        self.rules = rules
+        self.key = None
+        self.squares = frozenset()
+
+    def get(self, board, player, selected, version):
+        # version must change whenever the board does (screens count their moves)
+        key = (id(board), version, player, selected)
+        if key != self.key:
+            self.key = key
+            if self.rules.game_type == 3:
+                self.squares = frozenset(to_pos for _, to_pos in self.rules.legal_moves(board, player))
+            elif selected is None or board[selected[0]][selected[1]] % 10 != player:
+                self.squares = frozenset()
+            else:
+                self.squares = frozenset(to_pos for from_pos, to_pos in self.rules.legal_moves(board, player)
+                                         if from_pos == selected)
+        return self.squares
+
+
+def draw_hint(screen, rect, capture=False):
+    # Dot on an empty destination, ring around a pawn that would be taken
+    if capture:
+        pygame.draw.rect(screen, HINT_COLOR, rect.inflate(-6, -6), 3)
+    else:
+        pygame.draw.circle(screen, HINT_COLOR, rect.center, rect.width // 8)
@@ -1,3 +1,4 @@
+import multiprocessing
 import pygame
 import sys
 from Editor.EditorMenu import EditorMenu
@@ -5,6 +6,8 @@ from UI_tools.BaseUi import BaseUI
 from Editor.Square_selector.SquareSelectorUi import SquareSelectorUi
 from Online.HostUI import HostUI
 from Online.JoinUI import JoinUI
+from Game_ui.Replay import Replay
+from Rules.SaveGame import load_game
 
 class MainMenuUI(BaseUI):
     def __init__(self, title="Katarenga"):
@@ -52,6 +55,18 @@ class MainMenuUI(BaseUI):
             "color": (72, 209, 204)
         })
 
+        # Side buttons on the right (Replays, Resume game)
+        self.buttons.append({
+            "label": "Replays",
+            "rect": pygame.Rect(self.get_width() - side_x - side_btn_width, side_y, side_btn_width, btn_height),
+            "color": (218, 165, 32)
+        })
+        self.buttons.append({
+            "label": "Resume game",
+            "rect": pygame.Rect(self.get_width() - side_x - side_btn_width, side_y + btn_height + side_spacing, side_btn_width, btn_height),
+            "color": (218, 165, 32)
+        })
+
         self.info_font = pygame.font.SysFont(None, 24)
 
     def run(self):
@@ -96,6 +111,10 @@ class MainMenuUI(BaseUI):
                     self.launch_host_interface()
                 elif label == "Join a game":
                     self.launch_join_interface()
+                elif label == "Replays":
+                    self.launch_replay()
+                elif label == "Resume game":
+                    self.launch_resume()
 
     def launch_square_selector(self, gamemode):
         
@@ -199,6 +218,28 @@ class MainMenuUI(BaseUI):
         except Exception as e:
             print(f"Error during join interface: {e}")
 
+    def launch_replay(self):
+        try:
+            Replay().run()
+        except Exception as e:
+            print(f"Error during replay: {e}")
+
+    def launch_resume(self):
+        save = load_game()
+        if save is None:
+            print("No saved game to resume")
+            return
+        try:
+            from Game_ui.Katarenga import Katarenga
+            from Game_ui.Congress import Congress
+            from Game_ui.Isolation import Isolation
+            screen_class = {1: Katarenga, 2: Congress, 3: Isolation}[save["game_type"]]
+            game = screen_class(save["ai"], save["board"])
+            game.resume(save)
+            game.run()
+        except Exception as e:
+            print(f"Error resuming game: {e}")
+
     def draw(self):
         # Drawing buttons
         self.get_screen().blit(self.get_background(), (0, 0))
@@ -213,6 +254,15 @@ class MainMenuUI(BaseUI):
         self.get_screen().blit(txt_surface, txt_rect)
 
 if __name__ == "__main__":
+    # Worker processes of the parallel search start through the executable in frozen builds
+    multiprocessing.freeze_support()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--engine":
+        # Engine process of a frozen build (see AI/EngineProcess.py)
+        from AI.EngineProtocol import main as engine_main
+        engine_main()
+        sys.exit()
+
     # App launch
     app = MainMenuUI()
     app.run()
\ No newline at end of file